@@ -0,0 +1,182 @@
+# jeff65 front-end benchmark
+# Copyright (C) 2018  jeff65 maintainers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Times the gold-syntax front end on synthetic sources of increasing size.
+
+Usage: python benchmarks/bench_frontend.py [--repeat N] [--scale N ...]
+                                           [--output FILE] [options]
+
+For each scale, a source is generated with that many times the given number
+of functions, and the following phases are timed:
+
+  lex       the lexer alone, replaying the modes recorded from a parse
+  parse     the parser building the raw parse tree
+  simplify  the Simplify pass over that raw tree
+  total     compiler.parse, which builds the simplified tree directly
+
+The best time over all repetitions is reported, along with the peak memory
+allocated during a separate run of each phase. The results are written as
+JSON, to stdout unless --output is given, so that they can be compared
+between revisions.
+"""
+
+import argparse
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from jeff65 import parsing
+from jeff65.gold import compiler, grammar
+from jeff65.gold.passes import simplify
+
+
+def generate(functions, depth=8, comment=200, string=200, array=32):
+    """Generates a gold-syntax source.
+
+    The source has the given number of functions, each with an expression
+    nested 'depth' levels deep, a comment of roughly 'comment' characters, a
+    string literal of 'string' characters, and a constant array with 'array'
+    elements.
+    """
+
+    words = "the quick brown fox jumps over the lazy dog "
+    text = (words * (comment // len(words) + 1))[:comment]
+    literal = ('abc\\"def ' * (string // 10 + 1))[:string].rstrip("\\")
+    parts = ["use mem\n"]
+    for k in range(functions):
+        expr = f"x{k}"
+        for d in range(depth):
+            expr = f"({d} + {expr} * c{k})" if d % 2 else f"-{expr} - 0x{d:02x}"
+        elements = ", ".join(str((k + e) % 256) for e in range(array))
+        parts.append(f"/* {text} */\n")
+        parts.append(f"constant c{k}: [u8; 0 to {array}] = [{elements}]\n")
+        parts.append(f"fun f{k}()\n")
+        parts.append(f"  let mut x{k}: u8 = {expr}\n")
+        parts.append(f'  let s: &u8 = "{literal}"\n')
+        parts.append(f"  @c{k} = mem.peek(x{k}, s) /* store */\n")
+        parts.append("endfun\n")
+    return "".join(parts)
+
+
+def record_modes(source):
+    modes = []
+
+    def record(stream, mode):
+        modes.append(mode)
+        return grammar.lex(stream, mode)
+
+    with parsing.ReStream(io.StringIO(source)) as stream:
+        grammar.parse(stream, record, lambda t, s, c, m: None)
+    return modes
+
+
+def lex(source, modes):
+    with parsing.ReStream(io.StringIO(source)) as stream:
+        for mode in modes:
+            grammar.lex(stream, mode)
+
+
+def parse_raw(source):
+    with parsing.ReStream(io.StringIO(source)) as stream:
+        return grammar.parse(stream, grammar.lex, compiler._make_node)
+
+
+def measure(repeat, fn):
+    """Returns the best time and the peak memory allocated by fn()."""
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run(scale, source, repeat):
+    modes = record_modes(source)
+    tree = parse_raw(source)
+    phases = {
+        "lex": lambda: lex(source, modes),
+        "parse": lambda: parse_raw(source),
+        "simplify": lambda: tree.transform(simplify.Simplify()),
+        "total": lambda: compiler.parse(io.StringIO(source), "<bench>"),
+    }
+
+    result = {
+        "scale": scale,
+        "bytes": len(source.encode("utf8")),
+        "tokens": len(modes),
+    }
+    for name, fn in phases.items():
+        elapsed, peak = measure(repeat, fn)
+        result[name] = {"seconds": elapsed, "peak_bytes": peak}
+    return result
+
+
+def main():
+    argparser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argparser.add_argument("--repeat", type=int, default=5)
+    argparser.add_argument("--scale", type=int, nargs="+", default=[1, 2, 4, 8])
+    argparser.add_argument("--functions", type=int, default=25)
+    argparser.add_argument("--depth", type=int, default=8)
+    argparser.add_argument("--comment", type=int, default=200)
+    argparser.add_argument("--string", type=int, default=200)
+    argparser.add_argument("--array", type=int, default=32)
+    argparser.add_argument("--output", type=argparse.FileType("w"), default="-")
+    args = argparser.parse_args()
+
+    params = {
+        "functions": args.functions,
+        "depth": args.depth,
+        "comment": args.comment,
+        "string": args.string,
+        "array": args.array,
+    }
+    results = []
+    for scale in args.scale:
+        source = generate(**dict(params, functions=args.functions * scale))
+        result = run(scale, source, args.repeat)
+        results.append(result)
+        summary = " ".join(
+            f"{name}={result[name]['seconds'] * 1000:.1f}ms"
+            for name in ["lex", "parse", "simplify", "total"]
+        )
+        print(f"scale {scale}: {result['tokens']} tokens {summary}", file=sys.stderr)
+
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "repeat": args.repeat,
+        "params": params,
+        "results": results,
+    }
+    with args.output as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
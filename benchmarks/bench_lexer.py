@@ -0,0 +1,104 @@
+# jeff65 lexer benchmark
+# Copyright (C) 2018  jeff65 maintainers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Compares lexing throughput of the per-rule, combined-regex and DFA lexers.
+
+Usage: python benchmarks/bench_lexer.py [--repeat N]
+
+The sequence of lexer modes for each source is recorded by running the parser
+once, and then replayed against each lexer, so only the time spent lexing is
+measured. Lexers which skip trivia are asked for fewer tokens, so their rates
+are given in terms of the tokens produced by the lexers which don't.
+"""
+
+import argparse
+import io
+import pathlib
+import time
+from jeff65 import parsing
+from jeff65.gold import grammar
+
+root = pathlib.Path(__file__).resolve().parent.parent
+
+
+def synthetic(functions):
+    """Generates a gold-syntax source with the given number of functions."""
+    parts = ["use mem\n"]
+    for k in range(functions):
+        parts.append(f"/* function number {k} */\n")
+        parts.append(f"constant c{k}: &u8 = mem.as-pointer(0x{k:04x})\n")
+        parts.append(f"fun f{k}()\n")
+        parts.append(f"  let mut x: u8 = {k} + 2 * (3 - c{k})\n")
+        parts.append(f'  let s: &u8 = "string {k}"\n')
+        parts.append(f"  @c{k} = x /* store */\n")
+        parts.append("endfun\n")
+    return "".join(parts)
+
+
+def record_modes(source, lexer):
+    modes = []
+
+    def record(stream, mode):
+        modes.append(mode)
+        return lexer(stream, mode)
+
+    with parsing.ReStream(io.StringIO(source)) as stream:
+        grammar.parse(stream, record, lambda t, s, c, m: None)
+    return modes
+
+
+def time_lexer(lexer, source, modes, repeat):
+    data = source.encode("utf8")
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with parsing.ReStream(io.BytesIO(data)) as stream:
+            for mode in modes:
+                lexer(stream, mode)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    argparser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argparser.add_argument("--repeat", type=int, default=5)
+    args = argparser.parse_args()
+
+    lexers = [
+        ("per-rule", parsing.Lexer(grammar.T.EOF, grammar.lex_rules, combined=False)),
+        ("combined", parsing.Lexer(grammar.T.EOF, grammar.lex_rules, combined=True)),
+        ("dfa", grammar.make_lexer("dfa", skip_trivia=False)),
+        ("comb+trivia", grammar.make_lexer("regex")),
+        ("dfa+trivia", grammar.make_lexer("dfa")),
+    ]
+    sources = [("heart.gold", (root / "examples" / "heart.gold").read_text())]
+    sources.extend((f"synthetic-{n}", synthetic(n)) for n in [10, 100, 1000])
+
+    print(f"{'source':<18} {'tokens':>8} " + " ".join(f"{n:>14}" for n, _ in lexers))
+    for name, source in sources:
+        tokens = len(record_modes(source, lexers[0][1]))
+        rates = []
+        for _, lexer in lexers:
+            modes = record_modes(source, lexer)
+            elapsed = time_lexer(lexer, source, modes, args.repeat)
+            rates.append(tokens / elapsed)
+        cols = " ".join(f"{r:>10.0f} t/s" for r in rates)
+        print(f"{name:<18} {tokens:>8} {cols}")
+
+
+if __name__ == "__main__":
+    main()
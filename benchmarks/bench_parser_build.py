@@ -0,0 +1,92 @@
+# jeff65 parser-generator benchmark
+# Copyright (C) 2018  jeff65 maintainers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Times each phase of building the gold-syntax parser tables.
+
+Usage: python benchmarks/bench_parser_build.py [--repeat N]
+
+Each phase is run on the output of the previous one, and the best time over
+all repetitions is reported. The "relations" row computes the lookaheads with
+DeRemer-Pennello relations, replacing the extended grammar and follow sets.
+The "total" rows build the whole parser (including the hidden-channel parsers)
+from scratch with each lookahead method, bypassing any caches.
+"""
+
+import argparse
+import time
+from jeff65 import parsing
+from jeff65.gold import grammar
+
+
+def best_of(repeat, fn):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    argparser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argparser.add_argument("--repeat", type=int, default=10)
+    args = argparser.parse_args()
+
+    g = grammar.grammar
+    phases = []
+
+    def fresh_table():
+        # the grammar memoizes its predictions, which would flatter the timing
+        g.predictions.clear()
+        return parsing.TranslationTable(g)
+
+    elapsed, table = best_of(args.repeat, fresh_table)
+    phases.append(("itemsets", elapsed, f"{len(table.itemsets)} states"))
+
+    elapsed, extended = best_of(args.repeat, table.build_extended_grammar)
+    phases.append(("extended grammar", elapsed, f"{len(extended.rules)} rules"))
+
+    elapsed, _ = best_of(args.repeat, table.build_modes)
+    phases.append(("modes", elapsed, ""))
+
+    elapsed, (terminals, _) = best_of(args.repeat, extended.build_firstbits)
+    phases.append(("first sets", elapsed, f"{len(terminals)} terminals"))
+
+    # build_followbits() also builds the first sets, so subtract them out.
+    elapsed, _ = best_of(args.repeat, extended.build_followbits)
+    phases.append(("follow sets", elapsed - phases[-1][1], ""))
+
+    elapsed, (_, reductions) = best_of(args.repeat, table.build_relation_reductions)
+    phases.append(("relations", elapsed, f"{len(reductions)} reductions"))
+
+    for lookaheads in ["extended", "relations"]:
+
+        def fresh_parser():
+            g.predictions.clear()
+            return g._build_parser(grammar.hidden_grammars, 0, lookaheads)
+
+        elapsed, parser = best_of(args.repeat, fresh_parser)
+        phases.append(
+            (f"total ({lookaheads})", elapsed, f"{len(parser.agtable)} entries")
+        )
+
+    for name, elapsed, note in phases:
+        print(f"{name:<18} {elapsed * 1000:>9.2f} ms  {note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import argparse
+import atexit
 import logging
 import pathlib
 import sys
@@ -62,12 +63,33 @@ def main(argv=None):
         action="store_true",
         default=False,
     )
+    parser.add_argument(
+        "--counters",
+        help="report lexer and parser counters at exit",
+        dest="counters",
+        action="store_true",
+        default=False,
+    )
 
     subparsers = parser.add_subparsers()
     compile_parser = subparsers.add_parser("compile", help="compile one or more files")
     compile_parser.add_argument(
         "-o", help="place the output into OUTPUT", dest="output", type=pathlib.PurePath
     )
+    compile_parser.add_argument(
+        "--lexer",
+        help="the lexer implementation to use",
+        dest="lexer",
+        choices=["regex", "dfa"],
+        default="regex",
+    )
+    compile_parser.add_argument(
+        "--mmap",
+        help="read source files by memory-mapping them",
+        dest="map_file",
+        action="store_true",
+        default=False,
+    )
     compile_parser.add_argument(
         "file", help="the file to compile", type=pathlib.PurePath
     )
@@ -79,12 +101,33 @@ def main(argv=None):
     )
     objdump_parser.set_defaults(func=cmd_objdump)
 
+    gen_parser_parser = subparsers.add_parser(
+        "gen-parser", help="generate the gold-syntax parser tables"
+    )
+    gen_parser_parser.add_argument(
+        "-o", help="place the output into OUTPUT", dest="output", type=pathlib.Path
+    )
+    gen_parser_parser.add_argument(
+        "--check",
+        help="check that the existing tables are up to date",
+        dest="check",
+        action="store_true",
+        default=False,
+    )
+    gen_parser_parser.set_defaults(func=cmd_gen_parser)
+
     args = parser.parse_args(argv)
     if args.debug:
         logging.basicConfig(level=logging.DEBUG)
     elif args.verbose:
         logging.basicConfig(level=logging.INFO)
 
+    if args.counters:
+        from . import parsing
+
+        counters = parsing.enable_counters()
+        atexit.register(lambda: print(counters.report(), file=sys.stderr))
+
     if hasattr(args, "func"):
         args.func(args)
     else:
@@ -98,9 +141,11 @@ def cmd_none(args):
 
 def cmd_compile(args):
     from . import gold
+    from .gold import grammar
     from . import blum
 
-    archive = gold.translate(args.file)
+    lexer = grammar.make_lexer(args.lexer)
+    archive = gold.translate(args.file, lexer=lexer, map_file=args.map_file)
     # archive.dumpf(args.file.with_suffix('.blum'))
     blum.link(
         "{}.main".format(args.file.stem),
@@ -129,3 +174,22 @@ def cmd_objdump(args):
             )
             for relocation in symbol.relocations:
                 print("      {}".format(relocation))
+
+
+def cmd_gen_parser(args):
+    from .gold import grammar
+
+    output = args.output or pathlib.Path(grammar.__file__).with_name("_parsetab.py")
+    source = grammar.generate_tables()
+
+    if args.check:
+        try:
+            current = output.read_text(encoding="utf8")
+        except FileNotFoundError:
+            current = None
+        if current != source:
+            print("{} is out of date".format(output))
+            sys.exit(1)
+        print("{} is up to date".format(output))
+    else:
+        output.write_text(source, encoding="utf8")
@@ -15,46 +15,275 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import attr
-from .immutable import FrozenDict
+import collections.abc
+import contextlib
 
 
-@attr.s(slots=True, frozen=True, repr=False)
-class AstNode:
+class Interner:
+    """A table of canonical AstNodes, for hash-consing.
+
+    While interning is enabled, constructing an AstNode returns the first node
+    constructed with an equal type and attributes, if there is one. Equal
+    subtrees are then shared, and comparing them only takes an identity check.
+
+    Only nodes with no span anywhere in their subtree are interned, since a
+    shared node can only have one position. These are the nodes which passes
+    build, such as storage and operand nodes; a pass which gives one a span
+    gets a node of its own. Nodes whose attributes can't be hashed are never
+    interned either.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+        self.hits = 0
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def intern(self, node):
+        try:
+            if not self.positionless(node):
+                return node
+            canonical = self.nodes.setdefault(node, node)
+        except TypeError:
+            return node
+        if canonical is not node:
+            self.hits += 1
+        return canonical
+
+    def positionless(self, node):
+        # The children have been built already, so any AstNode among them is
+        # positionless if and only if it was interned.
+        if node.span is not None:
+            return False
+        if isinstance(node, AstSequence):
+            values = node.items
+        else:
+            values = node.attrs.values()
+        for value in values:
+            if isinstance(value, AstNode):
+                if self.nodes.get(value) is not value:
+                    return False
+            elif isinstance(value, AstSequence) and not self.positionless(value):
+                return False
+        return True
+
+
+# The active interner, or None if interning is disabled.
+interner = None
+
+
+@contextlib.contextmanager
+def interning():
+    """Interns the AstNodes constructed within the block.
+
+    Each block gets a fresh Interner, which is yielded, and the previous one
+    (if any) is restored afterwards, so nodes are only ever shared between
+    trees built in the same block, such as the passes of one compilation.
+    """
+
+    global interner
+    previous, interner = interner, Interner()
+    try:
+        yield interner
+    finally:
+        interner = previous
+
+
+class Schema:
+    """The attribute names of a kind of node, and their positions.
+
+    Nodes store their attribute values in a tuple, in sorted order of their
+    names, and share the Schema for that set of names. There is only one
+    Schema for each set of names, so two are the same if they are equal.
+    """
+
+    __slots__ = ("keys", "keyset", "index", "_lookups")
+
+    _known = {}
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.keyset = frozenset(keys)
+        self.index = {k: n for n, k in enumerate(keys)}
+        self._lookups = {}
+
+    def __repr__(self):
+        return f"Schema({self.keys!r})"
+
+    @classmethod
+    def of(cls, keys):
+        """Returns the Schema for a sorted tuple of attribute names."""
+
+        schema = cls._known.get(keys)
+        if schema is None:
+            schema = cls._known.setdefault(keys, cls(keys))
+        return schema
+
+    def positions(self, keys):
+        """Returns the positions of the given names, or None if one is missing.
+
+        The result is cached, so that patterns can look up the same names on
+        many nodes with this schema.
+        """
+
+        positions = self._lookups.get(keys, self)
+        if positions is self:
+            index = self.index
+            if all(k in index for k in keys):
+                positions = tuple(index[k] for k in keys)
+            else:
+                positions = None
+            self._lookups[keys] = positions
+        return positions
+
+
+class NodeAttrs(collections.abc.Mapping):
+    """The attributes of an AstNode.
+
+    This is an immutable mapping, which stores the values in a tuple and looks
+    up their positions in a shared Schema. Like FrozenDict, it iterates in
+    sorted order of the names.
+    """
+
+    __slots__ = ("schema", "_values")
+
+    def __init__(self, schema, values):
+        self.schema = schema
+        self._values = values
+
+    @classmethod
+    def create(cls, other):
+        if type(other) is cls:
+            return other
+        items = sorted(other.items(), key=_first)
+        keys = tuple(k for k, _ in items)
+        return cls(Schema.of(keys), tuple(v for _, v in items))
+
+    @classmethod
+    def empty(cls):
+        return _NO_ATTRS
+
+    def __repr__(self):
+        pairs = ", ".join(f"{k!r}: {v!r}" for k, v in self.items())
+        return f"NodeAttrs({{{pairs}}})"
+
+    def __getitem__(self, key):
+        return self._values[self.schema.index[key]]
+
+    def __contains__(self, key):
+        return key in self.schema.index
+
+    def get(self, key, default=None):
+        n = self.schema.index.get(key)
+        return default if n is None else self._values[n]
+
+    def __iter__(self):
+        return iter(self.schema.keys)
+
+    def __len__(self):
+        return len(self._values)
+
+    def items(self):
+        return _ItemsView(self)
+
+    def values(self):
+        return _ValuesView(self)
+
+    def __eq__(self, other):
+        if type(other) is NodeAttrs:
+            return self.schema is other.schema and self._values == other._values
+        return super().__eq__(other)
+
+    def __hash__(self):
+        return hash((self.schema.keys, self._values))
+
+    def update(self, mapping):
+        index = self.schema.index
+        if all(k in index for k in mapping):
+            # the names stay the same, so only the values need replacing
+            values = list(self._values)
+            for k, v in mapping.items():
+                values[index[k]] = v
+            return NodeAttrs(self.schema, tuple(values))
+        builder = self.asbuilder()
+        builder.update(mapping)
+        return NodeAttrs.create(builder)
+
+    def add(self, key, value):
+        return self.update({key: value})
+
+    def remove(self, key):
+        builder = self.asbuilder()
+        del builder[key]
+        return NodeAttrs.create(builder)
+
+    def asbuilder(self):
+        """Returns the attributes as a dict, which can be changed."""
+
+        return dict(self.items())
+
+
+class _ItemsView(collections.abc.ItemsView):
+    __slots__ = ()
+
+    def __iter__(self):
+        attrs = self._mapping
+        return zip(attrs.schema.keys, attrs._values)
+
+
+class _ValuesView(collections.abc.ValuesView):
+    __slots__ = ()
+
+    def __iter__(self):
+        return iter(self._mapping._values)
+
+
+def _first(item):
+    return item[0]
+
+
+_NO_ATTRS = NodeAttrs(Schema.of(()), ())
+
+
+class _Interned(type):
+    def __call__(cls, *args, **kwargs):
+        node = super().__call__(*args, **kwargs)
+        if interner is None:
+            return node
+        return interner.intern(node)
+
+
+@attr.s(slots=True, frozen=True, repr=False, cache_hash=True)
+class AstNode(metaclass=_Interned):
     t = attr.ib()
-    attrs = attr.ib(factory=FrozenDict.empty, converter=FrozenDict.create)
+    attrs = attr.ib(factory=NodeAttrs.empty, converter=NodeAttrs.create)
     span = attr.ib(default=None, cmp=False)
 
     def update_attrs(self, attrs):
         nn = attr.evolve(self, attrs=self.attrs.update(attrs))
-        assert self is not nn
+        assert self is not nn or interner is not None
         return nn
 
     def replace_attrs(self, attrs):
-        nn = attr.evolve(self, attrs=FrozenDict.create(attrs))
-        assert self is not nn
+        nn = attr.evolve(self, attrs=NodeAttrs.create(attrs))
+        assert self is not nn or interner is not None
         return nn
 
     def transform(self, transformer):
-        node = transformer.transform_enter(self.t, self)
-
-        if hasattr(node, "attrs"):
-            # because we're iterating over a FrozenDict, we'll get the
-            # attributes in sorted order. Therefore, we can use the faster
-            # unsafeset to put them into the builder.
-            attrs = FrozenDict.Builder.empty()
-            dirty = False
-            for n, v in node.attrs.items():
-                if hasattr(v, "transform"):
-                    tv = v.transform(transformer)
-                    attrs.unsafeset(n, tv)
-                    if v is not tv:
-                        dirty = True
-                else:
-                    attrs.unsafeset(n, v)
-            if dirty:
-                node = node.replace_attrs(attrs)
-
-        return transformer.transform_exit(self.t, node)
+        """Transforms the tree rooted at this node.
+
+        transform_enter is called on each node before its children are
+        transformed, in sorted order of their attribute names, and
+        transform_exit after. A node is only rebuilt if one of its children
+        was replaced.
+
+        Within an AstSequence, an element transformed into None is removed,
+        and one transformed into another sequence of the same type has its
+        elements spliced in.
+        """
+
+        return _transform(self, transformer)
 
     def __repr__(self):
         return f"<ast {self.t} at {self.span}>"
@@ -77,59 +306,275 @@ class AstNode:
             pp.append("{}{}\n".format(i(), self.t))
         else:
             pp.append("{}{:<{}} {}\n".format(i(), self.t, 70 - indent, self.span))
-        has_next = False
         for name, value in self.attrs.items():
-            if name == "next":
-                has_next = True
-                continue  # we'll come back to this one
             if hasattr(value, "_pretty"):
                 pp.append("{}:{} ".format(i(), name))
                 pp.append(value._pretty(indent + 2 + len(name), no_position).lstrip())
             else:
                 pp.append("{}:{} {!r}\n".format(i(), name, value))
-        if has_next:
-            # print this at the same level
-            nxt = self.attrs["next"]
-            if hasattr(nxt, "_pretty"):
-                pp.append(nxt._pretty(indent, no_position))
-            elif nxt is not None:
-                pp.append("{}{!r}".format(i(), nxt))
         return "".join(pp)
 
     @classmethod
     def make_sequence(cls, t_seq, a_elem, elems, rest=None):
-        n = rest
-        for e in reversed(elems):
-            n = cls(t_seq, {a_elem: e, "next": n})
-        return n
+        items = tuple(elems)
+        if rest is not None:
+            items += rest.items
+        return AstSequence(t_seq, a_elem, items)
+
+    def select(self, *attrs):
+        return _select(self, attrs)
+
+
+class _Cons:
+    """An element prepended to a sequence whose items haven't been built yet."""
+
+    __slots__ = ("car", "cdr")
+
+    def __init__(self, car, cdr):
+        self.car = car
+        self.cdr = cdr
+
+
+def _as_items(items):
+    return items if type(items) is _Cons else tuple(items)
+
+
+@attr.s(slots=True, frozen=True, repr=False, cmp=False)
+class AstSequence:
+    """A sequence of nodes, such as the statements in a block.
+
+    Each element is notionally stored in the attribute named by 'elem', which
+    is what select() uses to reach them; they are held together in a tuple,
+    so that a sequence can be indexed and walked without recursion.
+    """
+
+    t = attr.ib()
+    elem = attr.ib()
+    _items = attr.ib(default=(), converter=_as_items)
+    span = attr.ib(default=None)
+    _hash = attr.ib(default=None, init=False)
+
+    @classmethod
+    def cons(cls, car, cdr, span=None):
+        """Returns 'cdr' with 'car' prepended to it.
+
+        This takes constant time, so that sequences can be built up from
+        right-recursive rules. The items are only put into a tuple when they
+        are first needed.
+        """
+
+        return cls(cdr.t, cdr.elem, _Cons(car, cdr), span)
+
+    @property
+    def items(self):
+        items = self._items
+        if type(items) is _Cons:
+            head = []
+            seq = self
+            while type(seq._items) is _Cons:
+                head.append(seq._items.car)
+                seq = seq._items.cdr
+            items = tuple(head) + seq.items
+            object.__setattr__(self, "_items", items)
+        return items
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __eq__(self, other):
+        if not isinstance(other, AstSequence):
+            return NotImplemented
+        return (
+            self.t == other.t and self.elem == other.elem and self.items == other.items
+        )
+
+    def __hash__(self):
+        if self._hash is None:
+            object.__setattr__(self, "_hash", hash((self.t, self.elem, self.items)))
+        return self._hash
+
+    def transform(self, transformer):
+        return _transform(self, transformer)
+
+    def __repr__(self):
+        return f"<ast {self.t}[{len(self)}] at {self.span}>"
+
+    def __format__(self, spec):
+        if spec == "p":
+            return self.pretty()
+        return repr(self)
+
+    def pretty(self, indent=0, no_position=False):
+        return self._pretty(indent, no_position).strip()
+
+    def _pretty(self, indent, no_position):
+        i = " " * indent
+        pp = []
+        if no_position:
+            pp.append("{}{}\n".format(i, self.t))
+        else:
+            pp.append("{}{:<{}} {}\n".format(i, self.t, 70 - indent, self.span))
+        for value in self.items:
+            if hasattr(value, "_pretty"):
+                pp.append("{}:{} ".format(i, self.elem))
+                pp.append(
+                    value._pretty(indent + 2 + len(self.elem), no_position).lstrip()
+                )
+            else:
+                pp.append("{}:{} {!r}\n".format(i, self.elem, value))
+        return "".join(pp)
 
     def select(self, *attrs):
-        current = [self]
-        for a in attrs:
-            found = []
-            while len(current) > 0:
-                c = current.pop()
-                if c is None:
-                    continue
+        return _select(self, attrs)
+
+
+def _select(node, attrs):
+    current = [node]
+    for a in attrs:
+        found = []
+        for c in current:
+            if c is None:
+                continue
+            if isinstance(c, AstSequence):
+                if a != c.elem:
+                    raise KeyError(a)
+                found.extend(c.items)
+            else:
                 found.append(c.attrs[a])
-                if "next" in c.attrs:
-                    current.append(c.attrs["next"])
-            current = found
+        current = found
+    return current
+
 
-        return current
+def _children(node):
+    """Returns the attribute names (or None) and children of a node."""
+
+    if isinstance(node, AstSequence):
+        return None, node.items
+    attrs = node.attrs
+    return attrs.schema.keys, attrs._values
+
+
+def _rebuild(node, names, values, changes):
+    if names is not None:
+        values = list(values)
+        for k, v in changes:
+            values[k] = v
+        return node.replace_attrs(NodeAttrs(node.attrs.schema, tuple(values)))
+
+    changed = dict(changes)
+    items = []
+    for k, v in enumerate(values):
+        if k not in changed:
+            items.append(v)
+            continue
+        v = changed[k]
+        if isinstance(v, AstSequence) and v.t == node.t:
+            items.extend(v.items)
+        elif v is not None:
+            items.append(v)
+    return attr.evolve(node, items=items)
+
+
+def _transform(root, transformer):
+    # The tree is walked using an explicit stack, since sequences can be long,
+    # and trees built from cons-lists can nest deeply.
+    enter = transformer.transform_enter
+    exit = transformer.transform_exit
+    nodes = (AstNode, AstSequence)
+
+    node = enter(root.t, root)
+    if not isinstance(node, nodes):
+        return exit(root.t, node)
+
+    # Each frame holds the original type of a node, the node returned by
+    # transform_enter, its attribute names (None for sequences) and children,
+    # the position of the child being visited, and the (position, value)
+    # pairs of the children which changed.
+    stack = [[root.t, node, *_children(node), 0, []]]
+    while True:
+        frame = stack[-1]
+        t, node, names, values, k, changes = frame
+        while k < len(values):
+            v = values[k]
+            if isinstance(v, nodes):
+                break
+            if hasattr(v, "transform"):
+                tv = v.transform(transformer)
+                if v is not tv:
+                    changes.append((k, tv))
+            k += 1
+
+        if k < len(values):
+            frame[4] = k
+            child = values[k]
+            cn = enter(child.t, child)
+            if isinstance(cn, nodes):
+                stack.append([child.t, cn, *_children(cn), 0, []])
+                continue
+            result = exit(child.t, cn)
+        else:
+            stack.pop()
+            if len(changes) > 0:
+                node = _rebuild(node, names, values, changes)
+            result = exit(t, node)
+            if len(stack) == 0:
+                return result
+            frame = stack[-1]
+            k = frame[4]
+
+        # Hand the transformed child back to its parent.
+        if frame[3][k] is not result:
+            frame[5].append((k, result))
+        frame[4] = k + 1
 
 
 class TranslationPass:
-    """Base class for translation passes."""
+    """Base class for translation passes.
+
+    The enter_<t> and exit_<t> methods of a pass are called for nodes of type
+    <t>, if they exist; nodes without one are passed through unchanged. The
+    methods are collected into dispatch tables when the class is created, so
+    the lookup for each node is a single dict lookup.
+    """
+
+    _enter = {}
+    _exit = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._build_dispatch()
+
+    @classmethod
+    def _build_dispatch(cls):
+        cls._enter = _handlers(cls, "enter_")
+        cls._exit = _handlers(cls, "exit_")
 
     def transform_enter(self, t, node):
-        return getattr(self, f"enter_{t}", self.__generic_enter)(node)
+        handler = self._enter.get(t)
+        if handler is None:
+            return node
+        return handler(self, node)
 
     def transform_exit(self, t, node):
-        return getattr(self, f"exit_{t}", self.__generic_exit)(node)
+        handler = self._exit.get(t)
+        if handler is None:
+            return node
+        return handler(self, node)
 
-    def __generic_enter(self, node):
-        return node
 
-    def __generic_exit(self, node):
-        return node
+def _handlers(cls, prefix):
+    # Node types never start with an underscore, so names like enter__scope
+    # are left for passes to use as hooks of their own.
+    return {
+        name[len(prefix) :]: getattr(cls, name)
+        for name in dir(cls)
+        if name.startswith(prefix)
+        and not name.startswith("_", len(prefix))
+        and callable(getattr(cls, name))
+    }
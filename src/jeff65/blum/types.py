@@ -37,6 +37,9 @@ class PhantomType:
     def __eq__(self, other):
         return isinstance(other, PhantomType)
 
+    def __hash__(self):
+        return hash(PhantomType)
+
     def validate(self):
         pass
 
@@ -57,6 +60,9 @@ class VoidType:
     def __eq__(self, other):
         return isinstance(other, VoidType)
 
+    def __hash__(self):
+        return hash(VoidType)
+
     def validate(self):
         pass
 
@@ -118,6 +124,9 @@ class IntType:
             and self.width == other.width
         )
 
+    def __hash__(self):
+        return hash((IntType, self.signed, self.width))
+
     def __repr__(self):
         return "{}{}".format("i" if self.signed else "u", self.width * 8)
 
@@ -156,6 +165,9 @@ class RefType:
     def __eq__(self, other):
         return type(other) is RefType and self.target == other.target
 
+    def __hash__(self):
+        return hash((RefType, self.target))
+
     def __repr__(self):
         return "&{}".format(repr(self.target))
 
@@ -192,6 +204,9 @@ class FunctionType:
             and self.args == other.args
         )
 
+    def __hash__(self):
+        return hash((FunctionType, self.ret, tuple(self.args or ())))
+
     def __repr__(self):
         args = ", ".join(repr(arg) for arg in self.args)
         ret = ""
@@ -0,0 +1,601 @@
+# jeff65 DFA lexer generator
+# Copyright (C) 2018  jeff65 maintainers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Table-driven DFA lexer generator.
+
+This module compiles the same rule lists accepted by parsing.Lexer into one
+minimized DFA per lexer mode, which is then run over the input with a plain
+state-transition table. Unlike the regex-based lexer, it never has to retry a
+match when more input arrives; it just picks up where it left off.
+
+Only a subset of regex syntax is supported: literals and escapes, character
+classes (including \\s, \\d and \\w), '.', grouping, alternation, the '*', '+'
+and '?' quantifiers (greedy or lazy), and the 'm' and 's' flags. A rule may end
+with a lookahead assertion, which is treated as trailing context; it must have
+a fixed length, and may use '$' to match the end of a line or the input.
+
+Tokens are chosen by maximal munch, with ties going to the earliest rule. The
+length used for comparison includes the trailing context, so a keyword which
+must be followed by a delimiter beats an identifier spelled the same way. A
+rule containing a lazy quantifier stops at its shortest match, and a rule which
+would produce an empty token is passed over in favour of the next one.
+"""
+
+import array
+import attr
+import logging
+import regex as re
+import time
+from . import parsing
+from .parsing import Parser, ReStream, Token
+
+logger = logging.getLogger(__name__)
+
+
+EOF = None  # the end-of-input pseudo-character
+
+_is_space = re.compile(r"\s").match
+_is_digit = re.compile(r"\d").match
+_is_word = re.compile(r"\w").match
+
+
+def _categories(c):
+    """Returns the (\\s, \\d, \\w) memberships of a character."""
+    return (bool(_is_space(c)), bool(_is_digit(c)), bool(_is_word(c)))
+
+
+@attr.s(slots=True, frozen=True)
+class CharSet:
+    """A set of characters.
+
+    'chars' holds characters which are listed explicitly, and 'categories'
+    holds any of "s", "d", "w" (and their negations "S", "D", "W"). If
+    'negated' is set, the set holds every character not described by the
+    other two. 'eof' indicates whether the end-of-input pseudo-character is a
+    member; negation doesn't apply to it.
+    """
+
+    chars = attr.ib(default=frozenset())
+    categories = attr.ib(default=frozenset())
+    negated = attr.ib(default=False)
+    eof = attr.ib(default=False)
+
+    def contains(self, c):
+        if c is EOF:
+            return self.eof
+        return self.contains_categories(*_categories(c), explicit=c in self.chars)
+
+    def contains_categories(self, space, digit, word, explicit=False):
+        """Tests membership of a character with the given categories."""
+        member = (
+            explicit
+            or ("s" in self.categories and space)
+            or ("d" in self.categories and digit)
+            or ("w" in self.categories and word)
+            or ("S" in self.categories and not space)
+            or ("D" in self.categories and not digit)
+            or ("W" in self.categories and not word)
+        )
+        return member != self.negated
+
+
+_escapes = {"n": "\n", "t": "\t", "r": "\r", "f": "\f", "v": "\v", "0": "\0"}
+
+
+class _PatternParser:
+    """Parses the supported subset of regex syntax into a tree.
+
+    Nodes are tuples, with the node type first:
+      ("set", CharSet)
+      ("cat", [node, ...])
+      ("alt", [node, ...])
+      ("repeat", node, min, lazy) -- min is 0 or 1, with no maximum
+      ("opt", node, lazy)
+    """
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.pos = 0
+        self.multiline = False
+        self.dotall = False
+        self.lazy = False
+        self.context = None
+
+    def error(self, msg):
+        return ValueError(f"{msg} at offset {self.pos} in {self.pattern!r}")
+
+    def peek(self, n=1):
+        return self.pattern[self.pos : self.pos + n]
+
+    def take(self, n=1):
+        s = self.peek(n)
+        self.pos += n
+        return s
+
+    def parse(self):
+        m = re.match(r"\(\?([a-zA-Z]+)\)", self.pattern)
+        if m:
+            for flag in m.group(1):
+                if flag == "m":
+                    self.multiline = True
+                elif flag == "s":
+                    self.dotall = True
+                else:
+                    raise self.error(f"unsupported flag {flag!r}")
+            self.pos = m.end()
+
+        body = self.parse_alt(in_context=False)
+        if self.peek(3) == "(?=":
+            self.take(3)
+            self.context = self.parse_alt(in_context=True)
+            if self.take() != ")":
+                raise self.error("unterminated lookahead")
+        if self.pos != len(self.pattern):
+            raise self.error("unsupported syntax")
+        return body
+
+    def parse_alt(self, in_context):
+        alts = [self.parse_cat(in_context)]
+        while self.peek() == "|":
+            self.take()
+            alts.append(self.parse_cat(in_context))
+        return alts[0] if len(alts) == 1 else ("alt", alts)
+
+    def parse_cat(self, in_context):
+        items = []
+        while self.pos < len(self.pattern) and self.peek() not in "|)":
+            if self.peek(3) == "(?=":
+                if in_context:
+                    raise self.error("nested lookahead")
+                break
+            items.append(self.parse_repeat(in_context))
+        return items[0] if len(items) == 1 else ("cat", items)
+
+    def parse_repeat(self, in_context):
+        node = self.parse_atom(in_context)
+        while self.peek() in ("*", "+", "?") and self.peek():
+            op = self.take()
+            lazy = self.peek() == "?"
+            if lazy:
+                self.take()
+                self.lazy = True
+            if op == "?":
+                node = ("opt", node, lazy)
+            else:
+                node = ("repeat", node, 0 if op == "*" else 1, lazy)
+        return node
+
+    def parse_atom(self, in_context):
+        c = self.take()
+        if c == "(":
+            if self.peek(2) == "?:":
+                self.take(2)
+            elif self.peek(3) == "?P<":
+                self.pos = self.pattern.index(">", self.pos) + 1
+            elif self.peek() == "?":
+                raise self.error("unsupported group")
+            node = self.parse_alt(in_context)
+            if self.take() != ")":
+                raise self.error("unterminated group")
+            return node
+        elif c == "[":
+            return ("set", self.parse_class())
+        elif c == ".":
+            return (
+                "set",
+                CharSet(frozenset("" if self.dotall else "\n"), negated=True),
+            )
+        elif c == "$":
+            if not in_context:
+                raise self.error("'$' is only supported in trailing context")
+            chars = frozenset("\n" if self.multiline else "")
+            return ("set", CharSet(chars, eof=True))
+        elif c == "\\":
+            return ("set", self.parse_escape())
+        elif c in "^*+?{":
+            raise self.error(f"unsupported syntax {c!r}")
+        return ("set", CharSet(frozenset(c)))
+
+    def parse_escape(self):
+        c = self.take()
+        if c in "sdwSDW":
+            return CharSet(categories=frozenset(c))
+        elif c in _escapes:
+            return CharSet(frozenset(_escapes[c]))
+        elif c.isalnum():
+            raise self.error(f"unsupported escape \\{c}")
+        return CharSet(frozenset(c))
+
+    def parse_class(self):
+        negated = self.peek() == "^"
+        if negated:
+            self.take()
+        chars = set()
+        categories = set()
+        first = True
+        while first or self.peek() != "]":
+            first = False
+            c = self.take()
+            if c == "":
+                raise self.error("unterminated character class")
+            if c == "\\":
+                escaped = self.parse_escape()
+                chars.update(escaped.chars)
+                categories.update(escaped.categories)
+                continue
+            if self.peek() == "-" and self.peek(2) != "-]":
+                self.take()
+                end = self.take()
+                if end == "\\":
+                    end = next(iter(self.parse_escape().chars))
+                if ord(end) - ord(c) > 0x100:
+                    raise self.error("character range too large")
+                chars.update(chr(k) for k in range(ord(c), ord(end) + 1))
+                continue
+            chars.add(c)
+        self.take()
+        return CharSet(frozenset(chars), frozenset(categories), negated)
+
+
+def _fixed_length(node):
+    """Returns the length of strings matched by a node, which must be fixed."""
+    kind = node[0]
+    if kind == "set":
+        return 1
+    elif kind == "cat":
+        return sum(_fixed_length(n) for n in node[1])
+    elif kind == "alt":
+        lengths = {_fixed_length(n) for n in node[1]}
+        if len(lengths) == 1:
+            return lengths.pop()
+    raise ValueError("trailing context must have a fixed length")
+
+
+class _Nfa:
+    """A Thompson NFA for all the rules of one lexer mode."""
+
+    def __init__(self):
+        self.edges = []  # state -> [(CharSet, target)]
+        self.eps = []  # state -> [target]
+        self.owner = []  # state -> rule index
+        self.accepts = {}  # accepting state -> rule index
+
+    def state(self, rule):
+        self.edges.append([])
+        self.eps.append([])
+        self.owner.append(rule)
+        return len(self.owner) - 1
+
+    def build(self, node, rule):
+        """Builds a fragment for the node. Returns (start, end) states."""
+
+        kind = node[0]
+        start = self.state(rule)
+        if kind == "set":
+            end = self.state(rule)
+            self.edges[start].append((node[1], end))
+        elif kind == "cat":
+            end = start
+            for item in node[1]:
+                s, e = self.build(item, rule)
+                self.eps[end].append(s)
+                end = e
+        elif kind == "alt":
+            end = self.state(rule)
+            for item in node[1]:
+                s, e = self.build(item, rule)
+                self.eps[start].append(s)
+                self.eps[e].append(end)
+        elif kind == "repeat":
+            _, inner, minimum, _ = node
+            end = self.state(rule)
+            s, e = self.build(inner, rule)
+            self.eps[start].append(s)
+            self.eps[e].append(s)
+            self.eps[e].append(end)
+            if minimum == 0:
+                self.eps[start].append(end)
+        else:
+            assert kind == "opt"
+            end = self.state(rule)
+            s, e = self.build(node[1], rule)
+            self.eps[start].extend([s, end])
+            self.eps[e].append(end)
+        return start, end
+
+    def closure(self, states):
+        result = set(states)
+        todo = list(states)
+        while todo:
+            for t in self.eps[todo.pop()]:
+                if t not in result:
+                    result.add(t)
+                    todo.append(t)
+        return result
+
+
+@attr.s(slots=True, frozen=True)
+class DfaRule:
+    token_type = attr.ib()
+    channel = attr.ib()
+    context = attr.ib()  # length of the trailing context
+    shortest = attr.ib()  # whether the rule stops at its shortest match
+
+
+class Dfa:
+    """A minimized DFA recognising the tokens of one lexer mode.
+
+    Characters are first mapped to character classes, which are sets of
+    characters that no rule can tell apart; 'transitions' then holds one row
+    per state, with one column per class. Dead transitions are -1. 'accepts'
+    gives the indices of the rules accepted in each state, in priority order.
+    """
+
+    DEAD = -1
+
+    def __init__(self, rules):
+        start_time = time.perf_counter()
+        self.rules = []
+        nfa = _Nfa()
+        starts = []
+        for k, (pattern, token_type, channel) in enumerate(rules):
+            parser = _PatternParser(pattern)
+            body = parser.parse()
+            context = 0
+            if parser.context is not None:
+                context = _fixed_length(parser.context)
+                body = ("cat", [body, parser.context])
+            s, e = nfa.build(body, k)
+            starts.append(s)
+            nfa.accepts[e] = k
+            self.rules.append(DfaRule(token_type, channel, context, parser.lazy))
+
+        self._build_classes(nfa)
+        self._build_states(nfa, starts)
+        unminimized = len(self.accepts)
+        self._minimize()
+
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        logger.debug(
+            __(
+                "Built DFA ({} states, {} before minimization, {} classes) in {:.2f}ms",
+                len(self.accepts),
+                unminimized,
+                self.class_count,
+                elapsed_ms,
+            )
+        )
+
+    def _build_classes(self, nfa):
+        # Every character which appears explicitly in a set is tested
+        # individually. All others can only be distinguished by their
+        # categories, so there are at most eight more classes, plus one for
+        # the end of the input.
+        charsets = list({cs for edges in nfa.edges for cs, _ in edges})
+        explicit = set()
+        for cs in charsets:
+            explicit.update(cs.chars)
+
+        signatures = {}
+        self.representatives = []
+
+        def class_of(signature, representative):
+            if signature not in signatures:
+                signatures[signature] = len(self.representatives)
+                self.representatives.append(representative)
+            return signatures[signature]
+
+        self.charmap = {}
+        for c in sorted(explicit):
+            signature = tuple(cs.contains(c) for cs in charsets)
+            self.charmap[c] = class_of(signature, c)
+
+        self.category_classes = {}
+        for space in (False, True):
+            for digit in (False, True):
+                for word in (False, True):
+                    cats = (space, digit, word)
+                    signature = tuple(cs.contains_categories(*cats) for cs in charsets)
+                    self.category_classes[cats] = class_of(signature, cats)
+
+        self.eof_class = len(self.representatives)
+        self.representatives.append(EOF)
+        self.class_count = len(self.representatives)
+
+    def _contains(self, cs, representative):
+        if isinstance(representative, tuple):
+            return cs.contains_categories(*representative)
+        return cs.contains(representative)
+
+    def _build_states(self, nfa, starts):
+        def close(states):
+            states = nfa.closure(states)
+            # Once a shortest-match rule accepts, drop the rest of its states
+            # so that it can't go on to accept a longer match.
+            for s in [s for s in states if s in nfa.accepts]:
+                rule = nfa.accepts[s]
+                if self.rules[rule].shortest:
+                    states = {t for t in states if nfa.owner[t] != rule or t == s}
+            return frozenset(states)
+
+        start = close(starts)
+        index = {start: 0}
+        sets = [start]
+        transitions = []
+        current = 0
+        while current < len(sets):
+            row = []
+            for rep in self.representatives:
+                targets = {
+                    t
+                    for s in sets[current]
+                    for cs, t in nfa.edges[s]
+                    if self._contains(cs, rep)
+                }
+                if not targets:
+                    row.append(self.DEAD)
+                    continue
+                target = close(targets)
+                if target not in index:
+                    index[target] = len(sets)
+                    sets.append(target)
+                row.append(index[target])
+            transitions.append(row)
+            current += 1
+
+        self.accepts = [
+            tuple(sorted(nfa.accepts[s] for s in states if s in nfa.accepts))
+            for states in sets
+        ]
+        self.transitions = transitions
+
+    def _minimize(self):
+        # Moore's algorithm: start by splitting the states by what they
+        # accept, then keep splitting blocks whose states have transitions
+        # into different blocks until nothing changes.
+        blocks = list(self.accepts)
+        count = None
+        while True:
+            signatures = {}
+            new_blocks = []
+            for state, row in enumerate(self.transitions):
+                signature = (blocks[state],) + tuple(
+                    self.DEAD if t == self.DEAD else blocks[t] for t in row
+                )
+                new_blocks.append(signatures.setdefault(signature, len(signatures)))
+            if len(signatures) == count:
+                break
+            count = len(signatures)
+            blocks = new_blocks
+
+        # renumber so that the start state stays at 0
+        order = {}
+        for state in range(len(blocks)):
+            order.setdefault(blocks[state], len(order))
+        accepts = [None] * len(order)
+        transitions = array.array("i", [self.DEAD]) * (len(order) * self.class_count)
+        for state, row in enumerate(self.transitions):
+            new = order[blocks[state]]
+            accepts[new] = self.accepts[state]
+            for cls, t in enumerate(row):
+                if t != self.DEAD:
+                    transitions[new * self.class_count + cls] = order[blocks[t]]
+        self.accepts = accepts
+        self.transitions = transitions
+
+    def classify(self, c):
+        """Returns the character class of a character."""
+        try:
+            return self.charmap[c]
+        except KeyError:
+            cls = self.category_classes[_categories(c)]
+            self.charmap[c] = cls
+            return cls
+
+    def scan(self, text, pos, state, last):
+        """Runs the DFA over text, starting at pos in the given state.
+
+        'last' is the last accepting (state, end) pair seen, or None. Returns a
+        new (pos, state, last) triple. If the state is DEAD, then scanning is
+        complete; otherwise, the end of the text was reached, and scanning may
+        be resumed with more text.
+        """
+
+        transitions = self.transitions
+        accepts = self.accepts
+        width = self.class_count
+        charmap = self.charmap
+        end = len(text)
+        while pos < end:
+            c = text[pos]
+            cls = charmap.get(c)
+            if cls is None:
+                cls = self.classify(c)
+            state = transitions[state * width + cls]
+            if state < 0:
+                return pos, state, last
+            pos += 1
+            if accepts[state]:
+                last = (state, pos)
+        return pos, state, last
+
+    def scan_eof(self, pos, state, last):
+        """Feeds the end-of-input pseudo-character to the DFA."""
+        state = self.transitions[state * self.class_count + self.eof_class]
+        if state >= 0 and self.accepts[state]:
+            last = (state, pos + 1)
+        return last
+
+
+class DfaLexer:
+    def __init__(self, eof, rules, trivia=None):
+        """Create a DFA-based lexer callable.
+
+        rules and trivia are given in the same form as for parsing.Lexer, and
+        the result can be used in its place.
+        """
+
+        self.eof = eof
+        self.trivia = trivia
+        mode_rules = {}
+        for mptc in rules:
+            mode, channel = Parser.NORMAL_MODE, ReStream.CHANNEL_DEFAULT
+            if len(mptc) == 2:
+                pattern, tt = mptc
+            elif len(mptc) == 3:
+                mode, pattern, tt = mptc
+            else:
+                mode, pattern, tt, channel = mptc
+            mode_rules.setdefault(mode, []).append((pattern, tt, channel))
+        self.dfas = {mode: Dfa(rs) for mode, rs in mode_rules.items()}
+
+    def __call__(self, stream: ReStream, mode: int) -> Token:
+        if self.trivia is not None and mode in self.trivia.modes:
+            self.trivia.skip(stream, mode)
+        try:
+            stream.assure_buffer()
+        except StopIteration:
+            return stream.produce_eof(self.eof)
+
+        dfa = self.dfas[mode]
+        if parsing.counters is not None:
+            parsing.counters.lexer_attempts[(mode, parsing.Counters.DFA)] += 1
+        text = stream.text()
+        start = stream.position
+        pos, state, last = dfa.scan(text, start, 0, None)
+        while state >= 0:
+            try:
+                stream.extend_buffer()
+            except StopIteration:
+                last = dfa.scan_eof(pos, state, last)
+                break
+            text = stream.text()
+            pos, state, last = dfa.scan(text, pos, state, last)
+
+        assert last is not None, "no match!"  # TODO: proper exception
+        # Skip over any rules which would produce an empty token, since we'd
+        # never make progress otherwise.
+        state, pos = last
+        for k in dfa.accepts[state]:
+            rule = dfa.rules[k]
+            end = pos - rule.context
+            if end > start:
+                break
+        else:
+            assert False, "empty token"  # TODO: proper exception
+        if parsing.counters is not None:
+            parsing.counters.lexer_matches[(mode, rule.token_type)] += 1
+        return stream.produce_text(rule.token_type, text[start:end], rule.channel)
@@ -14,6 +14,6 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from .compiler import parse, translate
+from .compiler import parse, parse_toplevels, reparse, translate
 
-__all__ = ["parse", "translate"]
+__all__ = ["parse", "parse_toplevels", "reparse", "translate"]
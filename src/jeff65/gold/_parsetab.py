@@ -0,0 +1,721 @@
+# jeff65 generated parser tables
+# Generated from jeff65.gold.grammar by `jeff65 gen-parser`. Do not edit.
+
+VERSION = 4
+FINGERPRINT = "f0dc6740dfad1f2c575d4b0d3f5968083875ddad65575967d69a836f83e25c5e"
+
+SYMBOLS = [
+    "$EMPTY",
+    "n:alist",
+    "n:alist_inner",
+    "n:array",
+    "n:block",
+    "n:branch_else",
+    "n:branch_else_if",
+    "n:branch_else_ifs",
+    "n:comment",
+    "n:comment_inner",
+    "n:comment_nested",
+    "n:declaration",
+    "n:do_block",
+    "n:expr",
+    "n:hidden",
+    "n:member",
+    "n:plist",
+    "n:plist_inner",
+    "n:range_to",
+    "n:stmt_assign",
+    "n:stmt_call",
+    "n:stmt_constant",
+    "n:stmt_for",
+    "n:stmt_fun",
+    "n:stmt_if",
+    "n:stmt_isr",
+    "n:stmt_let",
+    "n:stmt_return",
+    "n:stmt_use",
+    "n:stmt_while",
+    "n:storage",
+    "n:string",
+    "n:string_inner",
+    "n:toplevel",
+    "n:type_id",
+    "n:unit",
+    "t:T.BRACKET_CLOSE",
+    "t:T.BRACKET_OPEN",
+    "t:T.COMMENT_CLOSE",
+    "t:T.COMMENT_OPEN",
+    "t:T.COMMENT_TEXT",
+    "t:T.EOF",
+    "t:T.IDENTIFIER",
+    "t:T.NUMERIC",
+    "t:T.OPERATOR_ASSIGN",
+    "t:T.OPERATOR_ASSIGN_DEC",
+    "t:T.OPERATOR_ASSIGN_INC",
+    "t:T.OPERATOR_BITAND",
+    "t:T.OPERATOR_BITNOT",
+    "t:T.OPERATOR_BITOR",
+    "t:T.OPERATOR_BITXOR",
+    "t:T.OPERATOR_DEREF",
+    "t:T.OPERATOR_DIVIDE",
+    "t:T.OPERATOR_DOT",
+    "t:T.OPERATOR_EQ",
+    "t:T.OPERATOR_GE",
+    "t:T.OPERATOR_GT",
+    "t:T.OPERATOR_LE",
+    "t:T.OPERATOR_LT",
+    "t:T.OPERATOR_MINUS",
+    "t:T.OPERATOR_NE",
+    "t:T.OPERATOR_PLUS",
+    "t:T.OPERATOR_REF",
+    "t:T.OPERATOR_SHL",
+    "t:T.OPERATOR_SHR",
+    "t:T.OPERATOR_TIMES",
+    "t:T.PAREN_CLOSE",
+    "t:T.PAREN_OPEN",
+    "t:T.PUNCT_ARROWR",
+    "t:T.PUNCT_COLON",
+    "t:T.PUNCT_COMMA",
+    "t:T.PUNCT_DO",
+    "t:T.PUNCT_ELSE",
+    "t:T.PUNCT_ELSEIF",
+    "t:T.PUNCT_END",
+    "t:T.PUNCT_ENDFUN",
+    "t:T.PUNCT_ENDISR",
+    "t:T.PUNCT_IN",
+    "t:T.PUNCT_SEMICOLON",
+    "t:T.PUNCT_THEN",
+    "t:T.PUNCT_TO",
+    "t:T.STMT_CONSTANT",
+    "t:T.STMT_FOR",
+    "t:T.STMT_FUN",
+    "t:T.STMT_IF",
+    "t:T.STMT_ISR",
+    "t:T.STMT_LET",
+    "t:T.STMT_RETURN",
+    "t:T.STMT_USE",
+    "t:T.STMT_WHILE",
+    "t:T.STORAGE_MUT",
+    "t:T.STORAGE_STASH",
+    "t:T.STRING",
+    "t:T.STRING_DELIM",
+    "t:T.STRING_ESCAPE",
+    "t:T.WHITESPACE",
+]
+
+PARSER = {
+    "channel": 0,
+    "modes": [
+        0, 0, 0, 0, 0, -1, -1, 0, -1, 0, -1, -1, -1, 0, 0, 0, 0, 0, 0, 0, -1, -1, 0, 0,
+        0, 0, 0, 0, 0, 0, 0, 0, 2, -1, 0, 0, 0, 0, 0, 0, 0, 0, 0, -1, 0, 0, 0, 0, 0, 0,
+        0, 0, 0, 0, 0, 0, 0, 0, 0, 0, -1, -1, -1, 0, 0, -1, 0, -1, 0, 0, 0, 0, 0, 0, 0,
+        -1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, -1, 0, 0, 0, 0, 0, 2, 0, 0, 0, 0, 0, -1, 0, 0,
+        -1, 0, 0, 0, 0, 0, 0, 0, -1, 0, 0, -1, 0, 0, 0, 0, -1, 0, 0, 0, 0, 0, 0, -1, -1,
+        0, -1, 0, 0, -1, 0, 0, -1, 0, 0, 0, 0, 0
+    ],
+    "reductions": [
+        57, 57, 59, 60, -1, -1, -1, 23, -1, 58, -1, -1, -1, 55, -1, 24, 32, -1, -1, 45,
+        -1, -1, 55, 8, 18, -1, -1, -1, -1, -1, 51, -1, 21, -1, 31, 31, 8, 2, 30, 23, 26,
+        23, 47, -1, 46, 44, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 2, 56, 10, 9, -1,
+        -1, -1, 52, -1, -1, -1, -1, 3, 0, -1, -1, 23, 55, -1, -1, 53, 11, 12, 13, 15, 6,
+        4, 17, 16, 14, -1, 5, -1, 55, 35, 55, 22, 20, 33, 33, 19, -1, -1, 28, -1, -1,
+        -1, 48, 7, 54, -1, -1, -1, -1, 1, -1, -1, 49, 55, 36, -1, -1, 40, -1, 55, -1,
+        41, 34, -1, -1, 27, -1, 25, 42, -1, 39, 38, -1, 29, 50, 43, 55, 37
+    ],
+    "actions": [
+        0, 21, 4, 0, 23, 4, 0, 25, 4, 0, 26, 4, 0, 28, 4, 0, 33, 8, 0, 35, 12, 0, 41,
+        134, 0, 81, 17, 0, 83, 21, 0, 85, 25, 0, 86, 29, 0, 88, 33, 1, 21, 4, 1, 23, 4,
+        1, 25, 4, 1, 26, 4, 1, 28, 4, 1, 33, 36, 1, 41, 134, 1, 81, 17, 1, 83, 21, 1,
+        85, 25, 1, 86, 29, 1, 88, 33, 2, 41, 262286, 3, 41, 3, 4, 11, 40, 4, 42, 45, 5,
+        42, 49, 6, 42, 53, 7, 30, 56, 7, 42, 122, 7, 90, 61, 7, 91, 61, 8, 42, 65, 9,
+        41, 524422, 10, 44, 69, 11, 69, 73, 12, 67, 77, 13, 4, 80, 13, 13, 84, 13, 19,
+        88, 13, 20, 92, 13, 21, 88, 13, 22, 88, 13, 24, 88, 13, 26, 88, 13, 27, 88, 13,
+        29, 88, 13, 31, 96, 13, 42, 97, 13, 43, 97, 13, 48, 101, 13, 51, 105, 13, 59,
+        105, 13, 67, 109, 13, 76, 18, 13, 81, 17, 13, 82, 113, 13, 84, 117, 13, 86, 29,
+        13, 87, 121, 13, 89, 125, 13, 93, 129, 14, 11, 132, 14, 42, 45, 15, 37, 262266,
+        15, 42, 262266, 15, 62, 262266, 16, 0, 524402, 16, 81, 524402, 16, 83, 524402,
+        16, 85, 524402, 16, 86, 524402, 16, 88, 524402, 17, 3, 136, 17, 13, 140, 17, 20,
+        144, 17, 31, 96, 17, 37, 149, 17, 42, 97, 17, 43, 97, 17, 48, 101, 17, 51, 105,
+        17, 59, 105, 17, 67, 109, 17, 93, 129, 18, 34, 152, 18, 37, 157, 18, 42, 161,
+        18, 62, 165, 19, 11, 168, 19, 16, 172, 19, 17, 176, 19, 42, 45, 19, 66, 66, 20,
+        76, 181, 21, 37, 185, 21, 44, 189, 21, 45, 189, 21, 46, 189, 21, 47, 193, 21,
+        49, 197, 21, 50, 201, 21, 52, 205, 21, 53, 209, 21, 54, 213, 21, 55, 213, 21,
+        56, 213, 21, 57, 213, 21, 58, 213, 21, 59, 217, 21, 60, 213, 21, 61, 217, 21,
+        63, 221, 21, 64, 221, 21, 65, 205, 21, 67, 225, 22, 4, 228, 22, 13, 84, 22, 19,
+        88, 22, 20, 92, 22, 21, 88, 22, 22, 88, 22, 24, 88, 22, 26, 88, 22, 27, 88, 22,
+        29, 88, 22, 31, 96, 22, 42, 97, 22, 43, 97, 22, 48, 101, 22, 51, 105, 22, 59,
+        105, 22, 67, 109, 22, 72, 18, 22, 73, 18, 22, 74, 18, 22, 75, 18, 22, 76, 18,
+        22, 81, 17, 22, 82, 113, 22, 84, 117, 22, 86, 29, 22, 87, 121, 22, 89, 125, 22,
+        93, 129, 23, 4, 228, 23, 13, 84, 23, 19, 88, 23, 20, 92, 23, 21, 88, 23, 22, 88,
+        23, 24, 88, 23, 26, 88, 23, 27, 88, 23, 29, 88, 23, 31, 96, 23, 37, 262198, 23,
+        42, 97, 23, 43, 97, 23, 44, 262198, 23, 45, 262198, 23, 46, 262198, 23, 47,
+        262198, 23, 48, 101, 23, 49, 262198, 23, 50, 262198, 23, 51, 105, 23, 52,
+        262198, 23, 53, 262198, 23, 54, 262198, 23, 55, 262198, 23, 56, 262198, 23, 57,
+        262198, 23, 58, 262198, 23, 59, 262198, 23, 60, 262198, 23, 61, 262198, 23, 63,
+        262198, 23, 64, 262198, 23, 65, 262198, 23, 67, 109, 23, 81, 17, 23, 82, 113,
+        23, 84, 117, 23, 86, 29, 23, 87, 121, 23, 89, 125, 23, 93, 129, 24, 0, 262198,
+        24, 36, 262198, 24, 37, 262198, 24, 42, 262198, 24, 43, 262198, 24, 44, 262198,
+        24, 45, 262198, 24, 46, 262198, 24, 47, 262198, 24, 48, 262198, 24, 49, 262198,
+        24, 50, 262198, 24, 51, 262198, 24, 52, 262198, 24, 53, 262198, 24, 54, 262198,
+        24, 55, 262198, 24, 56, 262198, 24, 57, 262198, 24, 58, 262198, 24, 59, 262198,
+        24, 60, 262198, 24, 61, 262198, 24, 63, 262198, 24, 64, 262198, 24, 65, 262198,
+        24, 66, 262198, 24, 67, 262198, 24, 70, 262198, 24, 71, 262198, 24, 79, 262198,
+        24, 80, 262198, 24, 81, 262198, 24, 82, 262198, 24, 83, 262198, 24, 84, 262198,
+        24, 85, 262198, 24, 86, 262198, 24, 87, 262198, 24, 88, 262198, 24, 89, 262198,
+        24, 93, 262198, 25, 13, 232, 25, 20, 144, 25, 31, 96, 25, 42, 97, 25, 43, 97,
+        25, 48, 101, 25, 51, 105, 25, 59, 105, 25, 67, 109, 25, 93, 129, 26, 13, 236,
+        26, 20, 144, 26, 31, 96, 26, 42, 97, 26, 43, 97, 26, 48, 101, 26, 51, 105, 26,
+        59, 105, 26, 67, 109, 26, 93, 129, 27, 13, 240, 27, 20, 144, 27, 31, 96, 27, 42,
+        97, 27, 43, 97, 27, 48, 101, 27, 51, 105, 27, 59, 105, 27, 67, 109, 27, 93, 129,
+        28, 11, 244, 28, 42, 45, 29, 13, 248, 29, 20, 144, 29, 31, 96, 29, 42, 97, 29,
+        43, 97, 29, 48, 101, 29, 51, 105, 29, 59, 105, 29, 67, 109, 29, 93, 129, 30, 0,
+        262254, 30, 13, 252, 30, 20, 144, 30, 31, 96, 30, 42, 97, 30, 43, 97, 30, 48,
+        101, 30, 51, 105, 30, 59, 105, 30, 67, 109, 30, 81, 262254, 30, 82, 262254, 30,
+        84, 262254, 30, 86, 262254, 30, 87, 262254, 30, 89, 262254, 30, 93, 129, 31, 13,
+        256, 31, 20, 144, 31, 31, 96, 31, 42, 97, 31, 43, 97, 31, 48, 101, 31, 51, 105,
+        31, 59, 105, 31, 67, 109, 31, 93, 129, 32, 32, 260, 32, 92, 130, 32, 93, 130,
+        32, 94, 130, 33, 44, 265, 34, 0, 1048662, 34, 42, 1048662, 34, 43, 1048662, 34,
+        48, 1048662, 34, 51, 1048662, 34, 59, 1048662, 34, 67, 1048662, 34, 81, 1048662,
+        34, 82, 1048662, 34, 83, 1048662, 34, 84, 1048662, 34, 85, 1048662, 34, 86,
+        1048662, 34, 87, 1048662, 34, 88, 1048662, 34, 89, 1048662, 34, 93, 1048662, 35,
+        0, 1048662, 35, 37, 185, 35, 42, 1048662, 35, 43, 1048662, 35, 47, 193, 35, 48,
+        1048662, 35, 49, 197, 35, 50, 201, 35, 51, 1048662, 35, 52, 205, 35, 53, 209,
+        35, 54, 213, 35, 55, 213, 35, 56, 213, 35, 57, 213, 35, 58, 213, 35, 59, 217,
+        35, 60, 213, 35, 61, 217, 35, 63, 221, 35, 64, 221, 35, 65, 205, 35, 67, 225,
+        35, 81, 1048662, 35, 82, 1048662, 35, 83, 1048662, 35, 84, 1048662, 35, 85,
+        1048662, 35, 86, 1048662, 35, 87, 1048662, 35, 88, 1048662, 35, 89, 1048662, 35,
+        93, 1048662, 36, 0, 262198, 36, 36, 262198, 36, 37, 262198, 36, 42, 262198, 36,
+        43, 262198, 36, 44, 262198, 36, 45, 262198, 36, 46, 262198, 36, 47, 262198, 36,
+        48, 262198, 36, 49, 262198, 36, 50, 262198, 36, 51, 262198, 36, 52, 262198, 36,
+        53, 262198, 36, 54, 262198, 36, 55, 262198, 36, 56, 262198, 36, 57, 262198, 36,
+        58, 262198, 36, 59, 262198, 36, 60, 262198, 36, 61, 262198, 36, 63, 262198, 36,
+        64, 262198, 36, 65, 262198, 36, 66, 262198, 36, 67, 262198, 36, 70, 262198, 36,
+        71, 262198, 36, 79, 262198, 36, 80, 262198, 36, 81, 262198, 36, 82, 262198, 36,
+        83, 262198, 36, 84, 262198, 36, 85, 262198, 36, 86, 262198, 36, 87, 262198, 36,
+        88, 262198, 36, 89, 262198, 36, 93, 262198, 37, 1, 268, 37, 2, 272, 37, 13, 276,
+        37, 20, 144, 37, 31, 96, 37, 36, 6, 37, 42, 97, 37, 43, 97, 37, 48, 101, 37, 51,
+        105, 37, 59, 105, 37, 67, 109, 37, 93, 129, 38, 44, 786478, 38, 66, 786478, 38,
+        70, 786478, 38, 77, 786478, 39, 30, 280, 39, 37, 122, 39, 42, 122, 39, 62, 122,
+        39, 90, 61, 39, 91, 61, 40, 0, 262282, 40, 36, 262282, 40, 42, 262282, 40, 43,
+        262282, 40, 44, 262282, 40, 48, 262282, 40, 51, 262282, 40, 59, 262282, 40, 66,
+        262282, 40, 67, 262282, 40, 70, 262282, 40, 77, 262282, 40, 78, 262282, 40, 81,
+        262282, 40, 82, 262282, 40, 84, 262282, 40, 86, 262282, 40, 87, 262282, 40, 89,
+        262282, 40, 93, 262282, 41, 30, 284, 41, 37, 122, 41, 42, 122, 41, 62, 122, 41,
+        90, 61, 41, 91, 61, 42, 66, 262214, 42, 70, 262214, 43, 66, 293, 44, 66, 262210,
+        44, 70, 297, 45, 0, 1048678, 45, 81, 1048678, 45, 83, 1048678, 45, 85, 1048678,
+        45, 86, 1048678, 45, 88, 1048678, 46, 13, 300, 46, 20, 144, 46, 31, 96, 46, 42,
+        97, 46, 43, 97, 46, 48, 101, 46, 51, 105, 46, 59, 105, 46, 67, 109, 46, 93, 129,
+        47, 13, 304, 47, 20, 144, 47, 31, 96, 47, 42, 97, 47, 43, 97, 47, 48, 101, 47,
+        51, 105, 47, 59, 105, 47, 67, 109, 47, 93, 129, 48, 13, 308, 48, 20, 144, 48,
+        31, 96, 48, 42, 97, 48, 43, 97, 48, 48, 101, 48, 51, 105, 48, 59, 105, 48, 67,
+        109, 48, 93, 129, 49, 13, 312, 49, 20, 144, 49, 31, 96, 49, 42, 97, 49, 43, 97,
+        49, 48, 101, 49, 51, 105, 49, 59, 105, 49, 67, 109, 49, 93, 129, 50, 13, 316,
+        50, 20, 144, 50, 31, 96, 50, 42, 97, 50, 43, 97, 50, 48, 101, 50, 51, 105, 50,
+        59, 105, 50, 67, 109, 50, 93, 129, 51, 13, 320, 51, 20, 144, 51, 31, 96, 51, 42,
+        97, 51, 43, 97, 51, 48, 101, 51, 51, 105, 51, 59, 105, 51, 67, 109, 51, 93, 129,
+        52, 15, 324, 52, 42, 329, 53, 13, 332, 53, 20, 144, 53, 31, 96, 53, 42, 97, 53,
+        43, 97, 53, 48, 101, 53, 51, 105, 53, 59, 105, 53, 67, 109, 53, 93, 129, 54, 13,
+        336, 54, 20, 144, 54, 31, 96, 54, 42, 97, 54, 43, 97, 54, 48, 101, 54, 51, 105,
+        54, 59, 105, 54, 67, 109, 54, 93, 129, 55, 13, 340, 55, 20, 144, 55, 31, 96, 55,
+        42, 97, 55, 43, 97, 55, 48, 101, 55, 51, 105, 55, 59, 105, 55, 67, 109, 55, 93,
+        129, 56, 1, 344, 56, 2, 272, 56, 13, 276, 56, 20, 144, 56, 31, 96, 56, 42, 97,
+        56, 43, 97, 56, 48, 101, 56, 51, 105, 56, 59, 105, 56, 66, 6, 56, 67, 109, 56,
+        93, 129, 57, 72, 524306, 57, 73, 524306, 57, 74, 524306, 57, 75, 524306, 57, 76,
+        524306, 58, 0, 524342, 58, 36, 524342, 58, 37, 185, 58, 42, 524342, 58, 43,
+        524342, 58, 44, 524342, 58, 45, 524342, 58, 46, 524342, 58, 47, 524342, 58, 48,
+        524342, 58, 49, 524342, 58, 50, 524342, 58, 51, 524342, 58, 52, 524342, 58, 53,
+        209, 58, 54, 524342, 58, 55, 524342, 58, 56, 524342, 58, 57, 524342, 58, 58,
+        524342, 58, 59, 524342, 58, 60, 524342, 58, 61, 524342, 58, 63, 524342, 58, 64,
+        524342, 58, 65, 524342, 58, 66, 524342, 58, 67, 225, 58, 70, 524342, 58, 71,
+        524342, 58, 79, 524342, 58, 80, 524342, 58, 81, 524342, 58, 82, 524342, 58, 83,
+        524342, 58, 84, 524342, 58, 85, 524342, 58, 86, 524342, 58, 87, 524342, 58, 88,
+        524342, 58, 89, 524342, 58, 93, 524342, 59, 0, 524342, 59, 36, 524342, 59, 37,
+        185, 59, 42, 524342, 59, 43, 524342, 59, 44, 524342, 59, 45, 524342, 59, 46,
+        524342, 59, 47, 524342, 59, 48, 524342, 59, 49, 524342, 59, 50, 524342, 59, 51,
+        524342, 59, 52, 524342, 59, 53, 209, 59, 54, 524342, 59, 55, 524342, 59, 56,
+        524342, 59, 57, 524342, 59, 58, 524342, 59, 59, 524342, 59, 60, 524342, 59, 61,
+        524342, 59, 63, 524342, 59, 64, 524342, 59, 65, 524342, 59, 66, 524342, 59, 67,
+        225, 59, 70, 524342, 59, 71, 524342, 59, 79, 524342, 59, 80, 524342, 59, 81,
+        524342, 59, 82, 524342, 59, 83, 524342, 59, 84, 524342, 59, 85, 524342, 59, 86,
+        524342, 59, 87, 524342, 59, 88, 524342, 59, 89, 524342, 59, 93, 524342, 60, 37,
+        185, 60, 47, 193, 60, 49, 197, 60, 50, 201, 60, 52, 205, 60, 53, 209, 60, 54,
+        213, 60, 55, 213, 60, 56, 213, 60, 57, 213, 60, 58, 213, 60, 59, 217, 60, 60,
+        213, 60, 61, 217, 60, 63, 221, 60, 64, 221, 60, 65, 205, 60, 66, 349, 60, 67,
+        225, 61, 77, 353, 62, 37, 185, 62, 47, 193, 62, 49, 197, 62, 50, 201, 62, 52,
+        205, 62, 53, 209, 62, 54, 213, 62, 55, 213, 62, 56, 213, 62, 57, 213, 62, 58,
+        213, 62, 59, 217, 62, 60, 213, 62, 61, 217, 62, 63, 221, 62, 64, 221, 62, 65,
+        205, 62, 67, 225, 62, 79, 357, 63, 0, 524398, 63, 37, 185, 63, 42, 524398, 63,
+        43, 524398, 63, 47, 193, 63, 48, 524398, 63, 49, 197, 63, 50, 201, 63, 51,
+        524398, 63, 52, 205, 63, 53, 209, 63, 54, 213, 63, 55, 213, 63, 56, 213, 63, 57,
+        213, 63, 58, 213, 63, 59, 217, 63, 60, 213, 63, 61, 217, 63, 63, 221, 63, 64,
+        221, 63, 65, 205, 63, 67, 225, 63, 81, 524398, 63, 82, 524398, 63, 84, 524398,
+        63, 86, 524398, 63, 87, 524398, 63, 89, 524398, 63, 93, 524398, 64, 12, 360, 64,
+        37, 185, 64, 47, 193, 64, 49, 197, 64, 50, 201, 64, 52, 205, 64, 53, 209, 64,
+        54, 213, 64, 55, 213, 64, 56, 213, 64, 57, 213, 64, 58, 213, 64, 59, 217, 64,
+        60, 213, 64, 61, 217, 64, 63, 221, 64, 64, 221, 64, 65, 205, 64, 67, 225, 64,
+        71, 365, 65, 92, 369, 65, 93, 373, 65, 94, 369, 66, 3, 376, 66, 13, 380, 66, 20,
+        144, 66, 31, 96, 66, 37, 149, 66, 42, 97, 66, 43, 97, 66, 48, 101, 66, 51, 105,
+        66, 59, 105, 66, 67, 109, 66, 93, 129, 67, 36, 385, 68, 36, 262150, 68, 66,
+        262150, 69, 36, 262154, 69, 37, 185, 69, 47, 193, 69, 49, 197, 69, 50, 201, 69,
+        52, 205, 69, 53, 209, 69, 54, 213, 69, 55, 213, 69, 56, 213, 69, 57, 213, 69,
+        58, 213, 69, 59, 217, 69, 60, 213, 69, 61, 217, 69, 63, 221, 69, 64, 221, 69,
+        65, 205, 69, 66, 262154, 69, 67, 225, 69, 70, 389, 70, 34, 392, 70, 37, 157, 70,
+        42, 161, 70, 62, 165, 71, 34, 396, 71, 37, 157, 71, 42, 161, 71, 62, 165, 72,
+        30, 400, 72, 37, 122, 72, 42, 122, 72, 62, 122, 72, 90, 61, 72, 91, 61, 73, 4,
+        404, 73, 13, 84, 73, 19, 88, 73, 20, 92, 73, 21, 88, 73, 22, 88, 73, 24, 88, 73,
+        26, 88, 73, 27, 88, 73, 29, 88, 73, 31, 96, 73, 42, 97, 73, 43, 97, 73, 48, 101,
+        73, 51, 105, 73, 59, 105, 73, 67, 109, 73, 68, 409, 73, 75, 18, 73, 81, 17, 73,
+        82, 113, 73, 84, 117, 73, 86, 29, 73, 87, 121, 73, 89, 125, 73, 93, 129, 74, 11,
+        412, 74, 42, 45, 75, 36, 417, 75, 37, 185, 75, 47, 193, 75, 49, 197, 75, 50,
+        201, 75, 52, 205, 75, 53, 209, 75, 54, 213, 75, 55, 213, 75, 56, 213, 75, 57,
+        213, 75, 58, 213, 75, 59, 217, 75, 60, 213, 75, 61, 217, 75, 63, 221, 75, 64,
+        221, 75, 65, 205, 75, 67, 225, 76, 0, 786510, 76, 37, 185, 76, 42, 786510, 76,
+        43, 786510, 76, 47, 193, 76, 48, 786510, 76, 49, 197, 76, 50, 201, 76, 51,
+        786510, 76, 52, 205, 76, 53, 209, 76, 54, 213, 76, 55, 213, 76, 56, 213, 76, 57,
+        213, 76, 58, 213, 76, 59, 217, 76, 60, 213, 76, 61, 217, 76, 63, 221, 76, 64,
+        221, 76, 65, 205, 76, 67, 225, 76, 81, 786510, 76, 82, 786510, 76, 84, 786510,
+        76, 86, 786510, 76, 87, 786510, 76, 89, 786510, 76, 93, 786510, 77, 0, 786486,
+        77, 36, 786486, 77, 37, 185, 77, 42, 786486, 77, 43, 786486, 77, 44, 786486, 77,
+        45, 786486, 77, 46, 786486, 77, 47, 786486, 77, 48, 786486, 77, 49, 786486, 77,
+        50, 786486, 77, 51, 786486, 77, 52, 786486, 77, 53, 209, 77, 54, 786486, 77, 55,
+        786486, 77, 56, 786486, 77, 57, 786486, 77, 58, 786486, 77, 59, 786486, 77, 60,
+        786486, 77, 61, 786486, 77, 63, 786486, 77, 64, 786486, 77, 65, 786486, 77, 66,
+        786486, 77, 67, 225, 77, 70, 786486, 77, 71, 786486, 77, 79, 786486, 77, 80,
+        786486, 77, 81, 786486, 77, 82, 786486, 77, 83, 786486, 77, 84, 786486, 77, 85,
+        786486, 77, 86, 786486, 77, 87, 786486, 77, 88, 786486, 77, 89, 786486, 77, 93,
+        786486, 78, 0, 786486, 78, 36, 786486, 78, 37, 185, 78, 42, 786486, 78, 43,
+        786486, 78, 44, 786486, 78, 45, 786486, 78, 46, 786486, 78, 47, 193, 78, 48,
+        786486, 78, 49, 786486, 78, 50, 786486, 78, 51, 786486, 78, 52, 786486, 78, 53,
+        209, 78, 54, 786486, 78, 55, 786486, 78, 56, 786486, 78, 57, 786486, 78, 58,
+        786486, 78, 59, 786486, 78, 60, 786486, 78, 61, 786486, 78, 63, 786486, 78, 64,
+        786486, 78, 65, 786486, 78, 66, 786486, 78, 67, 225, 78, 70, 786486, 78, 71,
+        786486, 78, 79, 786486, 78, 80, 786486, 78, 81, 786486, 78, 82, 786486, 78, 83,
+        786486, 78, 84, 786486, 78, 85, 786486, 78, 86, 786486, 78, 87, 786486, 78, 88,
+        786486, 78, 89, 786486, 78, 93, 786486, 79, 0, 786486, 79, 36, 786486, 79, 37,
+        185, 79, 42, 786486, 79, 43, 786486, 79, 44, 786486, 79, 45, 786486, 79, 46,
+        786486, 79, 47, 193, 79, 48, 786486, 79, 49, 197, 79, 50, 786486, 79, 51,
+        786486, 79, 52, 786486, 79, 53, 209, 79, 54, 786486, 79, 55, 786486, 79, 56,
+        786486, 79, 57, 786486, 79, 58, 786486, 79, 59, 786486, 79, 60, 786486, 79, 61,
+        786486, 79, 63, 786486, 79, 64, 786486, 79, 65, 786486, 79, 66, 786486, 79, 67,
+        225, 79, 70, 786486, 79, 71, 786486, 79, 79, 786486, 79, 80, 786486, 79, 81,
+        786486, 79, 82, 786486, 79, 83, 786486, 79, 84, 786486, 79, 85, 786486, 79, 86,
+        786486, 79, 87, 786486, 79, 88, 786486, 79, 89, 786486, 79, 93, 786486, 80, 0,
+        786486, 80, 36, 786486, 80, 37, 185, 80, 42, 786486, 80, 43, 786486, 80, 44,
+        786486, 80, 45, 786486, 80, 46, 786486, 80, 47, 193, 80, 48, 786486, 80, 49,
+        197, 80, 50, 201, 80, 51, 786486, 80, 52, 786486, 80, 53, 209, 80, 54, 786486,
+        80, 55, 786486, 80, 56, 786486, 80, 57, 786486, 80, 58, 786486, 80, 59, 786486,
+        80, 60, 786486, 80, 61, 786486, 80, 63, 221, 80, 64, 221, 80, 65, 786486, 80,
+        66, 786486, 80, 67, 225, 80, 70, 786486, 80, 71, 786486, 80, 79, 786486, 80, 80,
+        786486, 80, 81, 786486, 80, 82, 786486, 80, 83, 786486, 80, 84, 786486, 80, 85,
+        786486, 80, 86, 786486, 80, 87, 786486, 80, 88, 786486, 80, 89, 786486, 80, 93,
+        786486, 81, 0, 786486, 81, 36, 786486, 81, 37, 786486, 81, 42, 786486, 81, 43,
+        786486, 81, 44, 786486, 81, 45, 786486, 81, 46, 786486, 81, 47, 786486, 81, 48,
+        786486, 81, 49, 786486, 81, 50, 786486, 81, 51, 786486, 81, 52, 786486, 81, 53,
+        786486, 81, 54, 786486, 81, 55, 786486, 81, 56, 786486, 81, 57, 786486, 81, 58,
+        786486, 81, 59, 786486, 81, 60, 786486, 81, 61, 786486, 81, 63, 786486, 81, 64,
+        786486, 81, 65, 786486, 81, 66, 786486, 81, 67, 786486, 81, 70, 786486, 81, 71,
+        786486, 81, 79, 786486, 81, 80, 786486, 81, 81, 786486, 81, 82, 786486, 81, 83,
+        786486, 81, 84, 786486, 81, 85, 786486, 81, 86, 786486, 81, 87, 786486, 81, 88,
+        786486, 81, 89, 786486, 81, 93, 786486, 82, 0, 262206, 82, 36, 262206, 82, 37,
+        262206, 82, 42, 262206, 82, 43, 262206, 82, 44, 262206, 82, 45, 262206, 82, 46,
+        262206, 82, 47, 262206, 82, 48, 262206, 82, 49, 262206, 82, 50, 262206, 82, 51,
+        262206, 82, 52, 262206, 82, 53, 262206, 82, 54, 262206, 82, 55, 262206, 82, 56,
+        262206, 82, 57, 262206, 82, 58, 262206, 82, 59, 262206, 82, 60, 262206, 82, 61,
+        262206, 82, 63, 262206, 82, 64, 262206, 82, 65, 262206, 82, 66, 262206, 82, 67,
+        262206, 82, 70, 262206, 82, 71, 262206, 82, 79, 262206, 82, 80, 262206, 82, 81,
+        262206, 82, 82, 262206, 82, 83, 262206, 82, 84, 262206, 82, 85, 262206, 82, 86,
+        262206, 82, 87, 262206, 82, 88, 262206, 82, 89, 262206, 82, 93, 262206, 83, 0,
+        786486, 83, 36, 786486, 83, 37, 185, 83, 42, 786486, 83, 43, 786486, 83, 44,
+        786486, 83, 45, 786486, 83, 46, 786486, 83, 47, 193, 83, 48, 786486, 83, 49,
+        197, 83, 50, 201, 83, 51, 786486, 83, 52, 205, 83, 53, 209, 83, 54, 786486, 83,
+        55, 786486, 83, 56, 786486, 83, 57, 786486, 83, 58, 786486, 83, 59, 217, 83, 60,
+        786486, 83, 61, 217, 83, 63, 221, 83, 64, 221, 83, 65, 205, 83, 66, 786486, 83,
+        67, 225, 83, 70, 786486, 83, 71, 786486, 83, 79, 786486, 83, 80, 786486, 83, 81,
+        786486, 83, 82, 786486, 83, 83, 786486, 83, 84, 786486, 83, 85, 786486, 83, 86,
+        786486, 83, 87, 786486, 83, 88, 786486, 83, 89, 786486, 83, 93, 786486, 84, 0,
+        786486, 84, 36, 786486, 84, 37, 185, 84, 42, 786486, 84, 43, 786486, 84, 44,
+        786486, 84, 45, 786486, 84, 46, 786486, 84, 47, 193, 84, 48, 786486, 84, 49,
+        197, 84, 50, 201, 84, 51, 786486, 84, 52, 205, 84, 53, 209, 84, 54, 786486, 84,
+        55, 786486, 84, 56, 786486, 84, 57, 786486, 84, 58, 786486, 84, 59, 786486, 84,
+        60, 786486, 84, 61, 786486, 84, 63, 221, 84, 64, 221, 84, 65, 205, 84, 66,
+        786486, 84, 67, 225, 84, 70, 786486, 84, 71, 786486, 84, 79, 786486, 84, 80,
+        786486, 84, 81, 786486, 84, 82, 786486, 84, 83, 786486, 84, 84, 786486, 84, 85,
+        786486, 84, 86, 786486, 84, 87, 786486, 84, 88, 786486, 84, 89, 786486, 84, 93,
+        786486, 85, 0, 786486, 85, 36, 786486, 85, 37, 185, 85, 42, 786486, 85, 43,
+        786486, 85, 44, 786486, 85, 45, 786486, 85, 46, 786486, 85, 47, 193, 85, 48,
+        786486, 85, 49, 197, 85, 50, 201, 85, 51, 786486, 85, 52, 786486, 85, 53, 209,
+        85, 54, 786486, 85, 55, 786486, 85, 56, 786486, 85, 57, 786486, 85, 58, 786486,
+        85, 59, 786486, 85, 60, 786486, 85, 61, 786486, 85, 63, 786486, 85, 64, 786486,
+        85, 65, 786486, 85, 66, 786486, 85, 67, 225, 85, 70, 786486, 85, 71, 786486, 85,
+        79, 786486, 85, 80, 786486, 85, 81, 786486, 85, 82, 786486, 85, 83, 786486, 85,
+        84, 786486, 85, 85, 786486, 85, 86, 786486, 85, 87, 786486, 85, 88, 786486, 85,
+        89, 786486, 85, 93, 786486, 86, 66, 421, 87, 0, 786486, 87, 36, 786486, 87, 37,
+        786486, 87, 42, 786486, 87, 43, 786486, 87, 44, 786486, 87, 45, 786486, 87, 46,
+        786486, 87, 47, 786486, 87, 48, 786486, 87, 49, 786486, 87, 50, 786486, 87, 51,
+        786486, 87, 52, 786486, 87, 53, 786486, 87, 54, 786486, 87, 55, 786486, 87, 56,
+        786486, 87, 57, 786486, 87, 58, 786486, 87, 59, 786486, 87, 60, 786486, 87, 61,
+        786486, 87, 63, 786486, 87, 64, 786486, 87, 65, 786486, 87, 66, 786486, 87, 67,
+        786486, 87, 70, 786486, 87, 71, 786486, 87, 79, 786486, 87, 80, 786486, 87, 81,
+        786486, 87, 82, 786486, 87, 83, 786486, 87, 84, 786486, 87, 85, 786486, 87, 86,
+        786486, 87, 87, 786486, 87, 88, 786486, 87, 89, 786486, 87, 93, 786486, 88, 13,
+        424, 88, 18, 428, 88, 20, 144, 88, 31, 96, 88, 42, 97, 88, 43, 97, 88, 48, 101,
+        88, 51, 105, 88, 59, 105, 88, 67, 109, 88, 93, 129, 89, 4, 432, 89, 13, 84, 89,
+        19, 88, 89, 20, 92, 89, 21, 88, 89, 22, 88, 89, 24, 88, 89, 26, 88, 89, 27, 88,
+        89, 29, 88, 89, 31, 96, 89, 42, 97, 89, 43, 97, 89, 48, 101, 89, 51, 105, 89,
+        59, 105, 89, 67, 109, 89, 72, 18, 89, 73, 18, 89, 74, 18, 89, 81, 17, 89, 82,
+        113, 89, 84, 117, 89, 86, 29, 89, 87, 121, 89, 89, 125, 89, 93, 129, 90, 0,
+        786550, 90, 42, 786550, 90, 43, 786550, 90, 48, 786550, 90, 51, 786550, 90, 59,
+        786550, 90, 67, 786550, 90, 81, 786550, 90, 82, 786550, 90, 84, 786550, 90, 86,
+        786550, 90, 87, 786550, 90, 89, 786550, 90, 93, 786550, 91, 4, 436, 91, 13, 84,
+        91, 19, 88, 91, 20, 92, 91, 21, 88, 91, 22, 88, 91, 24, 88, 91, 26, 88, 91, 27,
+        88, 91, 29, 88, 91, 31, 96, 91, 42, 97, 91, 43, 97, 91, 48, 101, 91, 51, 105,
+        91, 59, 105, 91, 67, 109, 91, 74, 18, 91, 81, 17, 91, 82, 113, 91, 84, 117, 91,
+        86, 29, 91, 87, 121, 91, 89, 125, 91, 93, 129, 92, 92, 524418, 92, 93, 524418,
+        92, 94, 524418, 93, 0, 786558, 93, 36, 786558, 93, 37, 786558, 93, 42, 786558,
+        93, 43, 786558, 93, 44, 786558, 93, 45, 786558, 93, 46, 786558, 93, 47, 786558,
+        93, 48, 786558, 93, 49, 786558, 93, 50, 786558, 93, 51, 786558, 93, 52, 786558,
+        93, 53, 786558, 93, 54, 786558, 93, 55, 786558, 93, 56, 786558, 93, 57, 786558,
+        93, 58, 786558, 93, 59, 786558, 93, 60, 786558, 93, 61, 786558, 93, 63, 786558,
+        93, 64, 786558, 93, 65, 786558, 93, 66, 786558, 93, 67, 786558, 93, 70, 786558,
+        93, 71, 786558, 93, 79, 786558, 93, 80, 786558, 93, 81, 786558, 93, 82, 786558,
+        93, 83, 786558, 93, 84, 786558, 93, 85, 786558, 93, 86, 786558, 93, 87, 786558,
+        93, 88, 786558, 93, 89, 786558, 93, 93, 786558, 94, 0, 1310826, 94, 42, 1310826,
+        94, 43, 1310826, 94, 48, 1310826, 94, 51, 1310826, 94, 59, 1310826, 94, 67,
+        1310826, 94, 81, 1310826, 94, 82, 1310826, 94, 83, 1310826, 94, 84, 1310826, 94,
+        85, 1310826, 94, 86, 1310826, 94, 87, 1310826, 94, 88, 1310826, 94, 89, 1310826,
+        94, 93, 1310826, 95, 0, 1310826, 95, 37, 185, 95, 42, 1310826, 95, 43, 1310826,
+        95, 47, 193, 95, 48, 1310826, 95, 49, 197, 95, 50, 201, 95, 51, 1310826, 95, 52,
+        205, 95, 53, 209, 95, 54, 213, 95, 55, 213, 95, 56, 213, 95, 57, 213, 95, 58,
+        213, 95, 59, 217, 95, 60, 213, 95, 61, 217, 95, 63, 221, 95, 64, 221, 95, 65,
+        205, 95, 67, 225, 95, 81, 1310826, 95, 82, 1310826, 95, 83, 1310826, 95, 84,
+        1310826, 95, 85, 1310826, 95, 86, 1310826, 95, 87, 1310826, 95, 88, 1310826, 95,
+        89, 1310826, 95, 93, 1310826, 96, 0, 786446, 96, 42, 786446, 96, 43, 786446, 96,
+        48, 786446, 96, 51, 786446, 96, 59, 786446, 96, 67, 786446, 96, 81, 786446, 96,
+        82, 786446, 96, 83, 786446, 96, 84, 786446, 96, 85, 786446, 96, 86, 786446, 96,
+        87, 786446, 96, 88, 786446, 96, 89, 786446, 96, 93, 786446, 97, 2, 440, 97, 13,
+        276, 97, 20, 144, 97, 31, 96, 97, 42, 97, 97, 43, 97, 97, 48, 101, 97, 51, 105,
+        97, 59, 105, 97, 67, 109, 97, 93, 129, 98, 78, 445, 99, 0, 786570, 99, 36,
+        786570, 99, 42, 786570, 99, 43, 786570, 99, 44, 786570, 99, 48, 786570, 99, 51,
+        786570, 99, 59, 786570, 99, 66, 786570, 99, 67, 786570, 99, 70, 786570, 99, 77,
+        786570, 99, 78, 786570, 99, 81, 786570, 99, 82, 786570, 99, 84, 786570, 99, 86,
+        786570, 99, 87, 786570, 99, 89, 786570, 99, 93, 786570, 100, 34, 448, 100, 37,
+        157, 100, 42, 161, 100, 62, 165, 101, 75, 453, 102, 34, 456, 102, 37, 157, 102,
+        42, 161, 102, 62, 165, 103, 66, 786502, 103, 70, 786502, 104, 0, 1048630, 104,
+        36, 1048630, 104, 37, 1048630, 104, 42, 1048630, 104, 43, 1048630, 104, 44,
+        1048630, 104, 45, 1048630, 104, 46, 1048630, 104, 47, 1048630, 104, 48, 1048630,
+        104, 49, 1048630, 104, 50, 1048630, 104, 51, 1048630, 104, 52, 1048630, 104, 53,
+        1048630, 104, 54, 1048630, 104, 55, 1048630, 104, 56, 1048630, 104, 57, 1048630,
+        104, 58, 1048630, 104, 59, 1048630, 104, 60, 1048630, 104, 61, 1048630, 104, 63,
+        1048630, 104, 64, 1048630, 104, 65, 1048630, 104, 66, 1048630, 104, 67, 1048630,
+        104, 70, 1048630, 104, 71, 1048630, 104, 79, 1048630, 104, 80, 1048630, 104, 81,
+        1048630, 104, 82, 1048630, 104, 83, 1048630, 104, 84, 1048630, 104, 85, 1048630,
+        104, 86, 1048630, 104, 87, 1048630, 104, 88, 1048630, 104, 89, 1048630, 104, 93,
+        1048630, 105, 0, 1048658, 105, 36, 1048658, 105, 37, 1048658, 105, 42, 1048658,
+        105, 43, 1048658, 105, 44, 1048658, 105, 45, 1048658, 105, 46, 1048658, 105, 47,
+        1048658, 105, 48, 1048658, 105, 49, 1048658, 105, 50, 1048658, 105, 51, 1048658,
+        105, 52, 1048658, 105, 53, 1048658, 105, 54, 1048658, 105, 55, 1048658, 105, 56,
+        1048658, 105, 57, 1048658, 105, 58, 1048658, 105, 59, 1048658, 105, 60, 1048658,
+        105, 61, 1048658, 105, 63, 1048658, 105, 64, 1048658, 105, 65, 1048658, 105, 66,
+        1048658, 105, 67, 1048658, 105, 70, 1048658, 105, 71, 1048658, 105, 79, 1048658,
+        105, 80, 1048658, 105, 81, 1048658, 105, 82, 1048658, 105, 83, 1048658, 105, 84,
+        1048658, 105, 85, 1048658, 105, 86, 1048658, 105, 87, 1048658, 105, 88, 1048658,
+        105, 89, 1048658, 105, 93, 1048658, 106, 12, 460, 106, 37, 185, 106, 47, 193,
+        106, 49, 197, 106, 50, 201, 106, 52, 205, 106, 53, 209, 106, 54, 213, 106, 55,
+        213, 106, 56, 213, 106, 57, 213, 106, 58, 213, 106, 59, 217, 106, 60, 213, 106,
+        61, 217, 106, 63, 221, 106, 64, 221, 106, 65, 205, 106, 67, 225, 106, 71, 365,
+        106, 80, 465, 107, 12, 460, 107, 71, 365, 108, 5, 468, 108, 6, 472, 108, 7, 476,
+        108, 72, 481, 108, 73, 485, 108, 74, 489, 109, 74, 493, 110, 36, 786442, 110,
+        66, 786442, 111, 13, 496, 111, 18, 500, 111, 20, 144, 111, 31, 96, 111, 42, 97,
+        111, 43, 97, 111, 48, 101, 111, 51, 105, 111, 59, 105, 111, 67, 109, 111, 93,
+        129, 112, 36, 505, 113, 0, 1835102, 113, 81, 1835102, 113, 83, 1835102, 113, 85,
+        1835102, 113, 86, 1835102, 113, 88, 1835102, 114, 4, 508, 114, 13, 84, 114, 19,
+        88, 114, 20, 92, 114, 21, 88, 114, 22, 88, 114, 24, 88, 114, 26, 88, 114, 27,
+        88, 114, 29, 88, 114, 31, 96, 114, 42, 97, 114, 43, 97, 114, 48, 101, 114, 51,
+        105, 114, 59, 105, 114, 67, 109, 114, 75, 18, 114, 81, 17, 114, 82, 113, 114,
+        84, 117, 114, 86, 29, 114, 87, 121, 114, 89, 125, 114, 93, 129, 115, 0, 1310810,
+        115, 42, 1310810, 115, 43, 1310810, 115, 48, 1310810, 115, 51, 1310810, 115, 59,
+        1310810, 115, 67, 1310810, 115, 81, 1310810, 115, 82, 1310810, 115, 84, 1310810,
+        115, 86, 1310810, 115, 87, 1310810, 115, 89, 1310810, 115, 93, 1310810, 116, 13,
+        512, 116, 20, 144, 116, 31, 96, 116, 42, 97, 116, 43, 97, 116, 48, 101, 116, 51,
+        105, 116, 59, 105, 116, 67, 109, 116, 93, 129, 117, 74, 517, 118, 72, 262174,
+        118, 73, 262174, 119, 5, 520, 119, 6, 524, 119, 72, 481, 119, 73, 485, 120, 4,
+        528, 120, 13, 84, 120, 19, 88, 120, 20, 92, 120, 21, 88, 120, 22, 88, 120, 24,
+        88, 120, 26, 88, 120, 27, 88, 120, 29, 88, 120, 31, 96, 120, 42, 97, 120, 43,
+        97, 120, 48, 101, 120, 51, 105, 120, 59, 105, 120, 67, 109, 120, 74, 18, 120,
+        81, 17, 120, 82, 113, 120, 84, 117, 120, 86, 29, 120, 87, 121, 120, 89, 125,
+        120, 93, 129, 121, 13, 532, 121, 20, 144, 121, 31, 96, 121, 42, 97, 121, 43, 97,
+        121, 48, 101, 121, 51, 105, 121, 59, 105, 121, 67, 109, 121, 93, 129, 122, 0,
+        1310818, 122, 42, 1310818, 122, 43, 1310818, 122, 48, 1310818, 122, 51, 1310818,
+        122, 59, 1310818, 122, 67, 1310818, 122, 81, 1310818, 122, 82, 1310818, 122, 84,
+        1310818, 122, 86, 1310818, 122, 87, 1310818, 122, 89, 1310818, 122, 93, 1310818,
+        123, 0, 786482, 123, 42, 786482, 123, 43, 786482, 123, 48, 786482, 123, 51,
+        786482, 123, 59, 786482, 123, 67, 786482, 123, 81, 786482, 123, 82, 786482, 123,
+        84, 786482, 123, 86, 786482, 123, 87, 786482, 123, 89, 786482, 123, 93, 786482,
+        124, 36, 537, 124, 37, 185, 124, 47, 193, 124, 49, 197, 124, 50, 201, 124, 52,
+        205, 124, 53, 209, 124, 54, 213, 124, 55, 213, 124, 56, 213, 124, 57, 213, 124,
+        58, 213, 124, 59, 217, 124, 60, 213, 124, 61, 217, 124, 63, 221, 124, 64, 221,
+        124, 65, 205, 124, 67, 225, 124, 80, 465, 125, 36, 537, 126, 0, 1310858, 126,
+        36, 1310858, 126, 42, 1310858, 126, 43, 1310858, 126, 44, 1310858, 126, 48,
+        1310858, 126, 51, 1310858, 126, 59, 1310858, 126, 66, 1310858, 126, 67, 1310858,
+        126, 70, 1310858, 126, 77, 1310858, 126, 78, 1310858, 126, 81, 1310858, 126, 82,
+        1310858, 126, 84, 1310858, 126, 86, 1310858, 126, 87, 1310858, 126, 89, 1310858,
+        126, 93, 1310858, 127, 75, 541, 128, 36, 786506, 128, 37, 185, 128, 47, 193,
+        128, 49, 197, 128, 50, 201, 128, 52, 205, 128, 53, 209, 128, 54, 213, 128, 55,
+        213, 128, 56, 213, 128, 57, 213, 128, 58, 213, 128, 59, 217, 128, 60, 213, 128,
+        61, 217, 128, 63, 221, 128, 64, 221, 128, 65, 205, 128, 67, 225, 128, 71,
+        786506, 129, 0, 1572962, 129, 42, 1572962, 129, 43, 1572962, 129, 48, 1572962,
+        129, 51, 1572962, 129, 59, 1572962, 129, 67, 1572962, 129, 81, 1572962, 129, 82,
+        1572962, 129, 84, 1572962, 129, 86, 1572962, 129, 87, 1572962, 129, 89, 1572962,
+        129, 93, 1572962, 130, 74, 545, 131, 72, 524318, 131, 73, 524318, 132, 74,
+        524310, 133, 37, 185, 133, 47, 193, 133, 49, 197, 133, 50, 201, 133, 52, 205,
+        133, 53, 209, 133, 54, 213, 133, 55, 213, 133, 56, 213, 133, 57, 213, 133, 58,
+        213, 133, 59, 217, 133, 60, 213, 133, 61, 217, 133, 63, 221, 133, 64, 221, 133,
+        65, 205, 133, 67, 225, 133, 79, 549, 134, 0, 1573002, 134, 36, 1573002, 134, 42,
+        1573002, 134, 43, 1573002, 134, 44, 1573002, 134, 48, 1573002, 134, 51, 1573002,
+        134, 59, 1573002, 134, 66, 1573002, 134, 67, 1573002, 134, 70, 1573002, 134, 77,
+        1573002, 134, 78, 1573002, 134, 81, 1573002, 134, 82, 1573002, 134, 84, 1573002,
+        134, 86, 1573002, 134, 87, 1573002, 134, 89, 1573002, 134, 93, 1573002, 135, 0,
+        2359390, 135, 81, 2359390, 135, 83, 2359390, 135, 85, 2359390, 135, 86, 2359390,
+        135, 88, 2359390, 136, 0, 1835106, 136, 42, 1835106, 136, 43, 1835106, 136, 48,
+        1835106, 136, 51, 1835106, 136, 59, 1835106, 136, 67, 1835106, 136, 81, 1835106,
+        136, 82, 1835106, 136, 84, 1835106, 136, 86, 1835106, 136, 87, 1835106, 136, 89,
+        1835106, 136, 93, 1835106, 137, 4, 552, 137, 13, 84, 137, 19, 88, 137, 20, 92,
+        137, 21, 88, 137, 22, 88, 137, 24, 88, 137, 26, 88, 137, 27, 88, 137, 29, 88,
+        137, 31, 96, 137, 42, 97, 137, 43, 97, 137, 48, 101, 137, 51, 105, 137, 59, 105,
+        137, 67, 109, 137, 72, 18, 137, 73, 18, 137, 81, 17, 137, 82, 113, 137, 84, 117,
+        137, 86, 29, 137, 87, 121, 137, 89, 125, 137, 93, 129, 138, 72, 1048602, 138,
+        73, 1048602
+    ],
+    "table": {
+        "defaults": [
+            118, 118, 262270, -1, -1, -1, -1, 106, -1, 524406, -1, -1, -1, 18, -1,
+            262250, 524386, -1, -1, 50, -1, -1, 18, 262186, 262186, -1, -1, -1, -1, -1,
+            262238, -1, 114, -1, 1048646, 1048646, 262186, 6, 786466, 106, 262266, 106,
+            262198, -1, 262194, 1048662, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 6,
+            524306, 524330, 524330, -1, -1, -1, 524382, -1, -1, -1, -1, 262150, 262154,
+            -1, -1, 106, 18, -1, -1, 786494, 786474, 786474, 786474, 786474, 786474,
+            262190, 786474, 786474, 786474, -1, 786474, -1, 18, 786534, 18, 524402,
+            786542, 1310810, 1310810, 786446, -1, -1, 786554, -1, -1, -1, 786486,
+            1048618, 1048642, -1, -1, -1, -1, 786442, -1, -1, 1835086, 18, 1310794, -1,
+            -1, 262174, -1, 18, -1, 1310802, 786470, -1, -1, 1310842, -1, 786490,
+            1572946, -1, 524318, 524310, -1, 1572986, 2359374, 1835090, 18, 1048602
+        ],
+        "reduce_only": [
+            0, 0, 1, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 0, 0, 0, 0, 1,
+            0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 0, 1, 0, 0, 0, 0,
+            0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0,
+            0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 0, 1, 0, 0, 1, 0, 1, 1, 1, 0, 1, 0, 0, 1,
+            0, 0, 0, 1, 1, 1, 0, 0, 0, 0, 1, 0, 0, 1, 0, 1, 0, 0, 1, 0, 0, 0, 1, 1, 0,
+            0, 1, 0, 0, 1, 0, 1, 1, 0, 1, 1, 1, 0, 1
+        ],
+        "rows": [
+            0, 1, 2, 3, 4, 5, 6, 7, 8, 2, 9, 10, 11, 12, 13, 2, 2, 14, 15, 16, 17, 18,
+            19, 20, 2, 21, 22, 23, 24, 25, 26, 27, 28, 29, 2, 30, 2, 31, 2, 32, 2, 33,
+            2, 34, 35, 2, 36, 37, 38, 39, 40, 41, 42, 43, 44, 45, 46, 2, 47, 47, 48, 49,
+            50, 30, 51, 52, 53, 54, 2, 55, 56, 57, 58, 59, 60, 61, 30, 47, 62, 63, 64,
+            2, 2, 65, 66, 67, 68, 2, 69, 70, 2, 71, 2, 2, 2, 30, 2, 72, 73, 2, 74, 75,
+            76, 2, 2, 2, 77, 78, 79, 80, 2, 81, 82, 2, 83, 2, 84, 85, 2, 86, 87, 88, 2,
+            2, 89, 90, 2, 91, 30, 2, 92, 2, 2, 93, 2, 2, 2, 94, 2
+        ],
+        "base": [
+            26, 322, 0, 0, 3, 2, 7, 4, 19, 26, 2, 11, 74, 4, 169, 73, 16, 12, 642, 148,
+            592, 465, 539, 990, 5, 997, 1012, 1027, 3, 48, 851, 911, 57, 133, 34, 35,
+            1050, 1065, 1080, 1087, 1102, 1117, 35, 1140, 1155, 1170, 913, 84, 722, 41,
+            744, 664, 60, 243, 0, 772, 176, 234, 135, 0, 18, 801, 83, 155, 16, 79, 375,
+            134, 54, 923, 222, 296, 960, 43, 238, 52, 250, 597, 86, 0, 60, 975, 1, 370,
+            1177, 65, 3, 444, 1192, 693, 106, 74, 88, 823, 518
+        ],
+        "check": [
+            -1, -1, -1, -1, 59, 79, 79, 79, 86, 86, 59, 4, 13, 24, -1, 59, 59, 59, 59,
+            -1, 59, -1, 59, 59, 16, 59, 60, 59, 16, 16, 7, 28, 54, 82, 3, 59, 59, 5, 4,
+            13, 24, 59, 6, 0, 59, 0, 42, 0, 0, 64, 0, 16, 59, 60, 8, 0, 64, 0, 64, 64,
+            59, 59, 64, 9, 10, 79, 79, 79, 86, 86, 42, 11, 64, 64, 59, 59, 64, 59, 12,
+            59, 59, 17, 59, 32, 12, 29, 59, 7, 7, 12, 12, 12, 12, 34, 12, 78, 12, 12,
+            35, 12, 0, 12, 0, 15, 0, 0, 15, 0, 15, 12, 12, 49, 65, 68, 73, 12, 62, 47,
+            12, 65, 75, 65, 65, 62, 65, 65, 12, 80, 15, 62, 47, 65, 85, 65, 12, 65, 65,
+            65, 90, 65, 32, 32, 91, 62, 47, 52, 52, 52, 12, 12, 78, 12, 19, 12, 12, 92,
+            12, -1, 19, 33, 12, 58, -1, 19, 19, 19, 19, 67, 19, -1, 19, 19, 14, 19, 67,
+            19, 67, 67, -1, 14, 67, -1, -1, 19, 19, 14, -1, -1, 63, 19, -1, -1, 19, -1,
+            67, 63, 14, 63, -1, -1, 19, 63, 14, -1, 14, 14, 56, -1, 19, 56, 14, 56, -1,
+            14, -1, 63, 33, 33, 58, 58, -1, 14, 19, 19, -1, 19, 70, 19, 19, 14, 19, 56,
+            70, -1, 19, -1, -1, 70, 70, 70, 70, -1, 70, -1, 70, 70, 53, 70, -1, 70, -1,
+            -1, -1, 53, -1, 14, -1, 70, 70, 53, -1, -1, -1, 70, 57, -1, 70, 57, 74, 57,
+            53, 74, -1, 74, 70, -1, 53, -1, 53, 53, 76, -1, 70, 76, 53, 76, -1, 53, -1,
+            57, -1, -1, -1, 74, -1, 53, 70, 70, -1, 70, 71, 70, 70, 53, 70, 76, 71, -1,
+            70, -1, -1, 71, 71, 71, 71, -1, 71, -1, 71, 71, -1, 71, -1, 71, -1, -1, -1,
+            -1, -1, 53, -1, 71, 71, -1, -1, -1, -1, 71, -1, 1, 71, 1, -1, 1, 1, -1, 1,
+            -1, 71, -1, -1, 1, -1, -1, -1, -1, 71, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+            -1, -1, -1, -1, 71, 71, -1, 71, 83, 71, 71, -1, 71, -1, 83, -1, 71, -1, -1,
+            83, 83, 83, 83, -1, 83, -1, 83, 83, -1, 83, 1, 83, 1, -1, 1, 1, -1, 1, -1,
+            83, 83, -1, 66, -1, -1, 83, -1, -1, 83, 66, -1, 66, 66, -1, 66, 66, 83, -1,
+            -1, -1, -1, -1, -1, -1, 83, 66, 66, 66, -1, 66, -1, -1, -1, -1, -1, -1, -1,
+            -1, 83, 83, -1, 83, 87, 83, 83, -1, 83, -1, 87, -1, 83, -1, -1, 87, 87, 87,
+            87, -1, 87, -1, 87, 87, -1, 87, -1, 87, -1, -1, -1, 21, -1, -1, -1, 87, 87,
+            21, -1, -1, -1, 87, -1, -1, 87, -1, -1, -1, 21, -1, -1, -1, 87, -1, -1, -1,
+            21, 21, -1, -1, 87, -1, 21, -1, -1, 21, -1, -1, -1, -1, -1, -1, -1, 21, 87,
+            87, -1, 87, 94, 87, 87, 21, 87, -1, 94, -1, 87, -1, -1, 94, 94, 94, 94, -1,
+            94, -1, 94, 94, -1, 94, -1, 94, -1, -1, -1, 22, -1, 21, -1, 94, 94, 22, -1,
+            -1, -1, 94, -1, -1, 94, -1, -1, -1, 22, -1, -1, -1, 94, -1, -1, -1, 22, 22,
+            -1, -1, 94, -1, 22, -1, -1, 22, -1, -1, -1, -1, -1, -1, -1, 22, 94, 94, -1,
+            94, 20, 94, 94, 22, 94, -1, 20, -1, 94, -1, 77, 20, 20, 20, 20, -1, 20, -1,
+            20, 20, -1, 20, -1, 20, -1, -1, -1, -1, -1, 22, -1, 20, 20, -1, 77, -1, -1,
+            20, -1, -1, 20, 77, -1, 77, 77, -1, 77, 77, 77, 77, 77, 77, 77, 77, 77, 77,
+            20, 77, 77, 77, -1, 77, -1, -1, -1, 77, -1, -1, -1, -1, 20, 20, -1, 20, 77,
+            20, 20, 51, 20, 18, -1, -1, 20, 18, 18, 18, 18, -1, 18, 18, -1, 18, 18, 18,
+            18, 18, 18, 18, 18, 18, 18, 51, 18, 18, 18, -1, 18, -1, 51, -1, 51, 51, -1,
+            51, 51, 51, 51, 51, 51, 51, 51, 51, 51, -1, 51, 51, 51, -1, 51, 89, 89, -1,
+            51, -1, -1, -1, -1, 89, -1, 89, 89, -1, 89, 89, 89, 89, 89, 89, 89, 89, 89,
+            89, -1, 89, 89, 89, -1, 89, -1, 48, -1, -1, -1, -1, -1, -1, 48, -1, 48, 48,
+            89, 48, 48, 48, 48, 48, 48, 48, 48, 48, 48, 50, 48, 48, 48, 48, 48, -1, 50,
+            -1, 50, 50, -1, 50, 50, 50, 50, 50, 50, 50, 50, 50, 50, -1, 50, 50, 50, -1,
+            50, 55, -1, -1, -1, -1, -1, -1, 55, -1, 55, 55, 50, 55, 55, 55, 55, 55, 55,
+            55, 55, 55, 55, -1, 55, 55, 55, -1, 55, 61, 61, 55, -1, -1, -1, -1, -1, 61,
+            -1, 61, 61, -1, 61, 61, 61, 61, 61, 61, 61, 61, 61, 61, 93, 61, 61, 61, -1,
+            61, -1, 93, -1, 93, 93, -1, 93, 93, 93, 93, 93, 93, 93, 93, 93, 93, -1, 93,
+            93, 93, -1, 93, 30, -1, -1, -1, -1, -1, -1, 30, -1, 30, 30, 93, 30, 30, 30,
+            30, 30, 30, 30, 30, 30, 30, -1, 30, 30, 30, -1, 30, 31, 31, 46, 46, -1, -1,
+            -1, -1, -1, 31, -1, 46, -1, -1, -1, 31, -1, 46, -1, -1, -1, 69, -1, -1, -1,
+            69, 31, 69, 46, -1, -1, -1, -1, -1, 31, 31, 46, 46, 69, -1, 31, -1, 46, 31,
+            -1, 46, 69, 69, -1, -1, 72, 31, 69, 46, -1, 69, -1, -1, 72, 31, -1, 46, -1,
+            69, 72, -1, -1, -1, -1, -1, -1, 69, -1, 81, -1, 72, -1, 81, -1, 81, -1, -1,
+            -1, 72, 72, 31, -1, 46, 23, 72, 81, -1, 72, -1, 23, 25, -1, 69, 81, 81, 72,
+            25, -1, -1, 81, 23, -1, 81, 72, -1, 26, -1, 25, 23, 23, 81, 26, -1, -1, 23,
+            25, 25, 23, 81, -1, 27, 25, 26, -1, 25, 23, 27, -1, -1, 72, 26, 26, 25, 23,
+            -1, -1, 26, 27, -1, 26, 25, -1, -1, 36, 81, 27, 27, 26, -1, 36, -1, 27, -1,
+            -1, 27, 26, -1, -1, 37, 23, 36, -1, 27, -1, 37, -1, 25, -1, 36, 36, 27, -1,
+            -1, 38, 36, 37, -1, 36, -1, 38, 39, 26, -1, 37, 37, 36, 39, -1, -1, 37, 38,
+            -1, 37, 36, -1, 40, 27, 39, 38, 38, 37, 40, -1, -1, 38, 39, 39, 38, 37, -1,
+            41, 39, 40, -1, 39, 38, 41, -1, -1, 36, 40, 40, 39, 38, -1, -1, 40, 41, -1,
+            40, 39, -1, -1, 43, 37, 41, 41, 40, -1, 43, -1, 41, -1, -1, 41, 40, -1, -1,
+            44, 38, 43, -1, 41, -1, 44, -1, 39, -1, 43, 43, 41, -1, -1, 45, 43, 44, -1,
+            43, -1, 45, 84, 40, -1, 44, 44, 43, 84, -1, -1, 44, 45, -1, 44, 43, -1, 88,
+            41, 84, 45, 45, 44, 88, -1, -1, 45, 84, 84, 45, 44, -1, -1, 84, 88, -1, 84,
+            45, -1, -1, -1, 43, 88, 88, 84, 45, -1, -1, 88, -1, -1, 88, 84, -1, -1, -1,
+            44, -1, -1, 88, -1, -1, -1, -1, -1, -1, -1, 88, -1, -1, -1, 45, -1, -1, -1,
+            -1, -1, -1, 84, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 88,
+            -1
+        ],
+        "value": [
+            -1, -1, -1, -1, 404, 468, 472, 476, 520, 524, 84, 40, 132, 244, -1, 88, 92,
+            88, 88, -1, 88, -1, 88, 88, 168, 88, 412, 96, 172, 176, 56, 260, 385, 505,
+            3, 97, 97, 49, 45, 45, 45, 101, 53, 4, 105, 4, 324, 4, 4, 185, 4, 45, 105,
+            45, 65, 8, 193, 12, 197, 201, 109, 409, 209, 69, 73, 481, 485, 489, 481,
+            485, 329, 77, 221, 221, 17, 113, 225, 117, 80, 29, 121, 181, 125, 280, 84,
+            265, 129, 61, 61, 88, 92, 88, 88, 293, 88, 460, 88, 88, 297, 88, 17, 96, 21,
+            152, 25, 29, 157, 33, 161, 97, 97, 353, 185, 421, 445, 101, 185, 185, 105,
+            193, 453, 197, 201, 193, 205, 209, 105, 493, 165, 209, 209, 217, 517, 217,
+            109, 221, 221, 205, 537, 225, 61, 61, 541, 225, 225, 369, 373, 369, 17, 113,
+            365, 117, 228, 29, 121, 545, 125, -1, 84, 284, 129, 400, -1, 88, 92, 88, 88,
+            185, 88, -1, 88, 88, 136, 88, 193, 96, 197, 201, -1, 140, 209, -1, -1, 97,
+            97, 144, -1, -1, 185, 101, -1, -1, 105, -1, 225, 193, 96, 197, -1, -1, 105,
+            209, 149, -1, 97, 97, 392, -1, 109, 157, 101, 161, -1, 105, -1, 225, 61, 61,
+            61, 61, -1, 105, 17, 113, -1, 117, 432, 29, 121, 109, 125, 165, 84, -1, 129,
+            -1, -1, 88, 92, 88, 88, -1, 88, -1, 88, 88, 376, 88, -1, 96, -1, -1, -1,
+            380, -1, 129, -1, 97, 97, 144, -1, -1, -1, 101, 396, -1, 105, 157, 448, 161,
+            96, 157, -1, 161, 105, -1, 149, -1, 97, 97, 456, -1, 109, 157, 101, 161, -1,
+            105, -1, 165, -1, -1, -1, 165, -1, 105, 17, 113, -1, 117, 436, 29, 121, 109,
+            125, 165, 84, -1, 129, -1, -1, 88, 92, 88, 88, -1, 88, -1, 88, 88, -1, 88,
+            -1, 96, -1, -1, -1, -1, -1, 129, -1, 97, 97, -1, -1, -1, -1, 101, -1, 4,
+            105, 4, -1, 4, 4, -1, 4, -1, 105, -1, -1, 36, -1, -1, -1, -1, 109, -1, -1,
+            -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 17, 113, -1, 117, 508, 29, 121,
+            -1, 125, -1, 84, -1, 129, -1, -1, 88, 92, 88, 88, -1, 88, -1, 88, 88, -1,
+            88, 17, 96, 21, -1, 25, 29, -1, 33, -1, 97, 97, -1, 185, -1, -1, 101, -1,
+            -1, 105, 193, -1, 197, 201, -1, 205, 209, 105, -1, -1, -1, -1, -1, -1, -1,
+            109, 221, 221, 205, -1, 225, -1, -1, -1, -1, -1, -1, -1, -1, 17, 113, -1,
+            117, 528, 29, 121, -1, 125, -1, 84, -1, 129, -1, -1, 88, 92, 88, 88, -1, 88,
+            -1, 88, 88, -1, 88, -1, 96, -1, -1, -1, 232, -1, -1, -1, 97, 97, 144, -1,
+            -1, -1, 101, -1, -1, 105, -1, -1, -1, 96, -1, -1, -1, 105, -1, -1, -1, 97,
+            97, -1, -1, 109, -1, 101, -1, -1, 105, -1, -1, -1, -1, -1, -1, -1, 105, 17,
+            113, -1, 117, 552, 29, 121, 109, 125, -1, 84, -1, 129, -1, -1, 88, 92, 88,
+            88, -1, 88, -1, 88, 88, -1, 88, -1, 96, -1, -1, -1, 236, -1, 129, -1, 97,
+            97, 144, -1, -1, -1, 101, -1, -1, 105, -1, -1, -1, 96, -1, -1, -1, 105, -1,
+            -1, -1, 97, 97, -1, -1, 109, -1, 101, -1, -1, 105, -1, -1, -1, -1, -1, -1,
+            -1, 105, 17, 113, -1, 117, 228, 29, 121, 109, 125, -1, 84, -1, 129, -1, 460,
+            88, 92, 88, 88, -1, 88, -1, 88, 88, -1, 88, -1, 96, -1, -1, -1, -1, -1, 129,
+            -1, 97, 97, -1, 185, -1, -1, 101, -1, -1, 105, 193, -1, 197, 201, -1, 205,
+            209, 213, 213, 213, 213, 213, 217, 213, 217, 109, 221, 221, 205, -1, 225,
+            -1, -1, -1, 365, -1, -1, -1, -1, 17, 113, -1, 117, 465, 29, 121, 360, 125,
+            185, -1, -1, 129, 189, 189, 189, 193, -1, 197, 201, -1, 205, 209, 213, 213,
+            213, 213, 213, 217, 213, 217, 185, 221, 221, 205, -1, 225, -1, 193, -1, 197,
+            201, -1, 205, 209, 213, 213, 213, 213, 213, 217, 213, 217, -1, 221, 221,
+            205, -1, 225, 537, 185, -1, 365, -1, -1, -1, -1, 193, -1, 197, 201, -1, 205,
+            209, 213, 213, 213, 213, 213, 217, 213, 217, -1, 221, 221, 205, -1, 225, -1,
+            185, -1, -1, -1, -1, -1, -1, 193, -1, 197, 201, 465, 205, 209, 213, 213,
+            213, 213, 213, 217, 213, 217, 185, 221, 221, 205, 349, 225, -1, 193, -1,
+            197, 201, -1, 205, 209, 213, 213, 213, 213, 213, 217, 213, 217, -1, 221,
+            221, 205, -1, 225, 185, -1, -1, -1, -1, -1, -1, 193, -1, 197, 201, 357, 205,
+            209, 213, 213, 213, 213, 213, 217, 213, 217, -1, 221, 221, 205, -1, 225,
+            417, 185, 389, -1, -1, -1, -1, -1, 193, -1, 197, 201, -1, 205, 209, 213,
+            213, 213, 213, 213, 217, 213, 217, 185, 221, 221, 205, -1, 225, -1, 193, -1,
+            197, 201, -1, 205, 209, 213, 213, 213, 213, 213, 217, 213, 217, -1, 221,
+            221, 205, -1, 225, 185, -1, -1, -1, -1, -1, -1, 193, -1, 197, 201, 549, 205,
+            209, 213, 213, 213, 213, 213, 217, 213, 217, -1, 221, 221, 205, -1, 225,
+            268, 272, 344, 272, -1, -1, -1, -1, -1, 276, -1, 276, -1, -1, -1, 144, -1,
+            144, -1, -1, -1, 424, -1, -1, -1, 428, 96, 144, 96, -1, -1, -1, -1, -1, 97,
+            97, 97, 97, 96, -1, 101, -1, 101, 105, -1, 105, 97, 97, -1, -1, 440, 105,
+            101, 105, -1, 105, -1, -1, 276, 109, -1, 109, -1, 105, 144, -1, -1, -1, -1,
+            -1, -1, 109, -1, 496, -1, 96, -1, 500, -1, 144, -1, -1, -1, 97, 97, 129, -1,
+            129, 240, 101, 96, -1, 105, -1, 144, 248, -1, 129, 97, 97, 105, 144, -1, -1,
+            101, 96, -1, 105, 109, -1, 252, -1, 96, 97, 97, 105, 144, -1, -1, 101, 97,
+            97, 105, 109, -1, 256, 101, 96, -1, 105, 105, 144, -1, -1, 129, 97, 97, 105,
+            109, -1, -1, 101, 96, -1, 105, 109, -1, -1, 300, 129, 97, 97, 105, -1, 144,
+            -1, 101, -1, -1, 105, 109, -1, -1, 304, 129, 96, -1, 105, -1, 144, -1, 129,
+            -1, 97, 97, 109, -1, -1, 308, 101, 96, -1, 105, -1, 144, 312, 129, -1, 97,
+            97, 105, 144, -1, -1, 101, 96, -1, 105, 109, -1, 316, 129, 96, 97, 97, 105,
+            144, -1, -1, 101, 97, 97, 105, 109, -1, 320, 101, 96, -1, 105, 105, 144, -1,
+            -1, 129, 97, 97, 105, 109, -1, -1, 101, 96, -1, 105, 109, -1, -1, 332, 129,
+            97, 97, 105, -1, 144, -1, 101, -1, -1, 105, 109, -1, -1, 336, 129, 96, -1,
+            105, -1, 144, -1, 129, -1, 97, 97, 109, -1, -1, 340, 101, 96, -1, 105, -1,
+            144, 512, 129, -1, 97, 97, 105, 144, -1, -1, 101, 96, -1, 105, 109, -1, 532,
+            129, 96, 97, 97, 105, 144, -1, -1, 101, 97, 97, 105, 109, -1, -1, 101, 96,
+            -1, 105, 105, -1, -1, -1, 129, 97, 97, 105, 109, -1, -1, 101, -1, -1, 105,
+            109, -1, -1, -1, 129, -1, -1, 105, -1, -1, -1, -1, -1, -1, -1, 109, -1, -1,
+            -1, 129, -1, -1, -1, -1, -1, -1, 129, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+            -1, -1, -1, -1, -1, 129, -1
+        ],
+    },
+    "hidden": [
+        [1, {
+            "channel": 1,
+            "modes": [
+                0, 0, 0, 1, 1, 1, 0, 1, 1, 1
+            ],
+            "reductions": [
+                4, 5, 6, 0, -1, 1, 3, 0, -1, 2
+            ],
+            "actions": [
+                0, 8, 4, 0, 14, 8, 0, 38, 58, 0, 39, 13, 0, 41, 58, 0, 95, 58, 1, 38,
+                262202, 1, 41, 262202, 1, 95, 262202, 2, 38, 3, 2, 41, 3, 2, 95, 3, 3,
+                9, 16, 3, 38, 38, 3, 39, 38, 3, 40, 38, 4, 10, 20, 4, 38, 25, 4, 39, 29,
+                4, 40, 21, 5, 38, 524326, 5, 39, 524326, 5, 40, 524326, 6, 38, 786466,
+                6, 41, 786466, 6, 95, 786466, 7, 9, 32, 7, 38, 38, 7, 39, 38, 7, 40, 38,
+                8, 10, 20, 8, 38, 37, 8, 39, 29, 8, 40, 21, 9, 38, 786474, 9, 39,
+                786474, 9, 40, 786474
+            ],
+            "table": {
+                "defaults": [
+                    18, 262162, -1, 10, -1, 524298, 786438, 10, -1, 786446
+                ],
+                "reduce_only": [
+                    0, 1, 0, 0, 0, 1, 1, 0, 0, 1
+                ],
+                "rows": [
+                    0, 1, 2, 3, 4, 1, 1, 5, 6, 1
+                ],
+                "base": [
+                    12, 0, 12, 0, 0, 2, 5
+                ],
+                "check": [
+                    -1, -1, 3, 4, 5, 4, 4, 4, 6, -1, 6, 6, 6, 0, -1, -1, 0, 2, 0, -1, 2,
+                    2
+                ],
+                "value": [
+                    -1, -1, 16, 20, 32, 25, 29, 21, 20, -1, 37, 29, 21, 4, -1, -1, 8, 3,
+                    13, -1, 3, 3
+                ],
+            },
+            "hidden": [
+            ],
+        }],
+    ],
+}
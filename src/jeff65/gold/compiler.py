@@ -14,6 +14,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import contextlib
+import io
 import logging
 import sys
 from . import grammar
@@ -46,24 +48,173 @@ def open_unit(unit):
     return open(unit, "r")
 
 
-def parse(fileobj, name):
-    with parsing.ReStream(fileobj) as stream:
+# Builds the raw nodes for rules without a reduction action. The actions in the
+# grammar expect the children of these to be numbered "00", "01", and so on.
+def _make_node(t, span, children, mode):
+    return ast.AstNode(
+        t, span=span, attrs={f"{k:02}": v for k, v in enumerate(children)}
+    )
+
+
+def parse(
+    fileobj,
+    name,
+    lexer=None,
+    map_file=False,
+    compact=False,
+    actions=True,
+    recover=True,
+):
+    """Parses a unit into a simplified AST.
+
+    The tree is built by the reduction actions attached to the grammar. If
+    'actions' is false, the raw parse tree is built and then simplified by the
+    Simplify pass instead, which gives the same result more slowly.
+
+    If 'recover' is true, the parser carries on after a syntax error, so that
+    the ParseError raised lists every error in the unit rather than only the
+    first.
+    """
+
+    sync = grammar.sync_tokens if recover else None
+    with parsing.ReStream(fileobj, map_file=map_file, compact=compact) as stream:
         tree = grammar.parse(
-            stream,
-            grammar.lex,
-            lambda t, s, c, m: ast.AstNode(
-                t, span=s, attrs={f"{k:02}": v for k, v in enumerate(c)}
-            ),
+            stream, lexer or grammar.lex, _make_node, actions, recover=sync
         )
+    if actions:
+        return tree
     return tree.transform(simplify.Simplify())
 
 
-def translate(unit):
-    # parse will close the file for us
-    obj = parse(open_unit(unit), name=unit.name)
-    for p in passes:
-        obj = obj.transform(p())
-        logger.debug(__("Pass {}:\n{:p}", p.__name__, obj))
+def parse_toplevels(fileobj, name, lexer=None, map_file=False, compact=False):
+    """Parses a unit, yielding each toplevel statement as soon as it's parsed.
+
+    The statements are the same as those in the tree returned by parse(), but
+    each one can be processed (and freed) before the rest of the unit has been
+    read.
+    """
+
+    with parsing.ReStream(fileobj, map_file=map_file, compact=compact) as stream:
+        yield from grammar.parse.iterate(
+            stream, lexer or grammar.lex, _make_node, "toplevel", actions=True
+        )
+
+
+# Looking up a span replays the edits made since its statement was parsed, so
+# once a tree has been through this many, it's reparsed from scratch.
+_MAX_EDITS = 64
+
+
+def _toplevel_stmts(tree):
+    return list(tree.attrs["toplevels"])
+
+
+def _count_before(stmts, before):
+    """Returns how many statements there are before the first not 'before'."""
+    lo, hi = 0, len(stmts)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if before(stmts[mid]):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _seek(source, offset, position, target):
+    """Returns the offset of 'target', given the offset of a position before it."""
+    line, column = position
+    while line < target[0]:
+        offset = source.index("\n", offset) + 1
+        line, column = line + 1, 0
+    return offset + target[1] - column
+
+
+def reparse(tree, source, edit, name="<edit>", lexer=None):
+    """Updates a tree returned by parse() after an edit to its source.
+
+    'source' is the full text after the edit, and 'edit' is the
+    parsing.TextEdit that was made to the text 'tree' was parsed from. Only the
+    toplevel statements touched by the edit are reparsed, and the rest are
+    reused as-is. Their spans are OffsetSpans, which are looked up against a
+    log of the edits made, so the statements after the edit move without
+    being copied; this also moves them in 'tree', which shouldn't be used
+    afterwards.
+
+    This needs a tree from parse() with compact=True, or from reparse(). If
+    'tree' isn't one, or the edit can't be handled this way, the whole source
+    is reparsed.
+    """
+
+    stmts = tree.attrs["toplevels"].items
+    if not stmts or not isinstance(stmts[0].span, parsing.OffsetSpan):
+        return parse(io.StringIO(source), name, lexer, compact=True)
+    lines = stmts[0].span.lines
+    if len(lines.edits) >= _MAX_EDITS:
+        return parse(io.StringIO(source), name, lexer, compact=True)
+
+    # Statements have no terminator, so one which ends right where the edit
+    # starts might continue into it, and has to be reparsed too.
+    i = _count_before(stmts, lambda s: s.span.end < edit.span.start)
+    j = _count_before(stmts, lambda s: s.span.start <= edit.span.end)
+
+    if i > 0:
+        span = stmts[i - 1].span
+        region_start, start = span.lines.locate(span.end_offset)
+    else:
+        region_start, start = 0, (1, 0)
+    edit_start = _seek(source, region_start, start, edit.span.start)
+    if j < len(stmts):
+        span = stmts[j].span
+        old_offset, position = span.lines.locate(span.start_offset)
+        region_end = _seek(source, edit_start, edit.span.start, edit.shift(position))
+    else:
+        region_end = len(source)
+    region = source[region_start:region_end]
+
+    # The statements on either side of the region must be separated from it,
+    # otherwise the tokens at the boundaries might lex differently.
+    if (i > 0 and not region[:1].isspace()) or (
+        j < len(stmts) and not region[-1:].isspace()
+    ):
+        logger.debug(__("Edit {} touches a statement boundary", edit.span))
+        return parse(io.StringIO(source), name, lexer, compact=True)
+
+    try:
+        partial = parse(io.StringIO(region), name, lexer, compact=True, recover=False)
+    except parsing.ParseError:
+        # The region might not stand on its own, e.g. if the edit removed the
+        # end of a function. Reparse everything so that the error (if any) is
+        # reported properly.
+        logger.debug(__("Edit {} could not be reparsed alone", edit.span))
+        return parse(io.StringIO(source), name, lexer, compact=True)
+
+    eof = edit.shift(tree.span.end)
+    if j < len(stmts):
+        # The end of the edit is as far before the next statement in the old
+        # text as the end of the new text is in the new one.
+        delta = region_end - old_offset
+        lines.record(edit_start + len(edit.text) - delta, delta, edit)
+    middle = partial.attrs["toplevels"].items
+    if middle:
+        middle[0].span.lines.join(lines, region_start, start)
+
+    stmts = stmts[:i] + middle + stmts[j:]
+    span = parsing.TextSpan(*(stmts[0].span.start if stmts else eof), *eof)
+    toplevels = ast.AstSequence("toplevel", "stmt", stmts, span)
+    return ast.AstNode("unit", {"toplevels": toplevels}, span)
+
+
+def translate(unit, lexer=None, map_file=False, intern=False):
+    # If interning, the nodes are only shared within this compilation.
+    with contextlib.ExitStack() as stack:
+        if intern:
+            stack.enter_context(ast.interning())
+        # parse will close the file for us
+        obj = parse(open_unit(unit), name=unit.name, lexer=lexer, map_file=map_file)
+        for p in passes:
+            obj = obj.transform(p())
+            logger.debug(__("Pass {}:\n{:p}", p.__name__, obj))
 
     archive = blum.Archive()
     for node in obj.select("toplevels", "stmt"):
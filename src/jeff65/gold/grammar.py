@@ -16,7 +16,13 @@
 
 import enum
 import regex as re
-from ..parsing import Grammar, Lexer, Parser, ReStream, Rule
+from .. import ast, parsing, pattern
+from ..parsing import Grammar, Lexer, Parser, ReStream, Rule, TableCache, Trivia
+
+try:
+    from . import _parsetab
+except ImportError:
+    _parsetab = None
 
 
 @enum.unique
@@ -42,6 +48,7 @@ T = enum.Enum(
         "STRING_ESCAPE",
         "WHITESPACE",
         "COMMENT_TEXT",
+        "COMMENT",
         # arithmetic operators
         "OPERATOR_PLUS",
         "OPERATOR_MINUS",
@@ -152,123 +159,336 @@ def _w(word):
     return r"(?m){}(?=[\s{}]|$)".format(re.escape(word), specials)
 
 
-lex = Lexer(
-    T.EOF,
-    [
-        # whitespace -> hidden channel
-        (Mode.NORMAL, r"(?m)\s+", T.WHITESPACE, ReStream.CHANNEL_HIDDEN),
-        # keywords. Must come before the identifier match
-        (_w("and"), T.OPERATOR_AND),
-        (_w("bitand"), T.OPERATOR_BITAND),
-        (_w("bitor"), T.OPERATOR_BITOR),
-        (_w("bitxor"), T.OPERATOR_BITXOR),
-        (_w("constant"), T.STMT_CONSTANT),
-        (_w("do"), T.PUNCT_DO),
-        (_w("else"), T.PUNCT_ELSE),
-        (_w("elseif"), T.PUNCT_ELSEIF),
-        (_w("end"), T.PUNCT_END),
-        (_w("endfun"), T.PUNCT_ENDFUN),
-        (_w("endisr"), T.PUNCT_ENDISR),
-        (_w("for"), T.STMT_FOR),
-        (_w("fun"), T.STMT_FUN),
-        (_w("if"), T.STMT_IF),
-        (_w("in"), T.PUNCT_IN),
-        (_w("isr"), T.STMT_ISR),
-        (_w("let"), T.STMT_LET),
-        (_w("mut"), T.STORAGE_MUT),
-        (_w("not"), T.OPERATOR_NOT),
-        (_w("or"), T.OPERATOR_OR),
-        (_w("return"), T.STMT_RETURN),
-        (_w("stash"), T.STORAGE_STASH),
-        (_w("then"), T.PUNCT_THEN),
-        (_w("to"), T.PUNCT_TO),
-        (_w("use"), T.STMT_USE),
-        (_w("while"), T.STMT_WHILE),
-        # Numeric tokens. Must come before the word match
-        (r"\d[^\s{}]*".format(specials), T.NUMERIC),
-        # Identifiers. Matches a letter, followed by zero or more non-token-ending
-        # characters. As written, this will actually match numbers as well, but
-        # because that one is run first we don't have to worry about that.
-        (r"\w[^\s{}]*".format(specials), T.IDENTIFIER),
-        # comment opener. When the lexer comes back, it will be in comment mode
-        (Mode.NORMAL, re.escape("/*"), T.COMMENT_OPEN, ReStream.CHANNEL_HIDDEN),
-        # comment delimiers, but for comment mode.
-        (Mode.COMMENT, re.escape("/*"), T.COMMENT_OPEN, ReStream.CHANNEL_HIDDEN),
-        (Mode.COMMENT, re.escape("*/"), T.COMMENT_CLOSE, ReStream.CHANNEL_HIDDEN),
-        # Matches up to the next comment-control token.
-        (
-            Mode.COMMENT,
-            r"(?s).*?(?=\/\*|\*\/)",
-            T.COMMENT_TEXT,
-            ReStream.CHANNEL_HIDDEN,
-        ),
-        # String delimiter. When the lexer comes back, it will be in string mode
-        (re.escape('"'), T.STRING_DELIM),
-        # String control tokens
-        (Mode.STRING, r"(?s)\\.", T.STRING_ESCAPE),
-        (Mode.STRING, re.escape('"'), T.STRING_DELIM),
-        # Matches non-special text inside a string.
-        (Mode.STRING, r'(?s).*?(?=\\|")', T.STRING),
-        # operators & punctuation. These must be ordered such that if A is a prefix
-        # of B, then B comes before A. The easiest way to do this is to order them
-        # by length.
-        (re.escape("->"), T.PUNCT_ARROWR),
-        (re.escape(">>"), T.OPERATOR_SHR),
-        (re.escape("<<"), T.OPERATOR_SHL),
-        (re.escape("!="), T.OPERATOR_NE),
-        (re.escape("=="), T.OPERATOR_EQ),
-        (re.escape("<="), T.OPERATOR_LE),
-        (re.escape(">="), T.OPERATOR_GE),
-        (re.escape("+="), T.OPERATOR_ASSIGN_INC),
-        (re.escape("-="), T.OPERATOR_ASSIGN_DEC),
-        (re.escape("+"), T.OPERATOR_PLUS),
-        (re.escape("-"), T.OPERATOR_MINUS),
-        (re.escape("*"), T.OPERATOR_TIMES),
-        (re.escape("/"), T.OPERATOR_DIVIDE),
-        (re.escape("<"), T.OPERATOR_LT),
-        (re.escape(">"), T.OPERATOR_GT),
-        (re.escape("="), T.OPERATOR_ASSIGN),
-        (re.escape("."), T.OPERATOR_DOT),
-        (re.escape("@"), T.OPERATOR_DEREF),
-        (re.escape("&"), T.OPERATOR_REF),
-        (re.escape(":"), T.PUNCT_COLON),
-        (re.escape(";"), T.PUNCT_SEMICOLON),
-        (re.escape(","), T.PUNCT_COMMA),
-        (re.escape("("), T.PAREN_OPEN),
-        (re.escape(")"), T.PAREN_CLOSE),
-        (re.escape("["), T.BRACKET_OPEN),
-        (re.escape("]"), T.BRACKET_CLOSE),
-        (re.escape("{"), T.BRACE_OPEN),
-        (re.escape("}"), T.BRACE_CLOSE),
-        # If we fail to match anything, consume one character, and move on.
-        (r"(?s).", T.MYSTERY),
-        (Mode.STRING, r"(?s).", T.MYSTERY),
-        (Mode.COMMENT, r"(?s).", T.MYSTERY, ReStream.CHANNEL_HIDDEN),
-    ],
+lex_rules = [
+    # whitespace -> hidden channel
+    (Mode.NORMAL, r"(?m)\s+", T.WHITESPACE, ReStream.CHANNEL_HIDDEN),
+    # keywords. Must come before the identifier match
+    (_w("and"), T.OPERATOR_AND),
+    (_w("bitand"), T.OPERATOR_BITAND),
+    (_w("bitor"), T.OPERATOR_BITOR),
+    (_w("bitxor"), T.OPERATOR_BITXOR),
+    (_w("constant"), T.STMT_CONSTANT),
+    (_w("do"), T.PUNCT_DO),
+    (_w("else"), T.PUNCT_ELSE),
+    (_w("elseif"), T.PUNCT_ELSEIF),
+    (_w("end"), T.PUNCT_END),
+    (_w("endfun"), T.PUNCT_ENDFUN),
+    (_w("endisr"), T.PUNCT_ENDISR),
+    (_w("for"), T.STMT_FOR),
+    (_w("fun"), T.STMT_FUN),
+    (_w("if"), T.STMT_IF),
+    (_w("in"), T.PUNCT_IN),
+    (_w("isr"), T.STMT_ISR),
+    (_w("let"), T.STMT_LET),
+    (_w("mut"), T.STORAGE_MUT),
+    (_w("not"), T.OPERATOR_NOT),
+    (_w("or"), T.OPERATOR_OR),
+    (_w("return"), T.STMT_RETURN),
+    (_w("stash"), T.STORAGE_STASH),
+    (_w("then"), T.PUNCT_THEN),
+    (_w("to"), T.PUNCT_TO),
+    (_w("use"), T.STMT_USE),
+    (_w("while"), T.STMT_WHILE),
+    # Numeric tokens. Must come before the word match
+    (r"\d[^\s{}]*".format(specials), T.NUMERIC),
+    # Identifiers. Matches a letter, followed by zero or more non-token-ending
+    # characters. As written, this will actually match numbers as well, but
+    # because that one is run first we don't have to worry about that.
+    (r"\w[^\s{}]*".format(specials), T.IDENTIFIER),
+    # comment opener. When the lexer comes back, it will be in comment mode
+    (Mode.NORMAL, re.escape("/*"), T.COMMENT_OPEN, ReStream.CHANNEL_HIDDEN),
+    # comment delimiers, but for comment mode.
+    (Mode.COMMENT, re.escape("/*"), T.COMMENT_OPEN, ReStream.CHANNEL_HIDDEN),
+    (Mode.COMMENT, re.escape("*/"), T.COMMENT_CLOSE, ReStream.CHANNEL_HIDDEN),
+    # Matches up to the next comment-control token.
+    (
+        Mode.COMMENT,
+        r"(?s).*?(?=\/\*|\*\/)",
+        T.COMMENT_TEXT,
+        ReStream.CHANNEL_HIDDEN,
+    ),
+    # String delimiter. When the lexer comes back, it will be in string mode
+    (re.escape('"'), T.STRING_DELIM),
+    # String control tokens
+    (Mode.STRING, r"(?s)\\.", T.STRING_ESCAPE),
+    (Mode.STRING, re.escape('"'), T.STRING_DELIM),
+    # Matches non-special text inside a string.
+    (Mode.STRING, r'(?s).*?(?=\\|")', T.STRING),
+    # operators & punctuation. These must be ordered such that if A is a prefix
+    # of B, then B comes before A. The easiest way to do this is to order them
+    # by length.
+    (re.escape("->"), T.PUNCT_ARROWR),
+    (re.escape(">>"), T.OPERATOR_SHR),
+    (re.escape("<<"), T.OPERATOR_SHL),
+    (re.escape("!="), T.OPERATOR_NE),
+    (re.escape("=="), T.OPERATOR_EQ),
+    (re.escape("<="), T.OPERATOR_LE),
+    (re.escape(">="), T.OPERATOR_GE),
+    (re.escape("+="), T.OPERATOR_ASSIGN_INC),
+    (re.escape("-="), T.OPERATOR_ASSIGN_DEC),
+    (re.escape("+"), T.OPERATOR_PLUS),
+    (re.escape("-"), T.OPERATOR_MINUS),
+    (re.escape("*"), T.OPERATOR_TIMES),
+    (re.escape("/"), T.OPERATOR_DIVIDE),
+    (re.escape("<"), T.OPERATOR_LT),
+    (re.escape(">"), T.OPERATOR_GT),
+    (re.escape("="), T.OPERATOR_ASSIGN),
+    (re.escape("."), T.OPERATOR_DOT),
+    (re.escape("@"), T.OPERATOR_DEREF),
+    (re.escape("&"), T.OPERATOR_REF),
+    (re.escape(":"), T.PUNCT_COLON),
+    (re.escape(";"), T.PUNCT_SEMICOLON),
+    (re.escape(","), T.PUNCT_COMMA),
+    (re.escape("("), T.PAREN_OPEN),
+    (re.escape(")"), T.PAREN_CLOSE),
+    (re.escape("["), T.BRACKET_OPEN),
+    (re.escape("]"), T.BRACKET_CLOSE),
+    (re.escape("{"), T.BRACE_OPEN),
+    (re.escape("}"), T.BRACE_CLOSE),
+    # If we fail to match anything, consume one character, and move on.
+    (r"(?s).", T.MYSTERY),
+    (Mode.STRING, r"(?s).", T.MYSTERY),
+    (Mode.COMMENT, r"(?s).", T.MYSTERY, ReStream.CHANNEL_HIDDEN),
+]
+
+
+# Whitespace and comments outside of strings, which the lexer can skip over by
+# itself rather than passing them to the hidden-channel parser.
+trivia = Trivia(
+    [Mode.NORMAL],
+    whitespace=(r"(?m)\s+", T.WHITESPACE),
+    comment=("/*", "*/", T.COMMENT),
 )
 
 
+def make_lexer(backend="regex", skip_trivia=True):
+    """Creates a lexer for gold-syntax using the given backend.
+
+    The "regex" backend matches the rules with the regex module, and the "dfa"
+    backend compiles them into table-driven DFAs. Both produce the same tokens.
+    If 'skip_trivia' is false, whitespace and comments are lexed as tokens on
+    the hidden channel instead of being skipped.
+    """
+
+    skipped = trivia if skip_trivia else None
+    if backend == "regex":
+        return Lexer(T.EOF, lex_rules, trivia=skipped)
+    elif backend == "dfa":
+        from ..dfa import DfaLexer
+
+        return DfaLexer(T.EOF, lex_rules, trivia=skipped)
+    raise ValueError(f"unknown lexer backend {backend!r}")
+
+
+lex = make_lexer()
+
+
+# Reduction actions, which build the simplified AST directly while parsing.
+# These must produce exactly the same tree as running the Simplify pass over
+# the raw parse tree; rules without an action are left as raw nodes.
+
+
+def _sequence(t, a_element):
+    # collapses right-recursion into a sequence
+    def reduce_sequence(span, children):
+        if len(children) == 0:
+            return ast.AstSequence(t, a_element, (), span)
+        car, cdr = children
+        return ast.AstSequence.cons(car, cdr, span)
+
+    return reduce_sequence
+
+
+_block = _sequence("block", "stmt")
+_toplevel = _sequence("toplevel", "stmt")
+
+
+def _inner(index):
+    def reduce_inner(span, children):
+        return children[index]
+
+    return reduce_inner
+
+
+def _unit(span, children):
+    return ast.AstNode("unit", {"toplevels": children[0]}, span)
+
+
+def _alist(span, children):
+    if len(children) == 0:
+        return ast.AstSequence("alist", "arg", (), span)
+    return children[0]
+
+
+def _alist_inner(span, children):
+    if len(children) == 3:
+        return ast.AstSequence.cons(children[0], children[2], span)
+    return ast.AstSequence("alist", "arg", (children[0],), span)
+
+
+def _stmt_use(span, children):
+    return ast.AstNode("use", {"name": children[1].text}, span)
+
+
+def _stmt_constant(span, children):
+    _, declaration, _, value = children
+    name, ty = declaration.attrs["00"], declaration.attrs["02"]
+    return ast.AstNode(
+        "constant", {"name": name.text, "type": ty, "value": value}, span
+    )
+
+
+def _storage(span, children):
+    if len(children) == 0:
+        return None
+    elif children[0].t == T.STORAGE_MUT:
+        return "mut"
+    return "stash"
+
+
+def _stmt_let(span, children):
+    _, storage, declaration, _, value = children
+    name, ty = declaration.attrs["00"], declaration.attrs["02"]
+    return ast.AstNode(
+        "let",
+        {"name": name.text, "type": ty, "storage": storage, "value": value},
+        span,
+    )
+
+
+def _stmt_assign(span, children):
+    lhs, operator, rhs = children
+    if operator.t != T.OPERATOR_ASSIGN:
+        raise pattern.MatchError(f"Expected {T.OPERATOR_ASSIGN} got {operator}")
+    return ast.AstNode("set", {"lvalue": lhs, "rvalue": rhs}, span)
+
+
+# TODO: handle arguments, return values
+def _stmt_fun(span, children):
+    name, body = children[1], children[5]
+    return ast.AstNode(
+        "fun", {"name": name.text, "return": None, "args": None, "body": body}, span
+    )
+
+
+def _simple_type(span, children):
+    return children[0].text
+
+
+def _ref_type(span, children):
+    _, storage, ty = children
+    return ast.AstNode("type_ref", {"type": ty, "storage": storage}, span)
+
+
+def _literal(span, children):
+    (n,) = children
+    if isinstance(n, ast.AstNode):
+        return n
+    elif n.t == T.IDENTIFIER:
+        return ast.AstNode("identifier", {"name": n.text}, span)
+
+    try:
+        if n.text.startswith("0x"):
+            value = int(n.text[2:], 16)
+        elif n.text.startswith("0o"):
+            value = int(n.text[2:], 8)
+        elif n.text.startswith("0b"):
+            value = int(n.text[2:], 2)
+        else:
+            value = int(n.text)
+    except ValueError as e:
+        raise parsing.ParseError(str(e))
+    return ast.AstNode("numeric", {"value": value}, span)
+
+
+def _member_access(span, children):
+    namespace, _, member = children
+    return ast.AstNode(
+        "member_access",
+        {"namespace": namespace, "member": member.attrs["00"].text},
+        span,
+    )
+
+
+def _unop(operators):
+    def reduce_unop(span, children):
+        operator, rhs = children
+        t, a_rhs = operators[operator.t]
+        return ast.AstNode(t, {a_rhs: rhs}, span)
+
+    return reduce_unop
+
+
+def _binop(operators):
+    def reduce_binop(span, children):
+        lhs, operator, rhs = children
+        return ast.AstNode(operators[operator.t], {"lhs": lhs, "rhs": rhs}, span)
+
+    return reduce_binop
+
+
+def _stmt_call(span, children):
+    function, _, alist, _ = children
+    return ast.AstNode("call", {"target": function, "args": alist}, span)
+
+
+# collapses left-recursion on strings
+def _string_inner(span, children):
+    if len(children) == 0:
+        return []
+    string0, string1 = children
+    if string1.t == T.STRING:
+        string0.append(string1.text)
+    else:
+        string0.append(string1.text[1])
+    return string0
+
+
+def _string(span, children):
+    return ast.AstNode("string", {"value": "".join(children[1])}, span)
+
+
 grammar = Grammar(
     "start",
     [T.EOF],
     [
-        Rule("alist_inner", ["expr"]),
-        Rule("alist_inner", ["expr", T.PUNCT_COMMA, "alist_inner"]),
-        Rule("alist", []),
-        Rule("alist", ["alist_inner"]),
+        Rule("alist_inner", ["expr"], action=_alist_inner),
+        Rule(
+            "alist_inner", ["expr", T.PUNCT_COMMA, "alist_inner"], action=_alist_inner
+        ),
+        Rule("alist", [], action=_alist),
+        Rule("alist", ["alist_inner"], action=_alist),
         Rule("member", [T.IDENTIFIER]),
-        Rule("expr", [T.PAREN_OPEN, "expr", T.PAREN_CLOSE], prec=P.PARENTHESES),
-        Rule("expr", ["expr", T.OPERATOR_DOT, "member"], prec=P.MEMBERS),
+        Rule(
+            "expr",
+            [T.PAREN_OPEN, "expr", T.PAREN_CLOSE],
+            prec=P.PARENTHESES,
+            action=_inner(1),
+        ),
+        Rule(
+            "expr",
+            ["expr", T.OPERATOR_DOT, "member"],
+            prec=P.MEMBERS,
+            action=_member_access,
+        ),
         Rule(
             "expr", ["expr", T.BRACKET_OPEN, "expr", T.BRACKET_CLOSE], prec=P.SUBSCRIPTS
         ),
-        Rule("expr", ["stmt_call"], prec=P.CALLS),
+        Rule("expr", ["stmt_call"], prec=P.CALLS, action=_inner(0)),
         Rule(
             "expr",
-            [(T.OPERATOR_DEREF, T.OPERATOR_MINUS, T.OPERATOR_BITNOT), "expr"],
+            [(T.OPERATOR_DEREF, T.OPERATOR_MINUS), "expr"],
             prec=P.PREFIX_UNARY,
             rassoc=True,
+            action=_unop(
+                {
+                    T.OPERATOR_DEREF: ("deref", "address"),
+                    T.OPERATOR_MINUS: ("negate", "value"),
+                }
+            ),
         ),
+        # split out since there's no AST node for it yet
+        Rule("expr", [T.OPERATOR_BITNOT, "expr"], prec=P.PREFIX_UNARY, rassoc=True),
         Rule("expr", ["expr", T.OPERATOR_BITAND, "expr"], prec=P.BITAND),
         Rule("expr", ["expr", T.OPERATOR_BITOR, "expr"], prec=P.BITOR),
         Rule("expr", ["expr", T.OPERATOR_BITXOR, "expr"], prec=P.BITXOR),
@@ -279,9 +499,13 @@ grammar = Grammar(
             "expr",
             ["expr", (T.OPERATOR_TIMES, T.OPERATOR_DIVIDE), "expr"],
             prec=P.PRODUCTS,
+            action=_binop({T.OPERATOR_TIMES: "mul", T.OPERATOR_DIVIDE: "div"}),
         ),
         Rule(
-            "expr", ["expr", (T.OPERATOR_PLUS, T.OPERATOR_MINUS), "expr"], prec=P.SUMS
+            "expr",
+            ["expr", (T.OPERATOR_PLUS, T.OPERATOR_MINUS), "expr"],
+            prec=P.SUMS,
+            action=_binop({T.OPERATOR_PLUS: "add", T.OPERATOR_MINUS: "sub"}),
         ),
         Rule(
             "expr",
@@ -299,27 +523,36 @@ grammar = Grammar(
             ],
             prec=P.COMPARISONS,
         ),
-        Rule("expr", [(T.NUMERIC, T.IDENTIFIER, "string")], prec=P.LITERALS),
+        Rule(
+            "expr",
+            [(T.NUMERIC, T.IDENTIFIER, "string")],
+            prec=P.LITERALS,
+            action=_literal,
+        ),
         Rule("array", [T.BRACKET_OPEN, "alist", T.BRACKET_CLOSE]),
         Rule(
-            "string", [T.STRING_DELIM, "string_inner", T.STRING_DELIM], prec=P.LITERALS
+            "string",
+            [T.STRING_DELIM, "string_inner", T.STRING_DELIM],
+            prec=P.LITERALS,
+            action=_string,
         ),
-        Rule("string_inner", [], mode=Mode.STRING),
+        Rule("string_inner", [], mode=Mode.STRING, action=_string_inner),
         Rule(
             "string_inner",
             ["string_inner", (T.STRING, T.STRING_ESCAPE)],
             mode=Mode.STRING,
+            action=_string_inner,
         ),
-        Rule("storage", [], prec=P.STORAGE),
-        Rule("storage", [(T.STORAGE_MUT, T.STORAGE_STASH)]),
+        Rule("storage", [], prec=P.STORAGE, action=_storage),
+        Rule("storage", [(T.STORAGE_MUT, T.STORAGE_STASH)], action=_storage),
         Rule("range_to", ["expr", T.PUNCT_TO, "expr"]),
-        Rule("type_id", [T.IDENTIFIER]),
+        Rule("type_id", [T.IDENTIFIER], action=_simple_type),
         Rule(
             "type_id",
             [T.OPERATOR_REF, T.BRACKET_OPEN, "storage", "type_id", T.BRACKET_CLOSE],
             prec=P.TYPES,
         ),
-        Rule("type_id", [T.OPERATOR_REF, "storage", "type_id"]),
+        Rule("type_id", [T.OPERATOR_REF, "storage", "type_id"], action=_ref_type),
         Rule(
             "type_id",
             [
@@ -336,8 +569,9 @@ grammar = Grammar(
             "stmt_constant",
             [T.STMT_CONSTANT, "declaration", T.OPERATOR_ASSIGN, ("expr", "array")],
             prec=P.STATEMENTS,
+            action=_stmt_constant,
         ),
-        Rule("stmt_use", [T.STMT_USE, T.IDENTIFIER]),
+        Rule("stmt_use", [T.STMT_USE, T.IDENTIFIER], action=_stmt_use),
         Rule(
             "stmt_let",
             [
@@ -348,6 +582,7 @@ grammar = Grammar(
                 ("expr", "array"),
             ],
             prec=P.STATEMENTS,
+            action=_stmt_let,
         ),
         Rule("do_block", [T.PUNCT_DO, "block", T.PUNCT_END]),
         Rule("stmt_while", [T.STMT_WHILE, "expr", "do_block"]),
@@ -392,6 +627,7 @@ grammar = Grammar(
                 "block",
                 T.PUNCT_ENDFUN,
             ],
+            action=_stmt_fun,
         ),
         Rule(
             "stmt_fun",
@@ -417,9 +653,21 @@ grammar = Grammar(
                 "expr",
             ],
             prec=P.ASSIGNMENTS,
+            action=_stmt_assign,
+        ),
+        Rule(
+            "stmt_call",
+            ["expr", T.PAREN_OPEN, "alist", T.PAREN_CLOSE],
+            prec=P.CALLS,
+            action=_stmt_call,
+        ),
+        Rule(
+            "block",
+            [],
+            prec=P.STATEMENTS,
+            rassoc=True,
+            action=_block,
         ),
-        Rule("stmt_call", ["expr", T.PAREN_OPEN, "alist", T.PAREN_CLOSE], prec=P.CALLS),
-        Rule("block", [], prec=P.STATEMENTS, rassoc=True),
         Rule(
             "block",
             [
@@ -437,16 +685,18 @@ grammar = Grammar(
             ],
             prec=P.STATEMENTS,
             rassoc=True,
+            action=_block,
         ),
-        Rule("toplevel", []),
+        Rule("toplevel", [], action=_toplevel),
         Rule(
             "toplevel",
             [
                 ("stmt_constant", "stmt_isr", "stmt_let", "stmt_use", "stmt_fun"),
                 "toplevel",
             ],
+            action=_toplevel,
         ),
-        Rule("unit", ["toplevel"]),
+        Rule("unit", ["toplevel"], action=_unit),
         Rule("start", ["unit"]),
     ],
 )
@@ -478,4 +728,45 @@ comment_grammar = Grammar(
     ],
 )
 
-parse = grammar.build_parser({ReStream.CHANNEL_HIDDEN: comment_grammar})
+hidden_grammars = {ReStream.CHANNEL_HIDDEN: comment_grammar}
+
+# The tokens the parser resynchronizes on after a syntax error. Every
+# statement starts with one of these keywords (except assignments and calls,
+# which start with an expression), so parsing can pick up again at the next
+# statement.
+sync_tokens = frozenset(
+    [
+        T.STMT_CONSTANT,
+        T.STMT_FOR,
+        T.STMT_FUN,
+        T.STMT_IF,
+        T.STMT_ISR,
+        T.STMT_LET,
+        T.STMT_RETURN,
+        T.STMT_USE,
+        T.STMT_WHILE,
+        T.PUNCT_ENDFUN,
+        T.PUNCT_ENDISR,
+        T.PUNCT_END,
+        T.EOF,
+    ]
+)
+
+
+def generate_tables():
+    """Generates the source of the _parsetab module.
+
+    The tables are always built from scratch, so the output reflects the
+    grammar as it is currently defined.
+    """
+
+    return parsing.generate_module(
+        grammar.build_parser(hidden_grammars),
+        grammar.fingerprint(hidden_grammars),
+        __name__,
+    )
+
+
+parse = grammar.build_parser(
+    hidden_grammars, cache=TableCache.default("gold"), tables=_parsetab
+)
@@ -74,35 +74,18 @@ class AssembleWithRelocations:
 
 @pattern.transform(pattern.Order.Ascending)
 class FlattenSymbol:
-    @pattern.match(
-        ast.AstNode(
-            "block",
-            {
-                "stmt": ast.AstNode("asmrun", {"bin": P("bin0")}),
-                "next": ast.AstNode(
-                    "block", {"stmt": ast.AstNode("asmrun", {"bin": P("binf")})}
-                ),
-            },
-        )
-    )
-    def concatenate_bins(self, bin0, binf):
-        return ast.AstNode(
-            "block", {"stmt": ast.AstNode("asmrun", {"bin": bin0 + binf})}
-        )
-
     @pattern.match(
         ast.AstNode(
             "fun",
             attrs={
                 "name": P("name"),
                 "type": P("ty"),
-                "body": ast.AstNode(
-                    "block", {"stmt": ast.AstNode("asmrun", {"bin": P("text")})}
-                ),
+                "body": P.each(ast.AstNode("asmrun"), key="body"),
             },
         )
     )
-    def fun(self, name, ty, text):
+    def fun(self, name, ty, body):
+        text = b"".join(stmt.attrs["bin"] for stmt in body)
         return ast.AstNode("fun_symbol", {"name": name, "type": ty, "text": text})
 
 
@@ -18,6 +18,26 @@ from ... import ast
 from ...immutable import FrozenDict
 
 
+def _enter_scope(handler):
+    def enter_scoped(self, node):
+        if handler is not None:
+            node = handler(self, node)
+        self.push_scope(node)
+        return self.enter__scope(node)
+
+    return enter_scoped
+
+
+def _exit_scope(handler):
+    def exit_scoped(self, node):
+        node = self.pop_scope(self.exit__scope(node))
+        if handler is not None:
+            node = handler(self, node)
+        return node
+
+    return exit_scoped
+
+
 class ScopedPass(ast.TranslationPass):
     """Base class for translation passes which understand binding scope.
     """
@@ -47,31 +67,31 @@ class ScopedPass(ast.TranslationPass):
                 return known_constants[name]
         return None
 
-    def transform_enter(self, t, node):
-        node = super().transform_enter(t, node)
-        if t in self.scoped_types:
-            self.scopes.append(
-                {
-                    "known_names": node.attrs.get(
-                        "known_names", FrozenDict.empty()
-                    ).asbuilder(),
-                    "known_constants": node.attrs.get(
-                        "known_constants", FrozenDict.empty()
-                    ).asbuilder(),
-                }
-            )
-            node = self.enter__scope(node)
-        return node
-
-    def transform_exit(self, t, node):
-        if t in self.scoped_types:
-            node = self.exit__scope(node)
-        if t in self.scoped_types:
-            node = node.update_attrs(
-                {k: v.asfrozen() for k, v in self.scopes.pop().items()}
-            )
-        node = super().transform_exit(t, node)
-        return node
+    @classmethod
+    def _build_dispatch(cls):
+        # Scoping is handled by wrapping the handlers for the scoped types, so
+        # that other nodes still go straight through.
+        super()._build_dispatch()
+        for t in cls.scoped_types:
+            cls._enter[t] = _enter_scope(cls._enter.get(t))
+            cls._exit[t] = _exit_scope(cls._exit.get(t))
+
+    def push_scope(self, node):
+        self.scopes.append(
+            {
+                "known_names": node.attrs.get(
+                    "known_names", FrozenDict.empty()
+                ).asbuilder(),
+                "known_constants": node.attrs.get(
+                    "known_constants", FrozenDict.empty()
+                ).asbuilder(),
+            }
+        )
+
+    def pop_scope(self, node):
+        return node.update_attrs(
+            {k: v.asfrozen() for k, v in self.scopes.pop().items()}
+        )
 
     def enter__scope(self, node):
         return node
@@ -114,11 +134,6 @@ class EvaluateConstants(ScopedPass):
         self.bind_constant(node.attrs["name"], node.attrs["value"])
         return None
 
-    def exit_toplevel(self, node):
-        if node.attrs["stmt"] is None:
-            return node.attrs["next"]
-        return node
-
     def exit_call(self, node):
         target = node.attrs["target"]
         return target(*node.select("args", "arg"))
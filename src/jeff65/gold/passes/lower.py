@@ -14,6 +14,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import attr
 from . import asm
 from ... import ast, pattern
 from ...pattern import Predicate as P
@@ -23,33 +24,23 @@ from ...pattern import Predicate as P
 class LowerAssignment:
     @pattern.match(
         ast.AstNode(
-            "block",
-            {
-                "stmt": ast.AstNode(
-                    "set",
-                    span=P("span"),
-                    attrs={
-                        "type": P("ty"),
-                        "lvalue": P("lvalue"),
-                        "rvalue": P("rvalue"),
-                    },
-                ),
-                "next": P("nxt"),
-            },
+            "set",
+            span=P("span"),
+            attrs={"type": P("ty"), "lvalue": P("lvalue"), "rvalue": P("rvalue")},
         )
     )
-    def lower_set(self, span, ty, lvalue, rvalue, nxt):
+    def lower_set(self, span, ty, lvalue, rvalue):
         assert ty.width == lvalue.attrs["width"]
         assert ty.width == rvalue.attrs["width"]
+        # the enclosing block splices these in place of the assignment
         return ast.AstNode.make_sequence(
-            "block", "stmt", [asm.lda(rvalue, span), asm.sta(lvalue, span)], rest=nxt
+            "block", "stmt", [asm.lda(rvalue, span), asm.sta(lvalue, span)]
         )
 
 
 class LowerFunctions(ast.TranslationPass):
     def exit_fun(self, node):
-        children = node.select("body", "stmt")
-        children.append(asm.rts(node.span))
+        body = node.attrs["body"]
         return node.update_attrs(
-            {"body": ast.AstNode.make_sequence("block", "stmt", children)}
+            {"body": attr.evolve(body, items=body.items + (asm.rts(node.span),))}
         )
@@ -56,11 +56,6 @@ class ResolveUnits(binding.ScopedPass):
         self.bind_name(name, unit)
         return None
 
-    def exit_toplevel(self, node):
-        if node.attrs["stmt"] is None:
-            return node.attrs["next"]
-        return node
-
 
 class ResolveMembers(binding.ScopedPass):
     """Resolves members to functions."""
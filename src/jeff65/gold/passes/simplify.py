@@ -62,11 +62,11 @@ def to_list(sym, t_node, a_element):
         ast.AstNode(sym, {"exhaustive!": True, "00": P("car"), "01": P("cdr")})
     )
     def name_right_recursion(self, car, cdr):
-        return ast.AstNode(sym, {a_element: car, "next": cdr})
+        return ast.AstSequence.cons(car, cdr)
 
     @pattern.match(ast.AstNode(sym, {"exhaustive!": True}))
     def name_right_recursion_final(self):
-        return None
+        return ast.AstSequence(t_node, a_element)
 
     return name_right_recursion, name_right_recursion_final
 
@@ -83,7 +83,6 @@ def drop_if_one_child(sym):
 class Simplify:
 
     remove_outer_expr = drop_if_one_child("expr")
-    remove_outer_alist = drop_if_one_child("alist")
 
     list_toplevel, list_toplevel_f = to_list("toplevel", "toplevel", "stmt")
     list_block, list_block_f = to_list("block", "block", "stmt")
@@ -92,13 +91,17 @@ class Simplify:
     def name_unit(self, toplevels):
         return ast.AstNode("unit", {"toplevels": toplevels})
 
+    @pattern.match(ast.AstNode("alist", {"exhaustive!": True, "00": P("inner")}))
+    def remove_outer_alist(self, inner):
+        return inner
+
     @pattern.match(ast.AstNode("alist", {"exhaustive!": True}))
     def remove_empty_alist(self):
-        return None
+        return ast.AstSequence("alist", "arg")
 
     @pattern.match(ast.AstNode("alist_inner", {"exhaustive!": True, "00": P("arg")}))
     def collapse_alist_final(self, arg):
-        return ast.AstNode("alist", {"arg": arg, "next": None})
+        return ast.AstSequence("alist", "arg", (arg,))
 
     @pattern.match(
         ast.AstNode(
@@ -112,7 +115,7 @@ class Simplify:
         )
     )
     def collapse_alist(self, arg, cdr):
-        return ast.AstNode("alist", {"arg": arg, "next": cdr})
+        return ast.AstSequence.cons(arg, cdr)
 
     @pattern.match(
         ast.AstNode(
@@ -14,41 +14,297 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import bisect
 import collections.abc
 
+# Each level of the trie consumes this many bits of the key's hash.
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_BITS = 64
+_HASH_MASK = (1 << _HASH_BITS) - 1
+
+
+def _hash(key):
+    return hash(key) & _HASH_MASK
+
+
+class _Node:
+    """A node of a hash array mapped trie.
+
+    Each of the 32 possible values of the node's slice of the hash has a bit in
+    the bitmap, which is set if there is an entry for it. The entries are
+    stored in order of their bits, and are either a (key, hash, value) tuple or
+    another node.
+
+    A node whose owner matches the one passed to _assoc or _dissoc belongs to
+    a builder which hasn't been frozen yet, and is updated in place rather than
+    copied.
+    """
+
+    __slots__ = ("bitmap", "entries", "owner")
+
+    def __init__(self, bitmap, entries, owner):
+        self.bitmap = bitmap
+        self.entries = entries
+        self.owner = owner
+
+
+class _Collision:
+    """A trie node holding keys whose hashes are entirely equal."""
+
+    __slots__ = ("hash", "entries", "owner")
+
+    def __init__(self, h, entries, owner):
+        self.hash = h
+        self.entries = entries
+        self.owner = owner
+
+
+def _lookup(node, key, h, default):
+    shift = 0
+    while node is not None:
+        if type(node) is _Collision:
+            for k, _, v in node.entries:
+                if k == key:
+                    return v
+            return default
+        bit = 1 << ((h >> shift) & _MASK)
+        if not node.bitmap & bit:
+            return default
+        entry = node.entries[bin(node.bitmap & (bit - 1)).count("1")]
+        if type(entry) is tuple:
+            if entry[1] == h and entry[0] == key:
+                return entry[2]
+            return default
+        node = entry
+        shift += _BITS
+    return default
+
+
+def _merge(a, b, shift, owner):
+    """Builds the smallest subtrie holding two leaves with different keys."""
+
+    if shift >= _HASH_BITS:
+        return _Collision(a[1], [a, b], owner)
+    ia = (a[1] >> shift) & _MASK
+    ib = (b[1] >> shift) & _MASK
+    if ia == ib:
+        return _Node(1 << ia, [_merge(a, b, shift + _BITS, owner)], owner)
+    entries = [a, b] if ia < ib else [b, a]
+    return _Node((1 << ia) | (1 << ib), entries, owner)
+
+
+def _assoc(node, leaf, shift, owner, added):
+    """Returns the node with the given leaf inserted or replaced.
+
+    'added' is a one-element list, which is set to True if the key was not
+    already present.
+    """
+
+    key, h, _ = leaf
+    if type(node) is _Collision:
+        # Collision nodes are only found once the hash bits have run out, so
+        # the new key's hash must be the same as the others.
+        entries = list(node.entries)
+        for k, entry in enumerate(entries):
+            if entry[0] == key:
+                entries[k] = leaf
+                break
+        else:
+            entries.append(leaf)
+            added[0] = True
+        if node.owner is owner and owner is not None:
+            node.entries = entries
+            return node
+        return _Collision(h, entries, owner)
+
+    bit = 1 << ((h >> shift) & _MASK)
+    index = bin(node.bitmap & (bit - 1)).count("1")
+    editable = node.owner is owner and owner is not None
+    if not node.bitmap & bit:
+        added[0] = True
+        if editable:
+            node.entries.insert(index, leaf)
+            node.bitmap |= bit
+            return node
+        entries = node.entries[:index] + [leaf] + node.entries[index:]
+        return _Node(node.bitmap | bit, entries, owner)
+
+    entry = node.entries[index]
+    if type(entry) is tuple:
+        if entry[1] == h and entry[0] == key:
+            replacement = leaf
+        else:
+            added[0] = True
+            replacement = _merge(entry, leaf, shift + _BITS, owner)
+    else:
+        replacement = _assoc(entry, leaf, shift + _BITS, owner, added)
+        if replacement is entry:
+            return node
+    if editable:
+        node.entries[index] = replacement
+        return node
+    entries = list(node.entries)
+    entries[index] = replacement
+    return _Node(node.bitmap, entries, owner)
+
+
+def _dissoc(node, key, h, shift, owner):
+    """Returns the node with the given key removed, or None if it is empty.
+
+    Raises KeyError if the key is not present.
+    """
+
+    if type(node) is _Collision:
+        entries = [e for e in node.entries if e[0] != key]
+        if len(entries) == len(node.entries):
+            raise KeyError(key)
+        if len(entries) == 0:
+            return None
+        return _Collision(h, entries, owner)
+
+    bit = 1 << ((h >> shift) & _MASK)
+    if not node.bitmap & bit:
+        raise KeyError(key)
+    index = bin(node.bitmap & (bit - 1)).count("1")
+    entry = node.entries[index]
+    if type(entry) is tuple:
+        if not (entry[1] == h and entry[0] == key):
+            raise KeyError(key)
+        replacement = None
+    else:
+        replacement = _dissoc(entry, key, h, shift + _BITS, owner)
+
+    if replacement is None:
+        if node.bitmap == bit:
+            return None
+        if node.owner is owner and owner is not None:
+            del node.entries[index]
+            node.bitmap ^= bit
+            return node
+        entries = node.entries[:index] + node.entries[index + 1 :]
+        return _Node(node.bitmap ^ bit, entries, owner)
+
+    if node.owner is owner and owner is not None:
+        node.entries[index] = replacement
+        return node
+    entries = list(node.entries)
+    entries[index] = replacement
+    return _Node(node.bitmap, entries, owner)
+
+
+def _leaves(node):
+    if node is None:
+        return
+    stack = [node]
+    while len(stack) > 0:
+        for entry in stack.pop().entries:
+            if type(entry) is tuple:
+                yield entry
+            else:
+                stack.append(entry)
+
+
+def _sorted_items(root):
+    return tuple(sorted(((k, v) for k, _, v in _leaves(root)), key=_first))
+
+
+def _first(item):
+    return item[0]
+
+
+class _ItemsView(collections.abc.ItemsView):
+    def __iter__(self):
+        return iter(self._mapping._items())
+
+
+class _ValuesView(collections.abc.ValuesView):
+    def __iter__(self):
+        return (v for _, v in self._mapping._items())
+
+
+_MISSING = object()
+
 
 class FrozenDict(collections.abc.Mapping):
     """An immutable mapping type.
 
-    Currently this is implemented as a sorted list, but in the future it could
-    be replaced with a more efficient implementation if it proves to be slow.
+    This is implemented as a hash array mapped trie, so adding or removing a
+    key copies only the path to it, and shares the rest with the original.
+    Iteration is always in sorted order of the keys, so they must be
+    comparable with one another; the order is worked out the first time it is
+    needed. A FrozenDict is hashable if its values are, and the hash is only
+    computed once.
     """
 
-    def __init__(self, keys, values):
-        self.__keys = tuple(keys)
-        self.__values = tuple(values)
+    __slots__ = ("__root", "__len", "__order", "__hash")
+
+    def __init__(self, keys=(), values=()):
+        builder = self.Builder(keys, values)
+        self.__root = builder._root
+        self.__len = len(builder)
+        self.__order = None
+        self.__hash = None
+
+    @classmethod
+    def _make(cls, root, size):
+        self = object.__new__(cls)
+        self.__root = root
+        self.__len = size
+        self.__order = None
+        self.__hash = None
+        return self
 
     def __repr__(self):
         pairs = ", ".join(f"{k!r}: {v!r}" for k, v in self.items())
         return f"FrozenDict({{{pairs}}})"
 
     def __iter__(self):
-        return iter(self.__keys)
+        return (k for k, _ in self._items())
 
     def __len__(self):
-        return len(self.__keys)
+        return self.__len
 
     def __getitem__(self, key):
-        k = bisect.bisect_left(self.__keys, key)
-        if k != len(self.__keys) and self.__keys[k] == key:
-            return self.__values[k]
-        raise KeyError(key)
+        value = _lookup(self.__root, key, _hash(key), _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return _lookup(self.__root, key, _hash(key), _MISSING) is not _MISSING
+
+    def get(self, key, default=None):
+        return _lookup(self.__root, key, _hash(key), default)
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenDict) and self.__root is other.__root:
+            return True
+        return super().__eq__(other)
+
+    def __hash__(self):
+        # Only works if the values are hashable too, like a tuple.
+        if self.__hash is None:
+            self.__hash = hash(frozenset((k, v) for k, _, v in _leaves(self.__root)))
+        return self.__hash
+
+    def items(self):
+        return _ItemsView(self)
+
+    def values(self):
+        return _ValuesView(self)
+
+    def _items(self):
+        if self.__order is None:
+            self.__order = _sorted_items(self.__root)
+        return self.__order
 
     def add(self, key, value):
-        builder = self.asbuilder()
-        builder[key] = value
-        return builder.asfrozen()
+        added = [False]
+        leaf = (key, _hash(key), value)
+        if self.__root is None:
+            return self._make(_Node(1 << (leaf[1] & _MASK), [leaf], None), 1)
+        root = _assoc(self.__root, leaf, 0, None, added)
+        return self._make(root, self.__len + added[0])
 
     def update(self, mapping):
         builder = self.asbuilder()
@@ -56,16 +312,17 @@ class FrozenDict(collections.abc.Mapping):
         return builder.asfrozen()
 
     def remove(self, key):
-        builder = self.asbuilder()
-        del builder[key]
-        return builder.asfrozen()
+        if self.__root is None:
+            raise KeyError(key)
+        root = _dissoc(self.__root, key, _hash(key), 0, None)
+        return self._make(root, self.__len - 1)
 
     def asbuilder(self):
-        return self.Builder(self.__keys, self.__values)
+        return self.Builder._make(self.__root, self.__len)
 
     @classmethod
     def empty(cls):
-        return cls((), ())
+        return _EMPTY
 
     @classmethod
     def create(cls, other):
@@ -79,50 +336,77 @@ class FrozenDict(collections.abc.Mapping):
         return builder.asfrozen()
 
     class Builder(collections.abc.MutableMapping):
-        def __init__(self, keys, values):
-            self.__keys = list(keys)
-            self.__values = list(values)
+        """A mutable mapping which can be turned into a FrozenDict.
+
+        The builder shares the trie it was created from, and copies nodes
+        the first time it changes them. Once frozen, the builder goes back to
+        copying, so the frozen mapping is never affected by later changes.
+        """
+
+        def __init__(self, keys=(), values=()):
+            self._root = None
+            self.__len = 0
+            self.__owner = object()
+            for key, value in zip(keys, values):
+                self[key] = value
+
+        @classmethod
+        def _make(cls, root, size):
+            self = cls()
+            self._root = root
+            self.__len = size
+            return self
 
         def __repr__(self):
             pairs = ", ".join(f"{k!r}: {v!r}" for k, v in self.items())
             return f"FrozenDict.Builder({{{pairs}}})"
 
         def __iter__(self):
-            return iter(self.__keys)
+            return (k for k, _ in _sorted_items(self._root))
 
         def __len__(self):
-            return len(self.__keys)
+            return self.__len
 
         def __getitem__(self, key):
-            k = bisect.bisect_left(self.__keys, key)
-            if k != len(self.__keys) and self.__keys[k] == key:
-                return self.__values[k]
-            raise KeyError(key)
+            value = _lookup(self._root, key, _hash(key), _MISSING)
+            if value is _MISSING:
+                raise KeyError(key)
+            return value
+
+        def __contains__(self, key):
+            return _lookup(self._root, key, _hash(key), _MISSING) is not _MISSING
 
         def __setitem__(self, key, value):
-            k = bisect.bisect_left(self.__keys, key)
-            if k != len(self.__keys) and self.__keys[k] == key:
-                self.__keys[k] = key
-                self.__values[k] = value
-            else:
-                self.__keys.insert(k, key)
-                self.__values.insert(k, value)
+            leaf = (key, _hash(key), value)
+            if self._root is None:
+                self._root = _Node(1 << (leaf[1] & _MASK), [leaf], self.__owner)
+                self.__len = 1
+                return
+            added = [False]
+            self._root = _assoc(self._root, leaf, 0, self.__owner, added)
+            self.__len += added[0]
 
         def __delitem__(self, key):
-            k = bisect.bisect_left(self.__keys, key)
-            if k != len(self.__keys) and self.__keys[k] == key:
-                del self.__keys[k]
-                del self.__values[k]
-            else:
+            if self._root is None:
                 raise KeyError(key)
+            self._root = _dissoc(self._root, key, _hash(key), 0, self.__owner)
+            self.__len -= 1
 
         def unsafeset(self, key, value):
-            self.__keys.append(key)
-            self.__values.append(value)
+            # Insertion order doesn't matter to the trie, so this is the same
+            # as setting the key normally.
+            self[key] = value
 
         def asfrozen(self):
-            return FrozenDict(self.__keys, self.__values)
+            # Nodes created so far now belong to the frozen mapping.
+            self.__owner = object()
+            if self.__len == 0:
+                return _EMPTY
+            return FrozenDict._make(self._root, self.__len)
 
         @classmethod
         def empty(cls):
-            return cls([], [])
+            return cls()
+
+
+_EMPTY = FrozenDict._make(None, 0)
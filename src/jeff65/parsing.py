@@ -14,20 +14,35 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import array
 import attr
+import bisect
+import codecs
+import collections
+import collections.abc
+import contextlib
+import enum
+import hashlib
 import io
+import json
 import logging
+import mmap
+import os
+import pathlib
 import regex as re
+import tempfile
+import textwrap
 import time
-from collections import deque
 from itertools import chain
 
 logger = logging.getLogger(__name__)
 
 
 class ParseError(Exception):
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, errors=None, **kwargs):
         super().__init__(*args, **kwargs)
+        # every error found, if the parser recovered from some of them
+        self.errors = [self] if errors is None else errors
 
 
 @attr.s(slots=True, frozen=True)
@@ -53,7 +68,7 @@ class TextSpan:
 
     def __contains__(self, other):
         return (
-            isinstance(other, TextSpan)
+            isinstance(other, (TextSpan, OffsetSpan))
             and self.start <= other.start
             and other.end <= self.end
         )
@@ -75,6 +90,106 @@ class TextSpan:
         return f"{start}-{end}"
 
 
+class OffsetSpan:
+    """A span given by offsets into a text, which can be used as a TextSpan.
+
+    The line and column numbers are only looked up in the text's LineIndex
+    when they are asked for. An OffsetSpan is equal to the TextSpan with the
+    same positions.
+    """
+
+    __slots__ = ("lines", "start_offset", "end_offset")
+
+    def __init__(self, lines, start_offset, end_offset):
+        assert end_offset >= start_offset
+        self.lines = lines
+        self.start_offset = start_offset
+        self.end_offset = end_offset
+
+    @property
+    def start(self):
+        return self.lines.position(self.start_offset)
+
+    @property
+    def end(self):
+        return self.lines.position(self.end_offset)
+
+    @property
+    def start_line(self):
+        return self.start[0]
+
+    @property
+    def start_column(self):
+        return self.start[1]
+
+    @property
+    def end_line(self):
+        return self.end[0]
+
+    @property
+    def end_column(self):
+        return self.end[1]
+
+    def resolve(self):
+        """Returns the TextSpan with the same positions."""
+        return TextSpan(*self.start, *self.end)
+
+    def __bool__(self):
+        return self.start_offset < self.end_offset
+
+    def __contains__(self, other):
+        return other in self.resolve()
+
+    def __eq__(self, other):
+        if isinstance(other, OffsetSpan) and other.lines is self.lines:
+            return (self.start_offset, self.end_offset) == (
+                other.start_offset,
+                other.end_offset,
+            )
+        if not isinstance(other, (TextSpan, OffsetSpan)):
+            return NotImplemented
+        return (self.start, self.end) == (other.start, other.end)
+
+    def __hash__(self):
+        return hash(self.resolve())
+
+    def __repr__(self):
+        return f"OffsetSpan({self.start_offset}, {self.end_offset})"
+
+    def __str__(self):
+        return str(self.resolve())
+
+
+@attr.s(slots=True, frozen=True)
+class TextEdit:
+    """A change to a text, replacing the text in 'span' with 'text'.
+
+    The span is given in terms of the text before the change.
+    """
+
+    span = attr.ib()
+    text = attr.ib()
+
+    @property
+    def new_end(self):
+        """The end of the replacement text, in terms of the changed text."""
+        lines = self.text.count("\n")
+        if lines > 0:
+            return (
+                self.span.start_line + lines,
+                len(self.text) - self.text.rindex("\n") - 1,
+            )
+        return (self.span.start_line, self.span.start_column + len(self.text))
+
+    def shift(self, position):
+        """Maps a position at or after the end of the span across the change."""
+        line, column = position
+        end_line, end_column = self.new_end
+        if line == self.span.end_line:
+            return (end_line, end_column + column - self.span.end_column)
+        return (line + end_line - self.span.end_line, column)
+
+
 @attr.s(slots=True, frozen=True)
 class Token:
     t = attr.ib()
@@ -87,6 +202,276 @@ class Token:
         return f"{i}{self.t}={self.text!r} {self.span}\n"
 
 
+class LineIndex:
+    """An index of the offsets at which each line of a text starts.
+
+    Offsets are converted into (line, column) positions by a binary search,
+    so positions only have to be worked out when they're actually needed.
+
+    The text may be part of a document which has been edited since. Offsets
+    and positions are then given in terms of the document as it is now: the
+    index knows where its text started in the document, and replays the
+    edits made after that from a log shared by the document's other indices.
+    """
+
+    def __init__(self):
+        self.starts = array.array("l", [0])
+        self.origin = (0, 1, 0)  # the offset, line and column of the text
+        self.edits = []  # (end, delta, TextEdit) for each edit to the document
+        self.version = 0  # the number of those which the origin allows for
+
+    def add(self, text, base):
+        """Adds the lines of some text, which starts at offset 'base'."""
+
+        find = text.find
+        k = find("\n")
+        while k >= 0:
+            self.starts.append(base + k + 1)
+            k = find("\n", k + 1)
+
+    def locate(self, offset):
+        """Returns the current offset and (line, column) position of an offset.
+
+        The given offset is into the indexed text, while the result is in
+        terms of the document it's part of.
+        """
+
+        line = bisect.bisect_right(self.starts, offset)
+        column = offset - self.starts[line - 1]
+        base, base_line, base_column = self.origin
+        if line == 1:
+            position = (base_line, base_column + column)
+        else:
+            position = (base_line + line - 1, column)
+        offset += base
+        edits = self.edits
+        for k in range(self.version, len(edits)):
+            end, delta, edit = edits[k]
+            if offset >= end:
+                offset += delta
+                position = edit.shift(position)
+        return offset, position
+
+    def position(self, offset):
+        """Returns the (line, column) position of the given offset."""
+
+        return self.locate(offset)[1]
+
+    def record(self, end, delta, edit):
+        """Records an edit to the document.
+
+        'end' is the offset of the end of the replaced text, and 'delta' is how
+        far the edit moves the text after it.
+        """
+
+        self.edits.append((end, delta, edit))
+
+    def join(self, other, offset, position):
+        """Makes the indexed text part of the document 'other' is part of.
+
+        The text is placed at the given current offset and position.
+        """
+
+        self.origin = (offset, *position)
+        self.edits = other.edits
+        self.version = len(other.edits)
+
+
+class TokenArray:
+    """A compact record of the tokens produced by a ReStream.
+
+    Rather than keeping an object per token, the token types, channels and
+    start and end offsets are stored in parallel arrays, and tokens are
+    referred to by their index. A CompactToken is only made when one is
+    looked up, with its text read from the stream's buffer.
+
+    While a parser has pinned the stream, the tokens before the earliest one
+    it still needs are discarded along with their text, so only the indices
+    from 'first' onwards can be looked up.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.symbols = []
+        self.symbol_ids = {}
+        self.first = 0  # the index of the earliest token kept
+        self.types = array.array("H")
+        self.channels = array.array("b")
+        # offsets into the whole text, which fit easily in 32 bits
+        self.starts = array.array("I")
+        self.ends = array.array("I")
+
+    def __len__(self):
+        return self.first + len(self.types)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("token index out of range")
+        if index < self.first:
+            raise IndexError(f"token {index} has been discarded")
+        k = index - self.first
+        return self.token(index, self.starts[k], self.ends[k])
+
+    def token(self, index, start, end):
+        """Makes the token at the given index, which has the given offsets."""
+
+        k = index - self.first
+        channel = self.channels[k]
+        if channel == ReStream.CHANNEL_ALL:
+            text = None
+        else:
+            base = self.stream.base
+            text = self.stream.buffer[start - base : end - base]
+        t = self.symbols[self.types[k]]
+        return CompactToken(t, text, channel, self.stream.lines, start, end)
+
+    def append(self, symbol, channel, start, end):
+        """Records a token, returning its index."""
+
+        type_id = self.symbol_ids.get(symbol)
+        if type_id is None:
+            type_id = self.symbol_ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        self.types.append(type_id)
+        self.channels.append(channel)
+        self.starts.append(start)
+        self.ends.append(end)
+        return self.first + len(self.ends) - 1
+
+    def pop(self):
+        self.types.pop()
+        self.channels.pop()
+        self.starts.pop()
+        self.ends.pop()
+
+    def discard(self, offset):
+        """Discards the tokens which start before the given offset."""
+
+        count = bisect.bisect_left(self.starts, offset)
+        del self.types[:count]
+        del self.channels[:count]
+        del self.starts[:count]
+        del self.ends[:count]
+        self.first += count
+
+
+class CompactToken:
+    """A token from a TokenArray, which can be used in place of a Token.
+
+    Rather than a span, it keeps the offsets of the token, and an OffsetSpan
+    is made from them when the span is asked for.
+    """
+
+    __slots__ = ("t", "text", "channel", "lines", "start", "end")
+
+    def __init__(self, t, text, channel, lines, start, end):
+        self.t = t
+        self.text = text
+        self.channel = channel
+        self.lines = lines
+        self.start = start
+        self.end = end
+
+    @property
+    def span(self):
+        return OffsetSpan(self.lines, self.start, self.end)
+
+    def __eq__(self, other):
+        if not isinstance(other, (Token, CompactToken)):
+            return NotImplemented
+        return (self.t, self.text) == (other.t, other.text)
+
+    def __hash__(self):
+        return hash((self.t, self.text))
+
+    def __repr__(self):
+        return f"CompactToken(t={self.t!r}, text={self.text!r})"
+
+    def _pretty(self, indent, no_position):
+        i = " " * indent
+        return f"{i}{self.t}={self.text!r} {self.span}\n"
+
+
+class Counters:
+    """Instrumentation counters for the lexers, streams and parsers.
+
+    Counting is off unless enable_counters() has been called, in which case
+    the counters are available as parsing.counters. Each counter is keyed as
+    follows:
+
+      lexer_attempts  (mode, what was tried) for each match a lexer starts
+      lexer_matches   (mode, token type) of each token or trivia matched
+      tokens          channel of each token produced by a stream
+      shifts          type of each token shifted by a parser
+      reductions      rule reduced by a parser
+      hidden_parses   channel of each hidden-channel parser invoked
+      buffer          "extend" and "trim" operations on stream buffers
+
+    What a lexer attempt is depends on the backend: a Lexer with separate
+    rules counts each rule's regex under its token type, one with combined
+    rules counts each match of the combined regex under COMBINED, and a
+    DfaLexer counts each scan under DFA. Trivia counts each probe for
+    whitespace or a comment under WHITESPACE or COMMENT. Retrying a match
+    after reading more input is counted as a buffer extension, not another
+    attempt.
+    """
+
+    COMBINED = "<combined>"
+    DFA = "<dfa>"
+    WHITESPACE = "<whitespace>"
+    COMMENT = "<comment>"
+
+    SECTIONS = [
+        "lexer_attempts",
+        "lexer_matches",
+        "tokens",
+        "shifts",
+        "reductions",
+        "hidden_parses",
+        "buffer",
+    ]
+
+    def __init__(self):
+        for name in self.SECTIONS:
+            setattr(self, name, collections.Counter())
+
+    def report(self):
+        """Formats the counters as text, with the largest counts first."""
+
+        lines = []
+        for name in self.SECTIONS:
+            counter = getattr(self, name)
+            lines.append(f"{name}: {sum(counter.values())}")
+            for key, count in counter.most_common():
+                if isinstance(key, tuple):
+                    key = " ".join(str(k) for k in key)
+                lines.append(f"  {count:>10}  {key}")
+        return "\n".join(lines)
+
+
+# The active counters, or None if counting is disabled. The hot paths check
+# this before doing any work, so disabled counters cost one comparison.
+counters = None
+
+
+def enable_counters():
+    """Starts counting with a fresh set of Counters, and returns them."""
+
+    global counters
+    counters = Counters()
+    return counters
+
+
+def disable_counters():
+    """Stops counting, and returns the counters collected so far."""
+
+    global counters
+    collected, counters = counters, None
+    return collected
+
+
 class ReStream:
     """Regex-matchable stream."""
 
@@ -94,12 +479,37 @@ class ReStream:
     CHANNEL_DEFAULT = 0
     CHANNEL_HIDDEN = 1
 
-    def __init__(self, stream, encoding="utf8", blocksize=4096):
-        self.current = deque()
+    def __init__(
+        self,
+        stream,
+        encoding="utf8",
+        blocksize=4096,
+        map_file=False,
+        record_trivia=False,
+        compact=False,
+    ):
+        """Create a stream over the given text or binary stream.
+
+        If 'compact' is true, the tokens produced are recorded in a
+        TokenArray, available as 'tokens', and their indices in it are
+        returned in place of Tokens. Token positions are then worked out from
+        an index of line starts when needed, rather than by counting the
+        newlines in each token as it is produced. Since the text of a token is
+        read from the buffer when it's looked up, the buffer (and the tokens
+        in it) is only trimmed up to the offset returned by 'pin', if set.
+        """
+
+        self.buffer = ""  # decoded input, from the start of the oldest token
+        self.base = 0  # the offset of the start of the buffer in the text
         self.position = 0
-        self.bufsize = 0
         self.line = 1  # the number of the actual current-position line
         self.column = 0
+        self.exhausted = False  # whether the whole input has been read
+        self.trivia = [] if record_trivia else None  # tokens skipped by Trivia
+        self.tokens = TokenArray(self) if compact else None
+        self.lines = LineIndex() if compact else None
+        self.pin = None  # returns the earliest offset still needed, if any
+        self.pinned_size = None  # the buffer size when the pin last held
 
         # TODO: If we got a buffered stream, it'd be cool to pull the buffer
         # size out of it directly, since e.g. file streams will use the block
@@ -111,8 +521,8 @@ class ReStream:
             # stream API.
             self.encoding = None
             self.bstream = None
-            self.current.append(stream.getvalue())
-            self.bufsize = len(self.current[0])
+            self.append_buffer(stream.getvalue())
+            self.exhausted = True
         elif isinstance(stream, io.TextIOBase):
             self.encoding = stream.encoding
             self.bstream = stream.detach()
@@ -120,6 +530,13 @@ class ReStream:
             self.encoding = encoding
             self.bstream = stream
 
+        if self.bstream is not None:
+            # Blocks may end partway through a multibyte character, so the
+            # decoder has to carry the leftover bytes over to the next block.
+            self.decoder = codecs.getincrementaldecoder(self.encoding)()
+            if map_file:
+                self.map_file()
+
         try:
             self.extend_buffer()
         except StopIteration:
@@ -136,56 +553,134 @@ class ReStream:
             self.bstream.close()
             self.bstream = None
 
+    def map_file(self):
+        """Reads all the remaining input at once by memory-mapping it.
+
+        This is only possible if the underlying stream is a regular file; if
+        it isn't, the stream is left alone and read a block at a time as usual.
+        Returns whether the file was mapped.
+        """
+
+        try:
+            start = self.bstream.tell()
+            mapped = mmap.mmap(self.bstream.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, io.UnsupportedOperation):
+            return False
+
+        with mapped, memoryview(mapped) as view, view[start:] as rest:
+            self.append_buffer(codecs.decode(rest, self.encoding))
+        self.close()
+        self.exhausted = True
+        return True
+
     def extend_buffer(self):
-        """Extends the current buffer to include an additional block."""
+        """Extends the current buffer with more input.
 
-        if self.bstream is None:
-            raise StopIteration
+        At least one block is read, and at least as much as remains unconsumed
+        in the buffer, so a token which needs to keep extending the buffer only
+        causes it to double in size each time.
+        """
 
-        block = self.bstream.read(self.blocksize)
-        if len(block) == 0:
+        if self.bstream is None:
+            self.exhausted = True
             raise StopIteration
 
-        text = block.decode(self.encoding)
-        self.current.append(text)
-        self.bufsize += len(text)
+        size = max(self.blocksize, len(self.buffer) - self.position)
+        while True:
+            block = self.bstream.read(size)
+            final = len(block) == 0
+            text = self.decoder.decode(block, final)
+            if len(text) > 0:
+                self.append_buffer(text)
+                if counters is not None:
+                    counters.buffer["extend"] += 1
+                return
+            elif final:
+                self.exhausted = True
+                raise StopIteration
+
+    def append_buffer(self, text):
+        """Appends decoded input to the buffer."""
+
+        if self.lines is not None:
+            self.lines.add(text, self.base + len(self.buffer))
+        self.buffer += text
 
     def trim_buffer(self):
-        """Trims already-consumed blocks from the buffer."""
+        """Trims already-consumed input from the buffer.
 
-        while len(self.current) > 0 and self.position > len(self.current[0]):
-            count = len(self.current.popleft())
-            self.position -= count
-            self.bufsize -= count
+        The buffer is only trimmed once at least half of it has been consumed,
+        so that the cost of copying the rest is paid for by what was consumed.
+        A compact stream is only trimmed while it has a pin, and if the pin
+        holds back too much, it isn't asked again until the buffer has grown.
+        """
+
+        keep = self.position
+        if keep == 0 or keep * 2 < len(self.buffer):
+            return
+        if self.tokens is not None:
+            if self.pin is None or self.pinned_size == len(self.buffer):
+                return
+            pinned = self.pin()
+            if pinned is not None and pinned - self.base < keep:
+                keep = pinned - self.base
+                if keep * 2 < len(self.buffer):
+                    self.pinned_size = len(self.buffer)
+                    return
+        self.buffer = self.buffer[keep:]
+        self.base += keep
+        self.position -= keep
+        if self.tokens is not None:
+            self.tokens.discard(self.base)
+        if counters is not None:
+            counters.buffer["trim"] += 1
 
     def assure_buffer(self):
         """Assures that at least one character remains in the buffer."""
 
-        while self.position >= self.bufsize:
+        while self.position >= len(self.buffer):
             self.extend_buffer()
         self.trim_buffer()
 
-    def match(self, regex):
+    def match(self, regex, earlier=None):
         """Match the given regex at the current stream position.
 
         In order to actually advance the position, call ReStream.produce() with
         the returned match object.
 
+        If 'earlier' is given, it is called with a complete match, and may
+        return a regex which takes priority over it. If that regex partially
+        matches, then more input is read and the match is retried, as though
+        the match had been partial in the first place.
+
         Returns a match object if successful, None otherwise.
         """
 
-        # The approach taken here, of reattempting partial matches with longer
-        # and longer inputs, leaves something to be desired. In particular, it
-        # means that multiline matches technically run in O(n^2) time. In
-        # practice, unless you have megabytes of comments (or strings), it
-        # shouldn't be an issue.
+        # Partial matches are reattempted from the start of the token with
+        # longer and longer inputs. Since extend_buffer() doubles the amount of
+        # unconsumed input each time, the total work done for a long token
+        # (e.g. a big comment or string) is still linear in its length.
 
         self.assure_buffer()
-        assert self.position < len(self.current[0])  # else buf expr is wrong
         while True:
-            buf = "".join(self.current)
+            buf = self.buffer
             m = regex.match(buf, self.position, partial=True)
-            if not m or not m.partial:
+            if m is None:
+                return None
+
+            partial = m.partial
+            if not partial and not self.exhausted:
+                if m.end() == len(buf):
+                    # The regex engine considers a greedy match which runs up
+                    # to the end of the buffer to be complete, but it might
+                    # have gone further given more input.
+                    partial = True
+                elif earlier is not None:
+                    prior = earlier(m)
+                    if prior is not None:
+                        pm = prior.match(buf, self.position, partial=True)
+                        partial = pm is not None and pm.partial
+            if not partial:
                 return m
 
             try:
@@ -194,10 +689,29 @@ class ReStream:
                 # EOF, so see if the partial match is valid as a full match.
                 return regex.match(buf, self.position)
 
+    def text(self):
+        """Returns the contents of the buffer as a single string.
+
+        Positions in the returned string correspond to ReStream.position.
+        """
+
+        return self.buffer
+
     def produce(self, symbol, match, channel=CHANNEL_DEFAULT):
         """Produce a token and advance the position."""
 
-        text = match.group()
+        return self.produce_text(symbol, match.group(), channel)
+
+    def produce_text(self, symbol, text, channel=CHANNEL_DEFAULT):
+        """Produce a token for text at the current position and advance."""
+
+        if counters is not None:
+            counters.tokens[channel] += 1
+        if self.tokens is not None:
+            start = self.base + self.position
+            self.position += len(text)
+            return self.tokens.append(symbol, channel, start, start + len(text))
+
         end_line = self.line + text.count("\n")
         if end_line > self.line:
             end_column = len(text) - text.rindex("\n") - 1
@@ -210,13 +724,27 @@ class ReStream:
             channel,
             TextSpan(self.line, self.column, end_line, end_column),
         )
-        self.position = match.end()
+        self.position += len(text)
         self.line = end_line
         self.column = end_column
 
         # note that we don't trim the buffer, in case a rewind is needed.
         return token
 
+    def skip(self, text):
+        """Advance past text at the current position without producing a token."""
+
+        self.position += len(text)
+        if self.tokens is not None:
+            return
+
+        end_line = self.line + text.count("\n")
+        if end_line > self.line:
+            self.column = len(text) - text.rindex("\n") - 1
+        else:
+            self.column += len(text)
+        self.line = end_line
+
     def rewind(self, token: Token):
         """Rewinds by one token.
 
@@ -224,6 +752,12 @@ class ReStream:
         object was the produce() call which returned the given token.
         """
 
+        if self.tokens is not None:
+            assert token == len(self.tokens) - 1
+            self.position = self.tokens.starts[-1] - self.base
+            self.tokens.pop()
+            return
+
         assert token.span.end == (self.line, self.column)
         self.line = token.span.start_line
         self.column = token.span.start_column
@@ -231,25 +765,148 @@ class ReStream:
 
     def produce_eof(self, symbol):
         """Produce an EOF token."""
-        return Token(
-            symbol,
-            None,
-            self.CHANNEL_ALL,
-            TextSpan(self.line, self.column, self.line, self.column),
-        )
+        if counters is not None:
+            counters.tokens[self.CHANNEL_ALL] += 1
+        if self.tokens is not None:
+            offset = self.base + self.position
+            return self.tokens.append(symbol, self.CHANNEL_ALL, offset, offset)
+        position = (self.line, self.column)
+        return Token(symbol, None, self.CHANNEL_ALL, TextSpan(*position, *position))
+
+    def token(self, token):
+        """Returns the Token for something returned by produce().
+
+        That's the token itself, unless the stream is compact.
+        """
+
+        if self.tokens is not None:
+            return self.tokens[token]
+        return token
+
+
+class Trivia:
+    def __init__(self, modes, whitespace=None, comment=None, nested=True):
+        """Declare trivia which a lexer skips over before each token.
+
+        'whitespace' should be a (pattern, token_type) tuple, and 'comment' an
+        (open, close, token_type) tuple of literal delimiters. If 'nested' is
+        true, comments may contain other comments. Trivia is only skipped when
+        the lexer is in one of the given modes, so that e.g. whitespace inside
+        a string is left alone.
+
+        Skipped trivia never reaches the parser. If the stream was created
+        with record_trivia=True, it is kept as hidden-channel tokens in the
+        stream's 'trivia' list instead.
+        """
+
+        self.modes = frozenset(modes)
+        self.whitespace = None
+        if whitespace is not None:
+            pattern, self.whitespace_type = whitespace
+            self.whitespace = re.compile(pattern)
+
+        self.comment_open = None
+        if comment is not None:
+            open_, close, self.comment_type = comment
+            self.comment_open = re.compile(re.escape(open_))
+            self.comment_open_text = open_
+            self.delimiters = re.compile(
+                f"(?P<open>{re.escape(open_)})|{re.escape(close)}"
+                if nested
+                else re.escape(close)
+            )
+
+    def skip(self, stream: ReStream, mode=None):
+        """Skips over any trivia at the current position of the stream.
+
+        'mode' is the lexer mode, which is only used to key the counters.
+        """
+
+        while True:
+            try:
+                stream.assure_buffer()
+            except StopIteration:
+                return
+
+            # Most tokens aren't preceded by trivia, so try to rule it out by
+            # looking at the buffer directly before doing a full match, which
+            # has to allow for the trivia continuing past the buffer's end.
+            text = stream.buffer
+            pos = stream.position
+            if self.whitespace is not None:
+                if counters is not None:
+                    counters.lexer_attempts[(mode, Counters.WHITESPACE)] += 1
+                m = self.whitespace.match(text, pos)
+                if m and m.end() == len(text):
+                    m = stream.match(self.whitespace)
+                if m:
+                    if counters is not None:
+                        counters.lexer_matches[(mode, self.whitespace_type)] += 1
+                    self.produce(stream, self.whitespace_type, m.group())
+                    continue
+            if self.comment_open is not None:
+                if counters is not None:
+                    counters.lexer_attempts[(mode, Counters.COMMENT)] += 1
+                if len(text) - pos >= len(self.comment_open_text):
+                    opened = text.startswith(self.comment_open_text, pos)
+                else:
+                    opened = stream.match(self.comment_open) is not None
+                if opened:
+                    if counters is not None:
+                        counters.lexer_matches[(mode, self.comment_type)] += 1
+                    self.skip_comment(stream)
+                    continue
+            return
+
+    def skip_comment(self, stream):
+        # Rather than lexing the comment a piece at a time, search for the
+        # next delimiter and keep count of how deeply nested we are. A partial
+        # match means a delimiter may straddle the end of the buffer.
+        start = stream.position
+        pos = start + len(self.comment_open_text)
+        depth = 1
+        while depth > 0:
+            text = stream.text()
+            m = self.delimiters.search(text, pos, partial=True)
+            if m is None or m.partial:
+                pos = len(text) if m is None else m.start()
+                try:
+                    stream.extend_buffer()
+                except StopIteration:
+                    text = stream.text()[start:]
+                    token = stream.token(stream.produce_text(self.comment_type, text))
+                    raise ParseError(f"Unterminated comment at {token.span}")
+                continue
+            depth += 1 if m.lastgroup == "open" else -1
+            pos = m.end()
+        self.produce(stream, self.comment_type, stream.text()[start:pos])
+
+    def produce(self, stream, token_type, text):
+        if stream.trivia is None:
+            stream.skip(text)
+        else:
+            token = stream.produce_text(token_type, text, ReStream.CHANNEL_HIDDEN)
+            stream.trivia.append(stream.token(token))
 
 
 class Lexer:
-    def __init__(self, eof, rules):
+    def __init__(self, eof, rules, combined=True, trivia=None):
         """Create a lexer callable.
 
         rules should be a list of tuples of one of the following forms:
           (pattern, token_type)
           (mode, pattern, token_type)
           (mode, pattern, token_type, channel)
+
+        If 'combined' is true, the rules for each mode are compiled into a
+        single regex, so that each token costs one match rather than one per
+        rule. Either way, the earliest rule which matches wins.
+
+        If 'trivia' is given, it is skipped over before each token is lexed.
         """
 
         self.eof = eof
+        self.trivia = trivia
         self.mode_rules = {}
         for mptc in rules:
             mode, channel = Parser.NORMAL_MODE, ReStream.CHANNEL_DEFAULT
@@ -262,19 +919,100 @@ class Lexer:
             rs = self.mode_rules.setdefault(mode, [])
             rs.append((re.compile(pattern), tt, channel))
 
+        self.combined = None
+        if combined:
+            self.combined = {
+                mode: _CombinedRules(rs) for mode, rs in self.mode_rules.items()
+            }
+
     def __call__(self, stream: ReStream, mode: int) -> Token:
+        if self.trivia is not None and mode in self.trivia.modes:
+            self.trivia.skip(stream, mode)
         try:
             stream.assure_buffer()
         except StopIteration:
             return stream.produce_eof(self.eof)
 
-        for regex, tt, channel in self.mode_rules[mode]:
-            m = stream.match(regex)
+        if self.combined is not None:
+            rules = self.combined[mode]
+            if counters is not None:
+                counters.lexer_attempts[(mode, Counters.COMBINED)] += 1
+            m = stream.match(rules.regex, rules.earlier)
             if m:
+                _, tt, channel = rules.rules[m.lastindex]
+                if counters is not None:
+                    counters.lexer_matches[(mode, tt)] += 1
                 return stream.produce(tt, m, channel)
+        else:
+            for regex, tt, channel in self.mode_rules[mode]:
+                if counters is not None:
+                    counters.lexer_attempts[(mode, tt)] += 1
+                m = stream.match(regex)
+                if m:
+                    if counters is not None:
+                        counters.lexer_matches[(mode, tt)] += 1
+                    return stream.produce(tt, m, channel)
         assert False, "no match!"  # TODO: proper exception
 
 
+class _CombinedRules:
+    """The rules for one lexer mode, compiled into a single regex.
+
+    Each rule becomes a named group in one big alternation. Since the regex
+    engine tries alternatives from left to right, the rules keep the same
+    priority they have when they are tried one at a time.
+    """
+
+    def __init__(self, rules):
+        self.patterns = [_scope_flags(regex.pattern) for regex, _, _ in rules]
+        self.regex = re.compile(
+            "|".join(f"(?P<_{k}>{p})" for k, p in enumerate(self.patterns))
+        )
+
+        # map group numbers back to rules, so that the rule can be found from
+        # the match's lastindex.
+        self.rules = [None] * (self.regex.groups + 1)
+        self.indices = [None] * (self.regex.groups + 1)
+        for k, rule in enumerate(rules):
+            group = self.regex.groupindex[f"_{k}"]
+            self.rules[group] = rule
+            self.indices[group] = k
+        self.prefixes = {}
+
+    def earlier(self, match):
+        """Returns a regex for the rules with priority over the given match.
+
+        The regex engine will prefer a complete match of a later alternative
+        over a partial match of an earlier one, so if the input is incomplete,
+        the caller has to check separately whether one of the earlier rules
+        might have matched given more input. Returns None if there are no
+        earlier rules.
+        """
+
+        k = self.indices[match.lastindex]
+        if k == 0:
+            return None
+        try:
+            return self.prefixes[k]
+        except KeyError:
+            prefix = re.compile("|".join(f"(?:{p})" for p in self.patterns[:k]))
+            self.prefixes[k] = prefix
+            return prefix
+
+
+def _scope_flags(pattern):
+    """Converts leading global inline flags into scoped flags.
+
+    Global flags like (?s) would apply to every alternative once the pattern
+    is combined with others, so (?s)foo becomes (?s:foo).
+    """
+
+    m = re.match(r"\(\?([a-zA-Z]+)\)", pattern)
+    if m is None:
+        return f"(?:{pattern})"
+    return f"(?{m.group(1)}:{pattern[m.end():]})"
+
+
 def _convert_lhs(lhs):
     if not isinstance(lhs, Symbol):
         return Symbol(lhs)
@@ -325,7 +1063,7 @@ class ExtendedSymbol(Symbol):
         return f"`{self.start}_{self.value!r}_{self.end}"
 
 
-@attr.s(slots=True, frozen=True, repr=False)
+@attr.s(slots=True, frozen=True, repr=False, cache_hash=True)
 class Rule:
     lhs = attr.ib(converter=_convert_lhs)
     rhs = attr.ib(converter=_convert_rhs)
@@ -334,6 +1072,10 @@ class Rule:
     mode = attr.ib(default=0)  # Parser.NORMAL_MODE
     pointer = attr.ib(default=None)
     parent = attr.ib(default=None)
+    # Called in place of make_node when the rule is reduced, if the parser is
+    # asked to use actions. It takes the span and the children of the
+    # reduction, and returns the value of the nonterminal.
+    action = attr.ib(default=None, cmp=False)
 
     def with_pointer(self, pointer):
         return attr.evolve(self, pointer=pointer)
@@ -374,27 +1116,33 @@ class ItemSet:
     def __init__(self, grammar, items):
         self.items = set(items)
 
-        # complete the itemset by repeatedly finding all of the productions
-        # which come after pointers in the set, and adding all the rules that
-        # produce them recursively.
-        while True:
-            old_size = len(self.items)
-            nexts = set(
-                s
-                for s in chain.from_iterable(r.next_symbols for r in self.items)
-                if not s.is_terminal
-            )
-            self.items.update(
-                grammar.rules[r].with_pointer(0)
-                for r in grammar.find_rule_indices(nexts)
-            )
-            if len(self.items) == old_size:
-                break
+        # complete the itemset by adding the productions for every nonterminal
+        # which comes after a pointer in the kernel. The grammar memoizes these
+        # (including the productions they lead to in turn), so the work is
+        # shared between all the itemsets that predict the same nonterminal.
+        nexts = set(
+            s
+            for s in chain.from_iterable(r.next_symbols for r in items)
+            if not s.is_terminal
+        )
+        for symbol in nexts:
+            self.items.update(grammar.predict(symbol))
+
+        # work out the kernels of the itemsets that follow this one, in a
+        # single pass over the items.
+        transitions = {}
+        for item in self.items:
+            symbols = item.next_symbols
+            if len(symbols) > 0:
+                advanced = item.advanced
+                for symbol in symbols:
+                    transitions.setdefault(symbol, []).append(advanced)
+        self.transitions = {s: frozenset(a) for s, a in transitions.items()}
 
     @property
     def next_symbols(self):
         """Gets a list of possible next symbols."""
-        return set(chain.from_iterable(r.next_symbols for r in self.items))
+        return set(self.transitions)
 
     def advance(self, symbol):
         """Advances the itemset by the given symbol.
@@ -402,9 +1150,7 @@ class ItemSet:
         Returns a frozenset of items where items which can be advanced by the
         given symbol have been, and items which cannot have been dropped.
         """
-        return frozenset(
-            item.advanced for item in self.items if symbol in item.next_symbols
-        )
+        return self.transitions.get(symbol, frozenset())
 
     @property
     def mode(self):
@@ -494,6 +1240,12 @@ class Grammar:
         self.rules = rules
         self.start_symbol = _convert_lhs(start_symbol)
         self.end_symbols = frozenset(_convert_lhs(s) for s in end_symbols)
+        self.predictions = {}
+
+        # index the rules by the symbol they produce
+        self.rules_by_lhs = {}
+        for k, rule in enumerate(self.rules):
+            self.rules_by_lhs.setdefault(rule.lhs, []).append(k)
 
     @property
     def symbols(self):
@@ -506,7 +1258,37 @@ class Grammar:
 
     def find_rule_indices(self, symbols):
         """Returns a list of rule indices which produce the given symbols."""
-        return [k for k, r in enumerate(self.rules) if r.lhs in symbols]
+        return sorted(
+            chain.from_iterable(self.rules_by_lhs.get(s, ()) for s in set(symbols))
+        )
+
+    def predict(self, symbol):
+        """Returns the items predicted by a nonterminal.
+
+        These are the items with the pointer at the start for every rule which
+        produces the symbol, plus those predicted in turn by the symbols at
+        the start of those rules, and so on. The result is memoized.
+        """
+
+        try:
+            return self.predictions[symbol]
+        except KeyError:
+            pass
+
+        items = set()
+        seen = {symbol}
+        todo = [symbol]
+        while len(todo) > 0:
+            for k in self.rules_by_lhs.get(todo.pop(), ()):
+                item = self.rules[k].with_pointer(0)
+                items.add(item)
+                for s in item.next_symbols:
+                    if not s.is_terminal and s not in seen:
+                        seen.add(s)
+                        todo.append(s)
+
+        result = self.predictions[symbol] = frozenset(items)
+        return result
 
     def find_starting_rule_index(self):
         """Finds the starting rule given the start symbol."""
@@ -527,30 +1309,63 @@ class Grammar:
         appear at the beginning of a given symbol.
         """
 
+        terminals, firstbits = self.build_firstbits()
+        return {s: _bits_to_set(b, terminals) for s, b in firstbits.items()}
+
+    def build_followsets(self):
+        """Builds the Follow sets for every extended symbol.
+
+        The Follow set is the set of all terminals which can grammatically
+        appear after the given symbol.
+        """
+
+        terminals, followbits = self.build_followbits()
+        return {s: _bits_to_set(b, terminals) for s, b in followbits.items()}
+
+    def number_terminals(self):
+        """Assigns a bit number to every terminal.
+
+        The terminals are those that can appear in First and Follow sets: the
+        parents of the terminal symbols, the end symbols, and EMPTY, which
+        always gets bit 0.
+        """
+
+        terminals = {s.parent for s in self.symbols if s.is_terminal}
+        terminals.update(s.parent for s in self.end_symbols)
+        terminals.discard(self.EMPTY)
+        return [self.EMPTY, *sorted(terminals, key=lambda s: _symbol_key(s.value))]
+
+    def build_firstbits(self):
+        """Builds the First sets for every extended symbol, as bitsets.
+
+        Returns a list of terminals and a dict of bitsets, where bit k of each
+        bitset stands for the k-th terminal. See build_firstsets().
+        """
+
         start_time = time.perf_counter()
-        firstsets = {}
+        terminals = self.number_terminals()
+        bits = {t: 1 << k for k, t in enumerate(terminals)}
+        empty = bits[self.EMPTY]
+        firstbits = {}
 
         # pre-populate with empty firstsets (for nonterminals) and identity
         # firstsets (for terminals)
         for sym in self.symbols:
-            if sym.is_terminal:
-                firstsets[sym] = {sym.parent}
-            else:
-                firstsets[sym] = set()
+            firstbits[sym] = bits[sym.parent] if sym.is_terminal else 0
 
         # 1. if V -> x, then First(V) contains x
         # 2. if V -> (), then First(V) contains ()
         nzrules = []
         for rule in self.rules:
             if len(rule.rhs) == 0:
-                firstsets[rule.lhs].add(self.EMPTY)
+                firstbits[rule.lhs] |= empty
                 continue
             for sym in rule.rhs[0]:
                 if sym.is_terminal:
-                    firstsets[rule.lhs].update(firstsets[sym])
-                else:
-                    # cache rules that rule 3 applies to in advance
-                    nzrules.append(rule)
+                    firstbits[rule.lhs] |= firstbits[sym]
+            if any(not sym.is_terminal for sym in rule.rhs[0]):
+                # cache rules that rule 3 applies to in advance
+                nzrules.append((rule.lhs, rule.rhs))
 
         # 3. if V -> A B C, then First(V) contains First(A) - (). If First(A)
         #    contains (), then First(V) also contains First(B), etc. If A, B,
@@ -563,52 +1378,56 @@ class Grammar:
         while updated:
             count += 1
             updated = False
-            for rule in nzrules:
-                # we know in advance that these rules begin with a nonterminal
-                # on the right-hand side, because they're the ones we cached
-                # when applied rules 1 & 2.
-                old_len = len(firstsets[rule.lhs])
-                for symbols in rule.rhs:
-                    fs = frozenset(chain.from_iterable(firstsets[s] for s in symbols))
-                    if self.EMPTY not in fs:
-                        firstsets[rule.lhs].update(fs)
+            for lhs, rhs in nzrules:
+                fs = 0
+                for symbols in rhs:
+                    alts = 0
+                    for s in symbols:
+                        alts |= firstbits[s]
+                    if not alts & empty:
+                        fs |= alts
                         break
-                    firstsets[rule.lhs].update(fs - {self.EMPTY})
+                    fs |= alts & ~empty
                 else:
-                    firstsets[rule.lhs].add(self.EMPTY)
-                if len(firstsets[rule.lhs]) > old_len:
+                    fs |= empty
+                if fs & ~firstbits[lhs]:
+                    firstbits[lhs] |= fs
                     updated = True
 
         end_time = time.perf_counter()
         elapsed_ms = (end_time - start_time) * 1000
         logger.debug(__("Built firstsets ({} cycles) in {:.2f}ms", count, elapsed_ms))
-        return firstsets
+        return terminals, firstbits
 
-    def build_followsets(self):
-        """Builds the Follow sets for every extended symbol.
+    def build_followbits(self):
+        """Builds the Follow sets for every extended symbol, as bitsets.
 
-        The Follow set is the set of all terminals which can grammatically
-        appear after the given symbol.
+        Returns a list of terminals and a dict of bitsets, where bit k of each
+        bitset stands for the k-th terminal. See build_followsets().
         """
 
-        firstsets = self.build_firstsets()
+        terminals, firstbits = self.build_firstbits()
         start_time = time.perf_counter()
-        followsets = {}
-
-        # pre-populate with empty followsets
-        for sym in self.symbols:
-            if sym == self.start_symbol:
-                followsets[sym] = {s.parent for s in self.end_symbols}
-            else:
-                followsets[sym] = set()
+        bits = {t: 1 << k for k, t in enumerate(terminals)}
+        followbits = dict.fromkeys(self.symbols, 0)
+        for s in self.end_symbols:
+            followbits[self.start_symbol] |= bits[s.parent]
 
         # suppose we have a rule R -> a*Db. Then we add First(b) to Follow(D).
+        tails = []
         for rule in self.rules:
             for k in range(len(rule.rhs) - 1):
+                fs = 0
+                for t in rule.rhs[k + 1]:
+                    fs |= firstbits[t]
                 for s in rule.rhs[k]:
                     if not s.is_terminal:
-                        for t in rule.rhs[k + 1]:
-                            followsets[s].update(firstsets[t])
+                        followbits[s] |= fs
+            if len(rule.rhs) > 0:
+                # empty rules don't tell us anything for the next pass
+                for s in rule.rhs[-1]:
+                    if not s.is_terminal:
+                        tails.append((rule.lhs, s))
 
         # suppose we have a rule R -> a*D. Then we add Follow(R) to Follow(D).
         # Because we can end up with irritating things like two follow sets
@@ -619,32 +1438,105 @@ class Grammar:
         while updated:
             count += 1
             updated = False
-            for rule in self.rules:
-
-                # empty rules don't tell us anything for this pass
-                if len(rule.rhs) == 0:
-                    continue
-
-                for s in rule.rhs[-1]:
-                    if not s.is_terminal:
-                        old_len = len(followsets[s])
-                        followsets[s].update(followsets[rule.lhs])
-                        if len(followsets[s]) > old_len:
-                            updated = True
+            for lhs, s in tails:
+                if followbits[lhs] & ~followbits[s]:
+                    followbits[s] |= followbits[lhs]
+                    updated = True
 
         end_time = time.perf_counter()
         elapsed_ms = (end_time - start_time) * 1000
         logger.debug(__("Build followsets ({} cycles) in {:.2f}ms", count, elapsed_ms))
-        return followsets
+        return terminals, followbits
+
+    def fingerprint(self, hidden=None, channel=ReStream.CHANNEL_DEFAULT):
+        """Computes a stable fingerprint of the grammar.
 
-    def build_parser(self, hidden=None, channel=ReStream.CHANNEL_DEFAULT):
+        The fingerprint covers the rules (including their precedences,
+        associativities and modes), the start and end symbols, the channel,
+        and the fingerprints of any hidden-channel grammars. Unlike hash(), it
+        does not vary between processes, so it can be used to key on-disk
+        caches.
+        """
+
+        rules = []
+        for rule in self.rules:
+            rhs = [sorted(_symbol_key(s.value) for s in syms) for syms in rule.rhs]
+            prec = None if rule.prec is None else int(rule.prec)
+            rules.append(
+                [_symbol_key(rule.lhs.value), rhs, prec, rule.rassoc, int(rule.mode)]
+            )
+        canonical = {
+            "version": TableCache.VERSION,
+            "start": _symbol_key(self.start_symbol.value),
+            "end": sorted(_symbol_key(s.value) for s in self.end_symbols),
+            "rules": rules,
+            "channel": channel,
+            "hidden": {
+                str(c): g.fingerprint(channel=c) for c, g in (hidden or {}).items()
+            },
+        }
+        encoded = json.dumps(canonical, sort_keys=True).encode("utf8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def build_parser(
+        self,
+        hidden=None,
+        channel=ReStream.CHANNEL_DEFAULT,
+        cache=None,
+        tables=None,
+        lookaheads="extended",
+    ):
+        """Builds a parser for the grammar.
+
+        'lookaheads' selects how the LALR(1) lookaheads are computed: either
+        "extended", from the follow sets of an extended grammar, or
+        "relations", from the DeRemer-Pennello relations on the LR(0)
+        automaton. Both produce the same tables, but the latter scales better
+        with the size of the grammar.
+
+        If 'tables' is given, it should be a module produced by
+        generate_module(). If it was generated from this grammar, the parser
+        is loaded from it directly.
+
+        If 'cache' is given, it should be a TableCache. The parser tables will
+        be loaded from it if the grammar has not changed since they were
+        stored; otherwise, they are rebuilt and the cache is rewritten.
+        """
+
+        if tables is not None or cache is not None:
+            fingerprint = self.fingerprint(hidden, channel)
+
+        if tables is not None:
+            if (
+                tables.VERSION == TableCache.VERSION
+                and tables.FINGERPRINT == fingerprint
+            ):
+                data = {"symbols": tables.SYMBOLS, "parser": tables.PARSER}
+                return unpack_parser(data, self, hidden)
+            logger.warning(__("Parser tables in {} are out of date", tables.__name__))
+
+        if cache is not None:
+            parser = cache.load(fingerprint, self, hidden)
+            if parser is not None:
+                return parser
+
+        parser = self._build_parser(hidden, channel, lookaheads)
+        if cache is not None:
+            cache.store(fingerprint, parser)
+        return parser
+
+    def _build_parser(self, hidden, channel, lookaheads="extended"):
         logger.debug(__("Grammar has {} rules", len(self.rules)))
 
         start_time_t = time.perf_counter()
         translation_table = TranslationTable(self)
-        extended_grammar = translation_table.build_extended_grammar()
         modes = translation_table.build_modes()
-        followsets = extended_grammar.build_followsets()
+        if lookaheads == "extended":
+            terminals, reductions = translation_table.build_extended_reductions()
+        elif lookaheads == "relations":
+            terminals, reductions = translation_table.build_relation_reductions()
+        else:
+            raise ValueError(f"unknown lookahead method {lookaheads!r}")
         start_time = time.perf_counter()
 
         # Build the action/goto table. This is what the parse function actually
@@ -664,36 +1556,23 @@ class Grammar:
             else:
                 agtable[(f, s.value)] = t  # goto
 
-        # construct the final sets by merging extended rules which are based on
+        # construct the final sets by merging the reductions which are based on
         # the same rule and have the same end point.
         finalset_rules = [None] * len(translation_table.itemsets)
-        finalset_followsets = [set() for _ in translation_table.itemsets]
-        for rule in extended_grammar.rules:
-            if len(rule.rhs) == 0:
-                # if the rule has no rhs, then the starting point is the same
-                # as the ending point.
-                final = rule.lhs.start
-            else:
-                finals = {s.end for s in rule.rhs[-1]}
-                assert len(finals) == 1
-                final = finals.pop()
-            if (
-                finalset_rules[final] is not None
-                and finalset_rules[final] != rule.parent
-            ):
+        finalset_followbits = [0] * len(translation_table.itemsets)
+        for final, rule, followbits in reductions:
+            if finalset_rules[final] is not None and finalset_rules[final] != rule:
                 # This is a reduce/reduce conflict. We decide how to resolve
                 # this based on the precedence of the rules involved.
                 # TODO work out how to handle ties?
                 # TODO check if this is sound. Somehow
                 if (
                     finalset_rules[final].prec is None
-                    or rule.parent.prec is None
-                    or finalset_rules[final].prec == rule.parent.prec
+                    or rule.prec is None
+                    or finalset_rules[final].prec == rule.prec
                 ):
                     conflicts.append(
-                        f"reduce/reduce:\n"
-                        f"  {finalset_rules[final]}\n"
-                        f"  {rule.parent}"
+                        f"reduce/reduce:\n" f"  {finalset_rules[final]}\n" f"  {rule}"
                     )
                     continue
 
@@ -701,18 +1580,23 @@ class Grammar:
                     __(
                         "Resolved reduce/reduce conflict between {} and {}",
                         finalset_rules[final],
-                        rule.parent,
+                        rule,
                     )
                 )
-                if finalset_rules[final].prec > rule.parent.prec:
+                if finalset_rules[final].prec > rule.prec:
                     continue
 
-            finalset_rules[final] = rule.parent
-            finalset_followsets[final].update(followsets[rule.lhs])
+                # The new rule wins, so the lookaheads gathered for the old
+                # one no longer apply. Dropping them makes the result
+                # independent of the order in which the rules are visited.
+                finalset_followbits[final] = 0
+
+            finalset_rules[final] = rule
+            finalset_followbits[final] |= followbits
 
         # add the merged reductions to the table
-        for k, followset in enumerate(finalset_followsets):
-            for symbol in followset:
+        for k, bits in enumerate(finalset_followbits):
+            for symbol in _bits_to_set(bits, terminals):
                 if (k, symbol.value) in agtable:
                     # This is a shift/reduce conflict. We decide how to resolve
                     # this based on the precedence of the rules involved.
@@ -770,11 +1654,16 @@ class Grammar:
 
         # build the hidden-channel parsers
         hidden_parsers = {
-            channel: aux_grammar.build_parser(channel=channel)
+            channel: aux_grammar.build_parser(channel=channel, lookaheads=lookaheads)
             for channel, aux_grammar in (hidden or {}).items()
         }
 
-        parser = Parser(agtable, modes, hidden_parsers, channel)
+        # Each state reduces by at most one rule, which is where its action
+        # (if any) comes from.
+        rule_index = {rule: i for i, rule in enumerate(self.rules)}
+        reductions = [-1 if r is None else rule_index[r] for r in finalset_rules]
+
+        parser = Parser(agtable, modes, hidden_parsers, channel, self, reductions)
         end_time = time.perf_counter()
         elapsed_ms = (end_time - start_time) * 1000
         elapsed_t_ms = (end_time - start_time_t) * 1000
@@ -800,6 +1689,7 @@ class TranslationTable:
     """A table of itemset/state transitions."""
 
     def __init__(self, grammar):
+        self.grammar = grammar
         self.end_symbols = grammar.end_symbols
         self.translation_table = {}
         self.itemsets = []
@@ -818,7 +1708,13 @@ class TranslationTable:
         # itemsets. We also build the translation table as we go
         current = 0
         while current < len(self.itemsets):
-            for symbol in self.itemsets[current].next_symbols:
+            # visit the symbols in a fixed order so that the states are
+            # numbered the same way from run to run.
+            next_symbols = sorted(
+                self.itemsets[current].next_symbols,
+                key=lambda s: _symbol_key(s.value),
+            )
+            for symbol in next_symbols:
                 key = self.itemsets[current].advance(symbol)
                 if key in self.itemset_index:
                     itemset = self.itemset_index[key]
@@ -831,7 +1727,14 @@ class TranslationTable:
 
         end_time = time.perf_counter()
         elapsed_ms = (end_time - start_time) * 1000
-        logger.debug(__("Built {} itemsets in {:.2f}ms", current, elapsed_ms))
+        logger.debug(
+            __(
+                "Built {} itemsets ({} predictions) in {:.2f}ms",
+                current,
+                len(grammar.predictions),
+                elapsed_ms,
+            )
+        )
 
     def items(self):
         return self.translation_table.items()
@@ -909,6 +1812,111 @@ class TranslationTable:
         )
         return extended_grammar
 
+    def build_extended_reductions(self):
+        """Finds the reductions and their lookaheads via an extended grammar.
+
+        Returns a list of terminals, and a list of (state, rule, lookaheads)
+        triples, where the lookaheads are a bitset over the terminals. A rule
+        may appear more than once for the same state, in which case its
+        lookaheads are the union of those given.
+        """
+
+        extended_grammar = self.build_extended_grammar()
+        terminals, followbits = extended_grammar.build_followbits()
+        reductions = []
+        for rule in extended_grammar.rules:
+            if len(rule.rhs) == 0:
+                # if the rule has no rhs, then the starting point is the same
+                # as the ending point.
+                final = rule.lhs.start
+            else:
+                finals = {s.end for s in rule.rhs[-1]}
+                assert len(finals) == 1
+                final = finals.pop()
+            reductions.append((final, rule.parent, followbits[rule.lhs]))
+        return terminals, reductions
+
+    def build_relation_reductions(self):
+        """Finds the reductions and their lookaheads via DeRemer-Pennello.
+
+        Instead of building an extended grammar, this works directly on the
+        nonterminal transitions of the LR(0) automaton. The lookaheads of a
+        transition (p, A) are the terminals which can directly follow A in the
+        items of p, plus the lookaheads of every transition (p', B) that it
+        "includes", i.e. where B -> b A and following b from p' leads to p. A
+        reduction by B -> b in state q has the lookaheads of every transition
+        (p', B) it "looks back" to, i.e. where following b from p' leads to q.
+        The includes relation is solved in linear time with Digraph.
+
+        The result is the same as build_extended_reductions(). In particular,
+        the follow sets there don't look through a nullable symbol; if one
+        comes next, the transition gets EMPTY (i.e. a default reduction)
+        instead, so there is no need for the "reads" relation here.
+        """
+
+        start_time = time.perf_counter()
+        grammar = self.grammar
+        terminals, firstbits = grammar.build_firstbits()
+        bits = {t: 1 << k for k, t in enumerate(terminals)}
+        goto = self.translation_table
+
+        def first(symbols):
+            result = 0
+            for s in symbols:
+                result |= firstbits[s]
+            return result
+
+        direct = {(p, s): 0 for (p, s) in goto if not s.is_terminal}
+        includes = {}
+        lookbacks = []
+        for origin_state, itemset in enumerate(self.itemsets):
+            for item in itemset.items:
+                if item.pointer != 0:
+                    continue
+                origin = (origin_state, item.lhs)
+                if origin not in direct:
+                    # the start rule is the only one without a goto
+                    assert item.lhs == grammar.start_symbol
+                    direct[origin] = 0
+                    for s in self.end_symbols:
+                        direct[origin] |= bits[s.parent]
+
+                # follow the rule through the automaton. Alternatives might
+                # lead to different states, so keep track of all of them.
+                states = {origin_state}
+                for k, symbols in enumerate(item.rhs):
+                    last = k == len(item.rhs) - 1
+                    follow = 0 if last else first(item.rhs[k + 1])
+                    targets = set()
+                    for state in states:
+                        for s in symbols:
+                            targets.add(goto[(state, s)])
+                            if s.is_terminal:
+                                continue
+                            elif last:
+                                includes.setdefault((state, s), []).append(origin)
+                            else:
+                                direct[(state, s)] |= follow
+                    states = targets
+
+                rule = item.with_pointer(None)
+                lookbacks.extend((state, rule, origin) for state in states)
+
+        followbits = _digraph(list(direct), includes, direct)
+        reductions = [(q, rule, followbits[o]) for q, rule, o in lookbacks]
+
+        end_time = time.perf_counter()
+        elapsed_ms = (end_time - start_time) * 1000
+        logger.debug(
+            __(
+                "Built lookaheads ({} transitions, {} reductions) in {:.2f}ms",
+                len(direct),
+                len(reductions),
+                elapsed_ms,
+            )
+        )
+        return terminals, reductions
+
     def build_modes(self):
         """Builds the lexer mode table.
 
@@ -920,15 +1928,188 @@ class TranslationTable:
         return [s.mode for s in self.itemsets]
 
 
+class ParseTable:
+    """A dense, integer-indexed form of an action/goto table.
+
+    Symbols are numbered by the order of their keys, as in pack_parser(), and
+    each state has a row with one column per symbol. The cells hold packed
+    action codes, or -1 if there is no action. Since a lookup is then just a
+    multiply and an add, the parser never has to hash a (state, symbol) tuple.
+    """
+
+    NO_ACTION = -1
+
+    def __init__(self, agtable, state_count):
+        self.symbols = _table_symbols(agtable)
+        self.width = len(self.symbols)
+        self.symbol_ids = {v: i for i, v in enumerate(self.symbols)}
+        self.empty_id = self.symbol_ids[Grammar.EMPTY_TOKEN]
+        index = {_symbol_key(v): i for i, v in enumerate(self.symbols)}
+        self.actions = array.array("l", [self.NO_ACTION]) * (state_count * self.width)
+        for (state, sym), action in agtable.items():
+            cell = state * self.width + self.symbol_ids[sym]
+            self.actions[cell] = _pack_action(action, index)
+
+        # If a state has an action for the empty token, it is taken whenever
+        # no other action applies to the lookahead terminal.
+        for state in range(state_count):
+            row = state * self.width
+            default = self.actions[row + self.empty_id]
+            if default == self.NO_ACTION:
+                continue
+            assert default & 3 == ACTION_REDUCE
+            for sym_id, sym in enumerate(self.symbols):
+                if _is_terminal_value(sym) and self.actions[row + sym_id] < 0:
+                    self.actions[row + sym_id] = default
+
+
+class CompressedTable:
+    """A compressed form of a ParseTable.
+
+    Three things are done to shrink the table. First, each state gets a
+    default reduction, which is its most common reduce action; the cells
+    holding it are dropped from the row, and it is taken whenever the row has
+    no entry for the lookahead. Second, states whose remaining rows are the
+    same share a single row, so all of the states with nothing but a default
+    (or nothing at all) share one. Third, the rows are packed into one pair of
+    arrays by row displacement: each row is given a base offset such that its
+    entries don't collide with those of any other row, and the 'check' array
+    records which row each cell belongs to.
+
+    States with no shifts and a default reduction of a non-empty rule are
+    marked as reduce-only; the parser can reduce in them without knowing what
+    the lookahead is.
+
+    Tables are built by compress(). Packing the rows is the slow part, so the
+    resulting arrays are stored along with the rest of the parser tables by
+    pack_parser(), and passed straight back to the constructor on loading.
+    """
+
+    NO_ACTION = ParseTable.NO_ACTION
+
+    def __init__(self, symbols, defaults, reduce_only, rows, base, check, value):
+        self.width = len(symbols)
+        self.symbols = symbols
+        self.symbol_ids = {v: i for i, v in enumerate(symbols)}
+        self.empty_id = self.symbol_ids[Grammar.EMPTY_TOKEN]
+        self.defaults = defaults
+        self.reduce_only = reduce_only
+        self.rows = rows
+        self.base = base
+        self.check = check
+        self.value = value
+
+    @classmethod
+    def compress(cls, table):
+        """Builds a compressed table from a ParseTable."""
+
+        state_count = len(table.actions) // table.width
+        terminals = [_is_terminal_value(sym) for sym in table.symbols]
+        defaults = array.array("l", [cls.NO_ACTION]) * state_count
+        reduce_only = bytearray(state_count)
+        rows = array.array("l", [0]) * state_count
+        row_ids = {}
+        for state in range(state_count):
+            cells = table.actions[state * table.width : (state + 1) * table.width]
+            counts = collections.Counter(
+                code for code in cells if code >= 0 and code & 3 == ACTION_REDUCE
+            )
+            default = cells[table.empty_id]
+            if default == cls.NO_ACTION and counts:
+                default = counts.most_common(1)[0][0]
+            entries = tuple(
+                (sym_id, code)
+                for sym_id, code in enumerate(cells)
+                if code >= 0 and code != default
+            )
+            defaults[state] = default
+            rows[state] = row_ids.setdefault(entries, len(row_ids))
+            if default >= 0 and default >> 18 > 0:
+                reduce_only[state] = not any(terminals[s] for s, _ in entries)
+
+        # Pack the rows, largest first, each at the first offset where it fits.
+        base_offsets = array.array("l", [0]) * len(row_ids)
+        check = array.array("l")
+        value = array.array("l")
+        for entries, row in sorted(row_ids.items(), key=lambda kv: -len(kv[0])):
+            base = 0
+            while any(
+                base + s < len(check) and check[base + s] >= 0 for s, _ in entries
+            ):
+                base += 1
+            base_offsets[row] = base
+            for sym_id, code in entries:
+                cell = base + sym_id
+                if cell >= len(check):
+                    grow = cell + 1 - len(check)
+                    check.extend([cls.NO_ACTION] * grow)
+                    value.extend([cls.NO_ACTION] * grow)
+                check[cell] = row
+                value[cell] = code
+
+        # Any symbol can be looked up in any row without going off the end.
+        grow = max(base_offsets, default=0) + table.width - len(check)
+        check.extend([cls.NO_ACTION] * grow)
+        value.extend([cls.NO_ACTION] * grow)
+
+        logger.debug(
+            __(
+                "Compressed {} parse table cells into {} ({} rows for {} states)",
+                len(table.actions),
+                len(check),
+                len(row_ids),
+                state_count,
+            )
+        )
+        return cls(
+            table.symbols, defaults, reduce_only, rows, base_offsets, check, value
+        )
+
+    def action(self, state, sym_id):
+        """Returns the packed action code for a state and symbol id."""
+
+        row = self.rows[state]
+        cell = self.base[row] + sym_id
+        if self.check[cell] == row:
+            return self.value[cell]
+        return self.defaults[state]
+
+
 class Parser:
     NORMAL_MODE = 0
     INHERIT_MODE = -1
 
-    def __init__(self, agtable, modes, hidden, channel):
+    def __init__(
+        self, agtable, modes, hidden, channel, grammar, reductions, table=None
+    ):
         self.agtable = agtable
         self.modes = modes
         self.hidden = hidden
         self.channel = channel
+        self.grammar = grammar
+        self.reductions = reductions
+        if table is None:
+            table = CompressedTable.compress(ParseTable(agtable, len(modes)))
+        self.table = table
+        self.actions = [None if r < 0 else grammar.rules[r].action for r in reductions]
+        self.no_actions = [None] * len(reductions)
+
+        # the terminals each state has an action for, which are listed when
+        # there's a syntax error, and used to find a state to recover in.
+        symbol_ids = self.table.symbol_ids
+        expected = [[] for _ in modes]
+        for (state, sym), action in agtable.items():
+            if isinstance(action, tuple) and not isinstance(sym, Special):
+                expected[state].append(sym)
+        self.expected = [sorted(e, key=str) for e in expected]
+        self.expected_ids = [frozenset(symbol_ids[t] for t in e) for e in expected]
+
+        # States whose default reduction comes from the grammar, rather than
+        # from compressing the table, take it for any lookahead.
+        self.empty_defaults = bytearray(len(modes))
+        for (state, sym), action in agtable.items():
+            if sym == Grammar.EMPTY_TOKEN:
+                self.empty_defaults[state] = True
 
     def select_mode(self, set_stack):
         return next(
@@ -940,13 +2121,11 @@ class Parser:
             self.NORMAL_MODE,
         )
 
-    def next_token_skip_hidden(self, stream, next_token, set_stack):
+    def next_token_skip_hidden(self, stream, next_token, mode, view):
         while True:
-            lookahead = next_token(stream, self.select_mode(set_stack))
-            if (
-                lookahead.channel == self.channel
-                or lookahead.channel == ReStream.CHANNEL_ALL
-            ):
+            lookahead = next_token(stream, mode)
+            channel = view.channel(lookahead)
+            if channel == self.channel or channel == ReStream.CHANNEL_ALL:
                 return lookahead
 
             # When a token comes in on a channel other than the one we're
@@ -954,11 +2133,16 @@ class Parser:
             # consumes the input. This is useful for things like comments,
             # which can show up anywhere -- handling them in the main grammar
             # would be impossible.
+            if channel not in self.hidden:
+                token = view.token(lookahead)
+                raise ParseError(f"Unexpected {token.t} at {token.span}")
             stream.rewind(lookahead)
-            p = self.hidden[lookahead.channel]
+            if counters is not None:
+                counters.hidden_parses[channel] += 1
+            p = self.hidden[channel]
             p(stream, next_token, lambda t, s, c, m: None)
 
-    def __call__(self, stream, next_token, make_node):
+    def __call__(self, stream, next_token, make_node, actions=False, recover=None):
         """Parses a given input.
 
         This method may be called multiple times and does not modify the
@@ -966,70 +2150,275 @@ class Parser:
 
         'next_token' must be a callable which takes two arguments: the
         'stream', and an int for the mode, which is 0 initially. It must return
-        a Token.
+        whatever the stream's produce() methods return, i.e. a Token, or the
+        index of one if the stream is compact.
 
         'make_node' must be a callable, which is called every time a reduction
         is performed. It is passed three arguments: the nonterminal being
         reduced, a span covering the tokens involved in the reduction, and an
         iterable of the children of the reduction, which are a mix of Tokens
-        and values returned from make_node.
+        (CompactTokens if the stream is compact) and values returned from
+        make_node.
+
+        If 'actions' is true, reductions by a rule with an action attached
+        call the action instead of make_node. It is passed the span and the
+        children of the reduction.
+
+        If 'recover' is given, it should be a collection of token types to
+        resynchronize on after a syntax error, such as the keywords which
+        begin statements. Parsing then continues past errors, and a
+        ParseError listing all of them is raised at the end.
+        """
+
+        try:
+            parse = self.iterate(
+                stream, next_token, make_node, actions=actions, recover=recover
+            )
+            next(parse)
+        except StopIteration as stop:
+            return stop.value
+        assert False, "yielded without a sequence"
+
+    def sequence_states(self, sequence):
+        """Returns a flag for each state, set if it continues a sequence.
+
+        A sequence is a nonterminal defined by right-recursive rules such as
+        'sequence -> element sequence'. After an element has been reduced, the
+        parser goes to a state which expects the rest of the sequence. If
+        'sequence' is None, no state is flagged.
+        """
+
+        flags = bytearray(len(self.modes))
+        if sequence is None:
+            return flags
+        for (state, sym), action in self.agtable.items():
+            if sym == sequence and not isinstance(action, tuple):
+                flags[state] = True
+        return flags
+
+    def error_state(self, defaulted, state, la):
+        """Returns the state a syntax error should be reported in.
+
+        'defaulted' lists the states where default reductions were taken
+        before the error was found in 'state'. The first of them which has no
+        action for the lookahead is where a parser with an uncompressed table
+        would have stopped, unless the grammar gave it a default reduction,
+        which that parser would have taken too.
+        """
+
+        for s in defaulted:
+            if not self.empty_defaults[s] and la not in self.expected_ids[s]:
+                return s
+        return state
+
+    def syntax_error(self, state, token):
+        msg = [f"Got {token.t} at {token.span} but expected one of:"]
+        msg.extend(f"  {t}" for t in self.expected[state])
+        return ParseError("\n".join(msg))
+
+    def recover(
+        self, stream, next_token, mode, view, set_stack, output, lookahead, sync, skip
+    ):
+        """Resynchronizes the parser after a syntax error.
+
+        Tokens are discarded, starting from the lookahead (or the one after it
+        if 'skip' is true), until one with a type in 'sync' is found. States
+        are then popped off the stack until one which expects that token, and
+        it becomes the new lookahead. If no state expects it, it is discarded
+        as well and the search continues. Returns None if the input runs out
+        first.
+        """
+
+        symbol_ids = self.table.symbol_ids
+        while True:
+            if skip:
+                if view.channel(lookahead) == ReStream.CHANNEL_ALL:
+                    return None
+                lookahead = self.next_token_skip_hidden(stream, next_token, mode, view)
+            skip = True
+            t = view.type(lookahead)
+            la = symbol_ids.get(t)
+            if t in sync:
+                for depth in range(len(set_stack), 0, -1):
+                    if la in self.expected_ids[set_stack[depth - 1]]:
+                        del set_stack[depth:]
+                        del output[depth - 1 :]
+                        return lookahead
+
+    def iterate(
+        self,
+        stream,
+        next_token,
+        make_node,
+        sequence=None,
+        actions=False,
+        recover=None,
+    ):
+        """Parses a given input, yielding the elements of a sequence.
+
+        This works like calling the parser, but every time an element of the
+        given 'sequence' nonterminal (see sequence_states()) is reduced, the
+        value returned from make_node is yielded as soon as it is complete,
+        rather than once the whole input has been parsed. The element is then
+        replaced with None in the parser's output, so that it can be freed
+        once the caller is done with it. The final value is returned when the
+        generator finishes.
+
+        'actions' and 'recover' are as for calling the parser.
         """
 
         start_time = time.perf_counter()
+        table = self.table
+        defaults = table.defaults
+        reduce_only = table.reduce_only
+        rows = table.rows
+        base = table.base
+        check = table.check
+        value = table.value
+        symbols = table.symbols
+        symbol_ids = table.symbol_ids
+        empty_id = table.empty_id
+        rule_actions = self.actions if actions else self.no_actions
+        stats = counters
+        elements = self.sequence_states(sequence)
+
+        # Each entry in the output is (value, start, end, shifted), where
+        # start and end are the positions of the value in the text, and
+        # shifted is true if the value came straight from the stream.
         output = []
         set_stack = [0]
-        lookahead = self.next_token_skip_hidden(stream, next_token, set_stack)
-
-        while True:
-            try:
-                action, sym, arg = self.agtable[(set_stack[-1], lookahead.t)]
-            except KeyError:
-                try:
-                    action, sym, arg = self.agtable[
-                        (set_stack[-1], Grammar.EMPTY_TOKEN)
-                    ]
-                    assert action == "reduce"
-                except KeyError:
-                    msg = [f"Got {lookahead.t} but expected one of:"]
-                    for state, token in self.agtable:
-                        if state == set_stack[-1]:
-                            msg.append(f"  {token}")
-                    raise ParseError("\n".join(msg))
-
-            if action == "shift":
-                output.append((lookahead, lookahead.span))
-                set_stack.append(arg)
-                lookahead = self.next_token_skip_hidden(stream, next_token, set_stack)
-            elif action == "reduce":
-                if arg > 0:
-                    children, spans = zip(*output[-arg:])
-                    span = TextSpan.cover(spans)
-                    del output[-arg:]
-                    del set_stack[-arg:]
+        errors = []
+        failures = []  # errors raised by make_node or an action
+        recovering = False
+        view = _token_view(stream)
+
+        # The lookahead is only fetched once a state needs it, so reduce-only
+        # states are passed through without calling the lexer. The mode it
+        # will be lexed in is worked out when the previous token is shifted,
+        # since the stack may have changed by the time it is fetched.
+        mode = self.select_mode(set_stack)
+        lookahead = None
+        la = empty_id
+
+        # The states where the lookahead was checked and a default reduction
+        # was taken since the last shift. The lookahead may turn out to be an
+        # error which the defaults hid, in which case it's reported against
+        # the first of these which didn't expect it.
+        defaulted = []
+
+        with _pinned(stream, output):
+            while True:
+                state = set_stack[-1]
+                if reduce_only[state]:
+                    code = defaults[state]
                 else:
-                    children = []
-                    # Since we are reducing an empty rule, we know by [vigorous
-                    # handwaving] that the lack-of-tokens we're trying to
-                    # reduce is bounded on the left by the last item in the
-                    # output stack (if present) and on the right by the
-                    # lookahead token. Note that this approach may result in
-                    # the span corresponding to a block of whitespace or a
-                    # comment.
-                    end = lookahead.span.start
-                    if len(output) > 0:
-                        start = output[-1][1].end
+                    if lookahead is None:
+                        lookahead = self.next_token_skip_hidden(
+                            stream, next_token, mode, view
+                        )
+                        la = symbol_ids.get(view.type(lookahead), empty_id)
+                    row = rows[state]
+                    cell = base[row] + la
+                    if check[cell] == row:
+                        code = value[cell]
                     else:
-                        start = end
-                    span = TextSpan(*start, *end)
-                set_stack.append(self.agtable[(set_stack[-1], sym)])
-                output.append(
-                    (make_node(sym, span, children, self.modes[set_stack[-1]]), span)
-                )
-            else:
-                assert action == "accept"
-                break
+                        code = defaults[state]
+                        defaulted.append(state)
+
+                if code < 0:
+                    state = self.error_state(defaulted, state, la)
+                    defaulted.clear()
+                    if recover is None:
+                        raise self.syntax_error(state, view.token(lookahead))
+                    if not recovering:
+                        # Only the first error of a cascade is reported.
+                        errors.append(self.syntax_error(state, view.token(lookahead)))
+                    # The tree is going to be thrown away, and the actions
+                    # might not cope with the pieces recovery leaves.
+                    rule_actions = self.no_actions
+                    # If nothing was shifted since the last error, then
+                    # resuming at this token didn't work, so it has to be
+                    # dropped.
+                    lookahead = self.recover(
+                        stream,
+                        next_token,
+                        mode,
+                        view,
+                        set_stack,
+                        output,
+                        lookahead,
+                        recover,
+                        skip=recovering,
+                    )
+                    recovering = True
+                    if lookahead is None:
+                        break
+                    la = symbol_ids.get(view.type(lookahead), empty_id)
+                    mode = self.select_mode(set_stack)
+                    continue
+
+                kind = code & 3
+                if kind == ACTION_SHIFT:
+                    recovering = False
+                    if stats is not None:
+                        stats.shifts[view.type(lookahead)] += 1
+                    start, end = view.bounds(lookahead)
+                    output.append((lookahead, start, end, True))
+                    set_stack.append(code >> 2)
+                    mode = self.select_mode(set_stack)
+                    lookahead = None
+                    defaulted.clear()
+                elif kind == ACTION_REDUCE:
+                    if stats is not None:
+                        rule = self.grammar.rules[self.reductions[state]]
+                        stats.reductions[rule] += 1
+                    arg = code >> 2
+                    lhs = arg & 0xFFFF
+                    count = arg >> 16
+                    sym = symbols[lhs]
+                    if count > 0:
+                        entries = output[-count:]
+                        start = entries[0][1]
+                        end = entries[-1][2]
+                        children = view.children(entries)
+                        del output[-count:]
+                        del set_stack[-count:]
+                    else:
+                        children = []
+                        start, end = _empty_bounds(output, lookahead, view)
+                    span = view.span(start, end)
+                    row = rows[set_stack[-1]]
+                    target = value[base[row] + lhs] >> 2
+                    set_stack.append(target)
+                    action = rule_actions[state]
+                    try:
+                        node = (
+                            make_node(sym, span, children, self.modes[target])
+                            if action is None
+                            else action(span, children)
+                        )
+                    except Exception as e:
+                        node = _defer_error(e, recover, failures)
+                        rule_actions = self.no_actions
+                    if elements[target]:
+                        yield node
+                        node = None
+                    output.append((node, start, end, False))
+                else:
+                    assert kind == ACTION_ACCEPT
+                    break
 
+        # An error raised while building the tree only matters if the input
+        # parsed, just as if the tree were built after parsing.
+        self.finish(errors or failures, start_time)
         assert len(output) == 1
+        return output[0][0]
+
+    def finish(self, errors, start_time):
+        """Raises the errors found by a parse, if any, or logs its time."""
+
+        if len(errors) > 0:
+            raise _combine_errors(errors)
 
         end_time = time.perf_counter()
         elapsed_ms = (end_time - start_time) * 1000
@@ -1037,4 +2426,538 @@ class Parser:
             logger.debug(
                 __("Parsed input on channel {} in {:.2f}ms", self.channel, elapsed_ms)
             )
-        return output[0][0]
+
+
+def _empty_bounds(output, lookahead, view):
+    # Since we are reducing an empty rule, we know by [vigorous handwaving]
+    # that the lack-of-tokens we're trying to reduce is bounded on the left by
+    # the last item in the output stack (if present) and on the right by the
+    # lookahead token. Note that this approach may result in the span
+    # corresponding to a block of whitespace or a comment. Empty reductions
+    # are never reduce-only, so the lookahead has always been fetched by now.
+    end = view.bounds(lookahead)[0]
+    if len(output) > 0:
+        start = output[-1][2]
+    else:
+        start = end
+    return start, end
+
+
+class _TokenView:
+    """The parser's view of the tokens produced by a stream.
+
+    Positions are (line, column) tuples, taken from the spans of the tokens.
+    """
+
+    def type(self, token):
+        return token.t
+
+    def channel(self, token):
+        return token.channel
+
+    def bounds(self, token):
+        span = token.span
+        return span.start, span.end
+
+    def token(self, token):
+        return token
+
+    def span(self, start, end):
+        return TextSpan(*start, *end)
+
+    def children(self, entries):
+        return [entry[0] for entry in entries]
+
+
+class _CompactTokenView:
+    """The parser's view of the token indices produced by a compact stream.
+
+    Positions are offsets, and only turned into lines and columns once a span
+    is looked at. A CompactToken is only made for a token which is looked at.
+    """
+
+    def __init__(self, stream):
+        self.tokens = stream.tokens
+        self.lines = stream.lines
+        self.symbols = stream.tokens.symbols
+        self.types = stream.tokens.types
+        self.channels = stream.tokens.channels
+        self.starts = stream.tokens.starts
+        self.ends = stream.tokens.ends
+
+    def type(self, index):
+        return self.symbols[self.types[index - self.tokens.first]]
+
+    def channel(self, index):
+        return self.channels[index - self.tokens.first]
+
+    def bounds(self, index):
+        k = index - self.tokens.first
+        return self.starts[k], self.ends[k]
+
+    def token(self, index):
+        return self.tokens[index]
+
+    def span(self, start, end):
+        return OffsetSpan(self.lines, start, end)
+
+    def children(self, entries):
+        return _Children(entries, self.tokens)
+
+
+_plain_token_view = _TokenView()
+
+
+def _token_view(stream):
+    if stream.tokens is None:
+        return _plain_token_view
+    return _CompactTokenView(stream)
+
+
+class _Children(collections.abc.Sequence):
+    """The children of a reduction, made into Tokens as they're looked at."""
+
+    __slots__ = ("entries", "tokens")
+
+    def __init__(self, entries, tokens):
+        self.entries = entries
+        self.tokens = tokens
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[k] for k in range(*index.indices(len(self.entries)))]
+        value, start, end, shifted = self.entries[index]
+        return self.tokens.token(value, start, end) if shifted else value
+
+    def __iter__(self):
+        tokens = self.tokens
+        for value, start, end, shifted in self.entries:
+            yield tokens.token(value, start, end) if shifted else value
+
+
+@contextlib.contextmanager
+def _pinned(stream, output):
+    """Keeps the text of the tokens in the parser's output in the buffer.
+
+    A compact stream reads the text of a token from its buffer when the token
+    is looked at, so it mustn't be trimmed away while a token is still in the
+    output of this parser, or of the parser this one was called from.
+    """
+
+    if stream.tokens is None:
+        yield
+        return
+
+    outer = stream.pin
+
+    def pin():
+        if outer is not None:
+            start = outer()
+            if start is not None:
+                return start
+        return next((start for _, start, _, shifted in output if shifted), None)
+
+    stream.pin = pin
+    try:
+        yield
+    finally:
+        stream.pin = outer
+
+
+def _defer_error(error, recover, failures):
+    # When recovering, an error raised while building the tree is held back
+    # so that any syntax errors can be found, and the rest of the tree is
+    # built with make_node.
+    if recover is None:
+        raise error
+    failures.append(error)
+    return None
+
+
+def _combine_errors(errors):
+    if len(errors) == 1:
+        return errors[0]
+    msg = "\n\n".join(str(e) for e in errors)
+    return ParseError(f"{len(errors)} syntax errors:\n\n{msg}", errors=errors)
+
+
+class TableCache:
+    """An on-disk cache of generated parser tables.
+
+    Each cache file holds the tables for one parser and its hidden-channel
+    parsers, along with the fingerprint of the grammar they were built from.
+    If the fingerprint doesn't match, the cache is considered stale.
+    """
+
+    VERSION = 4
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+
+    @classmethod
+    def default(cls, name):
+        """Returns the default cache for the parser with the given name.
+
+        The cache file is kept in $JEFF65_CACHE_DIR if it is set, and in the
+        user's cache directory otherwise. If JEFF65_CACHE_DIR is set to the
+        empty string, caching is disabled and None is returned.
+        """
+
+        directory = os.environ.get("JEFF65_CACHE_DIR")
+        if directory == "":
+            return None
+        elif directory is None:
+            base = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+            directory = pathlib.Path(base) / "jeff65"
+        return cls(pathlib.Path(directory) / f"{name}.parser.json")
+
+    def load(self, fingerprint, grammar, hidden=None):
+        """Loads a parser from the cache.
+
+        'grammar' must be the grammar the parser was built from, and 'hidden'
+        its hidden-channel grammars; they are used to map the symbols and
+        rules in the cache file back to the originals. Returns None if the
+        cache is missing, unreadable, or stale.
+        """
+
+        start_time = time.perf_counter()
+        try:
+            with open(self.path, "r", encoding="utf8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get("version") != self.VERSION:
+            logger.debug(__("Parser cache {} has wrong version", self.path))
+            return None
+        if data.get("fingerprint") != fingerprint:
+            logger.debug(__("Parser cache {} is stale", self.path))
+            return None
+
+        try:
+            parser = unpack_parser(data, grammar, hidden)
+        except (KeyError, IndexError, TypeError, ValueError):
+            logger.debug(__("Parser cache {} is corrupt", self.path))
+            return None
+
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        logger.debug(__("Loaded parser from {} in {:.2f}ms", self.path, elapsed_ms))
+        return parser
+
+    def store(self, fingerprint, parser):
+        """Stores a parser in the cache.
+
+        The file is replaced atomically, so concurrent processes will never
+        see a partially-written cache. Failure to write the cache is not an
+        error, since the parser can always be rebuilt.
+        """
+
+        data = {"version": self.VERSION, "fingerprint": fingerprint}
+        data.update(pack_parser(parser))
+        tmp = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=str(self.path.parent), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf8") as f:
+                json.dump(data, f)
+            os.replace(tmp, str(self.path))
+        except OSError as e:
+            logger.debug(__("Could not write parser cache {}: {}", self.path, e))
+            if tmp is not None and os.path.exists(tmp):
+                os.unlink(tmp)
+        else:
+            logger.debug(__("Wrote parser cache {}", self.path))
+
+
+def _digraph(nodes, relation, initial):
+    """Solves F(x) = initial[x] | F(y) for every y related to x.
+
+    This is the Digraph algorithm from DeRemer and Pennello, which finds the
+    strongly-connected components of the relation with Tarjan's algorithm, so
+    every node is visited once. The values are bitsets.
+    """
+
+    infinity = len(nodes) + 1
+    depth = dict.fromkeys(nodes, 0)
+    result = dict(initial)
+    stack = []
+
+    for root in nodes:
+        if depth[root] != 0:
+            continue
+        stack.append(root)
+        depth[root] = len(stack)
+        frames = [(root, len(stack), iter(relation.get(root, ())))]
+        while len(frames) > 0:
+            x, d, successors = frames[-1]
+            for y in successors:
+                if depth[y] == 0:
+                    # descend into y; we'll come back to x's successors later
+                    stack.append(y)
+                    depth[y] = len(stack)
+                    frames.append((y, len(stack), iter(relation.get(y, ()))))
+                    break
+                depth[x] = min(depth[x], depth[y])
+                result[x] |= result[y]
+            else:
+                frames.pop()
+                if depth[x] == d:
+                    # x is the root of a strongly-connected component, all of
+                    # which shares the same value.
+                    while True:
+                        top = stack.pop()
+                        depth[top] = infinity
+                        result[top] = result[x]
+                        if top == x:
+                            break
+                if len(frames) > 0:
+                    parent = frames[-1][0]
+                    depth[parent] = min(depth[parent], depth[x])
+                    result[parent] |= result[x]
+
+    return result
+
+
+def _bits_to_set(bits, symbols):
+    """Returns the set of symbols whose bits are set in the given bitset."""
+    result = set()
+    while bits:
+        low = bits & -bits
+        result.add(symbols[low.bit_length() - 1])
+        bits ^= low
+    return result
+
+
+def _symbol_key(value):
+    """Returns a stable string representation of a symbol value."""
+    if isinstance(value, str):
+        return f"n:{value}"
+    elif isinstance(value, Special):
+        return f"${value.name}"
+    elif isinstance(value, enum.Enum):
+        return f"t:{type(value).__name__}.{value.name}"
+    return f"t:{value!r}"
+
+
+def _table_symbols(agtable):
+    """Returns the symbols of an action/goto table, sorted by their keys.
+
+    This is the numbering used by ParseTable and CompressedTable: the symbols
+    of the table's entries and reductions, plus the empty token.
+    """
+
+    values = {_symbol_key(Grammar.EMPTY_TOKEN): Grammar.EMPTY_TOKEN}
+    for (_, sym), action in agtable.items():
+        values[_symbol_key(sym)] = sym
+        if isinstance(action, tuple) and action[1] is not None:
+            values[_symbol_key(action[1])] = action[1]
+    return [values[k] for k in sorted(values)]
+
+
+def _is_terminal_value(value):
+    # we represent bare nonterminals as strings
+    return not isinstance(value, str)
+
+
+def _symbol_lookup(grammar):
+    """Maps the symbol keys of a grammar back to the symbol values."""
+    values = chain(
+        (s.value for s in grammar.symbols),
+        (s.value for s in grammar.end_symbols),
+        [Grammar.EMPTY_TOKEN, Grammar.END],
+    )
+    return {_symbol_key(v): v for v in values}
+
+
+# Packed action codes. The low two bits hold the kind of action, and the rest
+# hold its argument: the target state for gotos and shifts, or the length of
+# the rule and the index of the nonterminal being reduced for reductions.
+ACTION_GOTO = 0
+ACTION_SHIFT = 1
+ACTION_REDUCE = 2
+ACTION_ACCEPT = 3
+
+
+def _pack_action(action, index):
+    if not isinstance(action, tuple):
+        return action << 2 | ACTION_GOTO
+    kind, lhs, arg = action
+    if kind == "shift":
+        return arg << 2 | ACTION_SHIFT
+    elif kind == "reduce":
+        return (arg << 16 | index[_symbol_key(lhs)]) << 2 | ACTION_REDUCE
+    assert kind == "accept"
+    return ACTION_ACCEPT
+
+
+def _unpack_action(code, symbols):
+    kind, arg = code & 3, code >> 2
+    if kind == ACTION_GOTO:
+        return arg
+    elif kind == ACTION_SHIFT:
+        return ("shift", None, arg)
+    elif kind == ACTION_REDUCE:
+        return ("reduce", symbols[arg & 0xFFFF], arg >> 16)
+    return ("accept", None, None)
+
+
+def _parser_symbol_keys(parser):
+    keys = set()
+    for (_, sym), action in parser.agtable.items():
+        keys.add(_symbol_key(sym))
+        if isinstance(action, tuple) and action[1] is not None:
+            keys.add(_symbol_key(action[1]))
+    for p in parser.hidden.values():
+        keys.update(_parser_symbol_keys(p))
+    return keys
+
+
+def pack_parser(parser):
+    """Packs the tables of a parser into plain data.
+
+    The result contains only lists, strings and integers, so it can be written
+    out as JSON or as a Python literal. Symbols are numbered by their position
+    in the "symbols" list, which is sorted so that the result is the same from
+    run to run.
+
+    The compressed table is included as well, so that it doesn't have to be
+    rebuilt on loading. Its action codes number the symbols of each parser
+    separately, as ParseTable does, rather than by the "symbols" list.
+    """
+
+    symbols = sorted(_parser_symbol_keys(parser))
+    index = {k: i for i, k in enumerate(symbols)}
+    return {"symbols": symbols, "parser": _pack_tables(parser, index)}
+
+
+# The arrays of a CompressedTable, which are stored in the packed tables.
+_TABLE_ARRAYS = ["defaults", "reduce_only", "rows", "base", "check", "value"]
+
+
+def _pack_tables(parser, index):
+    entries = sorted(
+        (state, index[_symbol_key(sym)], _pack_action(action, index))
+        for (state, sym), action in parser.agtable.items()
+    )
+    return {
+        "channel": parser.channel,
+        "modes": [int(m) for m in parser.modes],
+        "reductions": list(parser.reductions),
+        "actions": list(chain.from_iterable(entries)),
+        "table": {name: list(getattr(parser.table, name)) for name in _TABLE_ARRAYS},
+        "hidden": [
+            [c, _pack_tables(p, index)] for c, p in sorted(parser.hidden.items())
+        ],
+    }
+
+
+def unpack_parser(data, grammar, hidden=None):
+    """Reconstructs a parser from the output of pack_parser.
+
+    'grammar' must be the grammar the parser was built from, and 'hidden' its
+    hidden-channel grammars; they are used to map the symbols and rules back
+    to the originals.
+    """
+
+    hidden = hidden or {}
+    lookup = _symbol_lookup(grammar)
+    for g in hidden.values():
+        lookup.update(_symbol_lookup(g))
+    symbols = [lookup[k] for k in data["symbols"]]
+    return _unpack_tables(data["parser"], symbols, grammar, hidden)
+
+
+def _unpack_tables(data, symbols, grammar, grammars):
+    actions = data["actions"]
+    agtable = {}
+    for k in range(0, len(actions), 3):
+        state, sym, code = actions[k : k + 3]
+        agtable[(state, symbols[sym])] = _unpack_action(code, symbols)
+    reductions = list(data["reductions"])
+    if any(r >= len(grammar.rules) for r in reductions):
+        raise IndexError("rule index out of range")
+    hidden = {
+        c: _unpack_tables(p, symbols, grammars[c], grammars) for c, p in data["hidden"]
+    }
+    modes = list(data["modes"])
+    table = _unpack_table(data["table"], agtable, len(modes))
+    return Parser(agtable, modes, hidden, data["channel"], grammar, reductions, table)
+
+
+def _unpack_table(data, agtable, state_count):
+    table = CompressedTable(
+        _table_symbols(agtable),
+        array.array("l", data["defaults"]),
+        bytearray(data["reduce_only"]),
+        array.array("l", data["rows"]),
+        array.array("l", data["base"]),
+        array.array("l", data["check"]),
+        array.array("l", data["value"]),
+    )
+    # The parser indexes these without bounds checks of its own.
+    if any(
+        len(a) != state_count for a in [table.defaults, table.reduce_only, table.rows]
+    ):
+        raise ValueError("compressed table has the wrong number of states")
+    if any(not 0 <= r < len(table.base) for r in table.rows):
+        raise IndexError("compressed table row out of range")
+    if len(table.value) != len(table.check) or (
+        max(table.base, default=0) + table.width > len(table.check)
+    ):
+        raise IndexError("compressed table base out of range")
+    return table
+
+
+def generate_module(parser, fingerprint, source):
+    """Generates the source of a Python module holding the parser tables.
+
+    'source' names the module the grammar was defined in, and is only used in
+    the header comment. The generated module can be passed back to
+    Grammar.build_parser as 'tables'.
+    """
+
+    packed = pack_parser(parser)
+    lines = [
+        "# jeff65 generated parser tables",
+        f"# Generated from {source} by `jeff65 gen-parser`. Do not edit.",
+        "",
+        f"VERSION = {TableCache.VERSION}",
+        f"FINGERPRINT = {json.dumps(fingerprint)}",
+        "",
+        "SYMBOLS = [",
+    ]
+    lines.extend(f"    {json.dumps(k)}," for k in packed["symbols"])
+    lines.append("]")
+    lines.append("")
+    lines.append("PARSER = " + _format_tables(packed["parser"], 0))
+    return "\n".join(lines) + "\n"
+
+
+def _format_tables(data, indent):
+    i = " " * indent
+    lines = ["{"]
+    lines.append(f'{i}    "channel": {data["channel"]},')
+    for name in ["modes", "reductions", "actions"]:
+        lines.extend(_format_list(name, data[name], indent + 4))
+    lines.append(f'{i}    "table": {{')
+    for name in _TABLE_ARRAYS:
+        lines.extend(_format_list(name, data["table"][name], indent + 8))
+    lines.append(f"{i}    }},")
+    lines.append(f'{i}    "hidden": [')
+    for c, p in data["hidden"]:
+        lines.append(f"{i}        [{c}, {_format_tables(p, indent + 8)}],")
+    lines.append(f"{i}    ],")
+    lines.append(f"{i}}}")
+    return "\n".join(lines)
+
+
+def _format_list(name, values, indent):
+    i = " " * indent
+    lines = [f'{i}"{name}": [']
+    for line in textwrap.wrap(", ".join(str(v) for v in values), 84 - indent):
+        lines.append(f"{i}    {line}")
+    lines.append(f"{i}],")
+    return lines
@@ -76,7 +76,7 @@ def transform(order):
                 m_dict[member] = value
             else:
                 _, pattern, template = value
-                if isinstance(pattern, ast.AstNode):
+                if isinstance(pattern, (ast.AstNode, ast.AstSequence)):
                     predicates = pattern.transform(analyser)
                 else:
                     # do the non-recursive transform
@@ -102,7 +102,7 @@ def transform_handler(self, t, node):
         if predicate._match(node, captures):
             f = template.__get__(self, type)
             n = f(**captures)
-            if isinstance(n, ast.AstNode) and n.span is None:
+            if isinstance(n, (ast.AstNode, ast.AstSequence)) and n.span is None:
                 return attr.evolve(n, span=node.span)
             return n
     return node
@@ -136,13 +136,27 @@ class PatternAnalyser:
                 exhaustive = v
             else:
                 pas[k] = self.make_predicate(v)
-        keys = set(pas.keys())
+        keys = tuple(pas.keys())
+        keyset = frozenset(keys)
+        predicates = tuple(pas.values())
 
         def _attrs_predicate(attrs, captures):
-            if exhaustive and set(attrs.keys()) != keys:
+            if type(attrs) is not ast.NodeAttrs:
+                attrs = ast.NodeAttrs.create(attrs)
+            schema = attrs.schema
+            if exhaustive and schema.keyset != keyset:
                 return False
-            for k, v in pas.items():
-                if not v._match(attrs[k], captures):
+            positions = schema.positions(keys)
+            if positions is None:
+                # an attribute is missing, which raises KeyError unless an
+                # earlier one fails to match.
+                for k, v in zip(keys, predicates):
+                    if not v._match(attrs[k], captures):
+                        return False
+                return True
+            values = attrs._values
+            for n, v in zip(positions, predicates):
+                if not v._match(values[n], captures):
                     return False
             return True
 
@@ -151,7 +165,23 @@ class PatternAnalyser:
     def transform_enter(self, t, node):
         return node
 
+    def make_items_predicate(self, items):
+        pis = [self.make_predicate(v) for v in items]
+
+        def _items_predicate(items, captures):
+            if len(items) != len(pis):
+                return False
+            return all(p._match(v, captures) for p, v in zip(pis, items))
+
+        return Predicate(None, _items_predicate)
+
     def transform_exit(self, t, node):
+        if isinstance(node, ast.AstSequence):
+            return Predicate.sequence(
+                self.make_predicate(node.t),
+                self.make_items_predicate(node.items),
+                self.make_span_predicate(node.span),
+            )
         return Predicate.node(
             self.make_predicate(node.t),
             self.make_attrs_predicate(node.attrs),
@@ -202,6 +232,36 @@ class Predicate:
 
         return cls(key, _node_predicate)
 
+    @classmethod
+    def sequence(cls, pt, pi, pn, key=None):
+        def _sequence_predicate(seq, captures):
+            return (
+                isinstance(seq, ast.AstSequence)
+                and pt._match(seq.t, captures)
+                and pi._match(seq.items, captures)
+                and pn._match(seq.span, captures)
+            )
+
+        return cls(key, _sequence_predicate)
+
+    @classmethod
+    def each(cls, pattern, key=None):
+        """Matches a sequence's items if every one of them matches 'pattern'.
+
+        Captures made by 'pattern' are discarded, since there would be one
+        for each item.
+        """
+
+        if isinstance(pattern, (ast.AstNode, ast.AstSequence)):
+            predicate = pattern.transform(PatternAnalyser())
+        else:
+            predicate = PatternAnalyser().make_predicate(pattern)
+
+        def _p_each(items, captures):
+            return all(predicate._match(v, {}) for v in items)
+
+        return cls(key, _p_each)
+
     @classmethod
     def require(cls, value_or_predicate, exc=None):
         exc = exc or MatchError
@@ -1,3 +1,4 @@
+import attr
 import io
 import sys
 import pytest
@@ -11,7 +12,10 @@ def parse(source):
     with io.StringIO(source) as s:
         ast = gold.parse(s, "<test>")
         print(ast.pretty())
-        return ast
+    # the tree built by the reduction actions must match the Simplify pass
+    with io.StringIO(source) as s:
+        assert gold.parse(s, "<test>", actions=False).pretty() == ast.pretty()
+    return ast
 
 
 def test_empty_file():
@@ -486,7 +490,11 @@ def test_fun_call_empty():
     a = parse("let a: u8 = foo()")
     assert a.select("toplevels", "stmt", "value") == [
         ast.AstNode(
-            "call", {"target": ast.AstNode("identifier", {"name": "foo"}), "args": None}
+            "call",
+            {
+                "target": ast.AstNode("identifier", {"name": "foo"}),
+                "args": ast.AstNode.make_sequence("alist", "arg", []),
+            },
         )
     ]
 
@@ -550,7 +558,15 @@ def test_return_empty():
 def test_fun_def_void_empty():
     a = parse("fun foo() endfun")
     assert a.select("toplevels", "stmt") == [
-        ast.AstNode("fun", {"name": "foo", "args": None, "return": None, "body": None})
+        ast.AstNode(
+            "fun",
+            {
+                "name": "foo",
+                "args": None,
+                "return": None,
+                "body": ast.AstNode.make_sequence("block", "stmt", []),
+            },
+        )
     ]
 
 
@@ -658,3 +674,229 @@ def test_assign():
             },
         )
     ]
+
+
+class CountingPass(ast.TranslationPass):
+    def __init__(self):
+        self.events = []
+
+    def transform_enter(self, t, node):
+        self.events.append(("enter", t))
+        return node
+
+    def transform_exit(self, t, node):
+        self.events.append(("exit", t))
+        if t == "numeric" and node.attrs["value"] == 2:
+            return node.update_attrs({"value": 3})
+        return node
+
+
+def test_transform_order():
+    a = parse("fun foo() a = 2 endfun")
+    p = CountingPass()
+    b = a.transform(p)
+    assert p.events[:4] == [
+        ("enter", "unit"),
+        ("enter", "toplevel"),
+        ("enter", "fun"),
+        ("enter", "block"),
+    ]
+    assert p.events[-2:] == [("exit", "toplevel"), ("exit", "unit")]
+    assert b.select("toplevels", "stmt", "body", "stmt", "rvalue") == [
+        ast.AstNode("numeric", {"value": 3})
+    ]
+
+
+def test_transform_untouched_nodes_reused():
+    a = parse("use mem\nfun foo() a = 2 endfun")
+    b = a.transform(CountingPass())
+    use_a, fun_a = a.select("toplevels", "stmt")
+    use_b, fun_b = b.select("toplevels", "stmt")
+    assert use_a is use_b
+    assert fun_a is not fun_b
+    (set_a,) = fun_a.select("body", "stmt")
+    (set_b,) = fun_b.select("body", "stmt")
+    assert set_a.attrs["lvalue"] is set_b.attrs["lvalue"]
+
+
+def test_transform_long_sequence():
+    count = 100000
+    stmts = [ast.AstNode("numeric", {"value": k % 4}) for k in range(count)]
+    seq = ast.AstNode.make_sequence("block", "stmt", stmts)
+    result = seq.transform(CountingPass())
+    values = [s.attrs["value"] for s in result.select("stmt")]
+    assert values == [3 if k % 4 == 2 else k % 4 for k in range(count)]
+
+
+def test_sequence_cons():
+    numbers = [ast.AstNode("numeric", {"value": k}) for k in range(3)]
+    seq = ast.AstSequence("alist", "arg", ())
+    for n in reversed(numbers):
+        seq = ast.AstSequence.cons(n, seq)
+    assert len(seq) == 3
+    assert seq[1] is numbers[1]
+    assert list(seq) == numbers
+    assert seq == ast.AstNode.make_sequence("alist", "arg", numbers)
+    assert seq != ast.AstNode.make_sequence("block", "stmt", numbers)
+
+
+class DropAndSplice(ast.TranslationPass):
+    def exit_numeric(self, node):
+        value = node.attrs["value"]
+        if value == 0:
+            return None
+        if value == 1:
+            return ast.AstNode.make_sequence(
+                "block", "stmt", [node.update_attrs({"value": 10}), node]
+            )
+        return node
+
+
+def test_transform_sequence_drops_and_splices():
+    stmts = [ast.AstNode("numeric", {"value": k}) for k in range(3)]
+    seq = ast.AstNode.make_sequence("block", "stmt", stmts)
+    result = seq.transform(DropAndSplice())
+    assert [n.attrs["value"] for n in result] == [10, 1, 2]
+    assert result[2] is stmts[2]
+
+
+def test_sequence_pretty():
+    seq = ast.AstNode.make_sequence(
+        "alist", "arg", [ast.AstNode("numeric", {"value": 7}), 8]
+    )
+    assert seq.pretty(no_position=True) == "\n".join(
+        ["alist", ":arg numeric", "     :value 7", ":arg 8"]
+    )
+
+
+def test_sequence_pattern():
+    from jeff65 import pattern
+    from jeff65.pattern import Predicate as P
+
+    @pattern.transform(pattern.Order.Any)
+    class SwapPairs:
+        @pattern.match(ast.AstSequence("alist", "arg", [P("a"), P("b")]))
+        def swap(self, a, b):
+            return ast.AstSequence("alist", "arg", [b, a])
+
+    one, two = ast.AstNode("numeric", {"value": 1}), ast.AstNode("string")
+    pair = ast.AstNode.make_sequence("alist", "arg", [one, two])
+    assert list(pair.transform(SwapPairs())) == [two, one]
+    triple = ast.AstNode.make_sequence("alist", "arg", [one, two, one])
+    assert triple.transform(SwapPairs()) is triple
+
+
+@pytest.fixture
+def interner():
+    with ast.interning() as interner:
+        yield interner
+
+
+def test_interning_disabled_by_default():
+    assert ast.interner is None
+    n = ast.AstNode("numeric", {"value": 1})
+    assert n is not ast.AstNode("numeric", {"value": 1})
+    assert hash(n) == hash(ast.AstNode("numeric", {"value": 1}))
+
+
+def test_interning_scoped():
+    with ast.interning() as outer:
+        with ast.interning() as inner:
+            assert ast.interner is inner
+        assert ast.interner is outer
+        ast.AstNode("numeric", {"value": 1})
+    assert ast.interner is None
+    assert len(outer) == 1 and len(inner) == 0
+
+
+def test_interning_shares_nodes(interner):
+    def make():
+        storage = ast.AstNode("immediate_storage", {"value": 1, "width": 1})
+        return ast.AstNode("lda", {"size": 2, "storage": storage})
+
+    a = make()
+    assert make() is a
+    assert make().update_attrs({"size": 3}) is not a
+    assert interner.hits == 4
+    assert len(interner) == 3
+
+
+def test_interning_keeps_spans(interner):
+    span = parsing.TextSpan(2, 0, 2, 5)
+    a = ast.AstNode("numeric", {"value": 1})
+    b = attr.evolve(a, span=span)
+    assert b is not a and b.span == span
+    assert ast.AstNode("numeric", {"value": 1}, span) is not b
+    # a node is only shared if none of its children have a position either
+    c = ast.AstNode("negate", {"rhs": b})
+    assert ast.AstNode("negate", {"rhs": b}) is not c
+    seq = ast.AstSequence("alist", "arg", [a])
+    assert ast.AstNode("call", {"args": seq}) is ast.AstNode("call", {"args": seq})
+    assert len(interner) == 2
+
+
+def test_interning_unhashable(interner):
+    a = ast.AstNode("string_inner", {"value": ["a"]})
+    assert a is not ast.AstNode("string_inner", {"value": ["a"]})
+    assert len(interner) == 0
+
+
+def test_interning_parse(interner):
+    # nodes from the parser all have spans, so they're never shared
+    first, second = parse("let a: u8 = 1\nlet b: u8 = 1").select(
+        "toplevels", "stmt", "value"
+    )
+    assert first == second and first is not second
+    assert second.span.start_line == 2
+    (again,) = parse("\n\nlet b: u8 = 1").select("toplevels", "stmt", "value")
+    assert again.span.start_line == 3
+
+
+def test_node_attrs_schema_shared():
+    a = ast.AstNode("immediate_storage", {"width": 1, "value": 2})
+    b = ast.AstNode("absolute_storage", {"value": 0xD800, "width": 1})
+    assert a.attrs.schema is b.attrs.schema
+    assert a.attrs.schema.keys == ("value", "width")
+    assert list(a.attrs.values()) == [2, 1]
+    assert list(a.attrs.items()) == [("value", 2), ("width", 1)]
+    assert a.attrs == {"value": 2, "width": 1}
+
+
+def test_node_attrs_update():
+    a = ast.AstNode("identifier", {"name": "a"})
+    b = a.update_attrs({"name": "b"})
+    assert b.attrs.schema is a.attrs.schema
+    c = b.update_attrs({"type": "u8"})
+    assert dict(c.attrs) == {"name": "b", "type": "u8"}
+    assert c.attrs.get("type") == "u8" and c.attrs.get("size") is None
+    assert "type" not in a.attrs
+    with pytest.raises(KeyError):
+        a.attrs["type"]
+
+
+class BasePass(ast.TranslationPass):
+    def enter_numeric(self, node):
+        return node.update_attrs({"value": node.attrs["value"] + 1})
+
+    def exit_numeric(self, node):
+        return node.update_attrs({"value": node.attrs["value"] * 2})
+
+
+class DerivedPass(BasePass):
+    def exit_numeric(self, node):
+        return node.update_attrs({"value": -node.attrs["value"]})
+
+    def enter__hook(self, node):
+        return node
+
+
+def test_dispatch_table():
+    assert set(BasePass._enter) == {"numeric"}
+    assert set(BasePass._exit) == {"numeric"}
+    assert ast.TranslationPass._enter == {}
+    assert set(DerivedPass._enter) == {"numeric"}
+    n = ast.AstNode("numeric", {"value": 1})
+    assert BasePass().transform_enter("numeric", n).attrs["value"] == 2
+    assert DerivedPass().transform_exit("numeric", n).attrs["value"] == -1
+    assert DerivedPass().transform_enter("string", n) is n
+    assert DerivedPass().transform_exit("string", n) is n
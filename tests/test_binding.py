@@ -90,3 +90,9 @@ class ScopedTransform(RuleBasedStateMachine):
 
 
 TestScopedPass = ScopedTransform.TestCase
+
+
+def test_scope_hooks_not_dispatched():
+    assert set(binding.ScopedPass._enter) == {"unit", "fun"}
+    assert set(binding.ScopedPass._exit) == {"unit", "fun"}
+    assert "_scope" not in binding.ShadowNames._exit
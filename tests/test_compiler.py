@@ -1,6 +1,8 @@
 import io
 import pathlib
+import pytest
 import sys
+from jeff65 import parsing, pattern
 from jeff65.blum import types
 from jeff65.gold import compiler
 
@@ -41,3 +43,187 @@ def test_compile_simple():
     assert sym.data == b"\x60"
     assert len(sym.relocations) == 0
     assert sym.type_info == types.FunctionType(types.void)  # noqa: E721
+
+
+def test_parse_compact():
+    source = (
+        'use mem\nconstant s: &u8 = "a\\"b" /* c */\nfun f()\n  let x: u8 = 2\nendfun\n'
+    )
+    expected = compiler.parse(io.StringIO(source), "<test>")
+    tree = compiler.parse(io.StringIO(source), "<test>", compact=True)
+    assert tree == expected
+    assert tree.pretty() == expected.pretty()
+
+
+@pytest.mark.parametrize(
+    "source",
+    ["fun f(\n", "let x: u8 = \nlet y: u8 = 2\nlet = 3\n", "use mem /* x"],
+)
+def test_parse_compact_errors(source):
+    with pytest.raises(parsing.ParseError) as expected:
+        compiler.parse(io.StringIO(source), "<test>")
+    with pytest.raises(parsing.ParseError) as exc:
+        compiler.parse(io.StringIO(source), "<test>", compact=True)
+    assert str(exc.value) == str(expected.value)
+
+
+actions_source = """let mut a: [u8; 0 to 4] = [1, 2]
+let c: u8 = f(-(2 * 3), "x\\"y", @a.b)
+let stash p: &u8 = a[0] == 0x10 bitand 0b11
+isr irq
+  return
+endisr
+fun g() -> u8
+endfun
+fun h()
+  for i: u8 in 0 to 4 do
+  end
+  if 0o7 then
+  elseif 1 then
+  else
+  end
+endfun
+"""
+
+
+def test_parse_actions_match_simplify():
+    tree = compiler.parse(io.StringIO(actions_source), "<test>")
+    expected = compiler.parse(io.StringIO(actions_source), "<test>", actions=False)
+    assert tree == expected
+    assert tree.pretty() == expected.pretty()
+
+
+def test_parse_actions_assign_error():
+    source = "fun f()\n  a += 1\nendfun\n"
+    with pytest.raises(pattern.MatchError):
+        compiler.parse(io.StringIO(source), "<test>")
+    with pytest.raises(pattern.MatchError):
+        compiler.parse(io.StringIO(source), "<test>", actions=False)
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "let a: u8 = = 1\nlet b: u8 = 0xZZ\nlet c: u8 = = 2\n",
+        "fun f()\n  a += 1\nendfun\nlet b: u8 = = 1\n",
+        "let b: u8 = 0xZZ\nfun f()\n  a += 1\nendfun\n",
+    ],
+)
+def test_parse_actions_errors_while_recovering(source):
+    # errors from the actions are only reported if there are no syntax errors
+    with pytest.raises(Exception) as expected:
+        compiler.parse(io.StringIO(source), "<test>", actions=False)
+    with pytest.raises(Exception) as exc:
+        compiler.parse(io.StringIO(source), "<test>")
+    assert type(exc.value) is type(expected.value)
+    assert str(exc.value) == str(expected.value)
+
+
+reparse_source = """use mem
+constant x: u8 = 1
+/* a comment */
+fun f()
+  let a: u8 = 2
+endfun
+constant y: u8 = x + 3
+"""
+
+
+def test_parse_toplevels():
+    expected = compiler.parse(io.StringIO(reparse_source), "<test>")
+    stmts = list(compiler.parse_toplevels(io.StringIO(reparse_source), "<test>"))
+    assert stmts == compiler._toplevel_stmts(expected)
+    assert [s.span for s in stmts] == [
+        s.span for s in compiler._toplevel_stmts(expected)
+    ]
+
+
+def test_parse_toplevels_streams():
+    # the statements before the syntax error are produced before it's found
+    source = "use mem\nfun f()\nendfun\nconstant"
+    stmts = compiler.parse_toplevels(io.StringIO(source), "<test>")
+    assert next(stmts).t == "use"
+    assert next(stmts).t == "fun"
+    with pytest.raises(parsing.ParseError):
+        next(stmts)
+
+
+def test_parse_toplevels_empty():
+    assert list(compiler.parse_toplevels(io.StringIO(""), "<test>")) == []
+
+
+def edit_source(source, old, new):
+    offset = source.index(old)
+
+    def position(offset):
+        line = source.count("\n", 0, offset) + 1
+        return (line, offset - source.rfind("\n", 0, offset) - 1)
+
+    span = parsing.TextSpan(*position(offset), *position(offset + len(old)))
+    text = source[:offset] + new + source[offset + len(old) :]
+    return text, parsing.TextEdit(span, new)
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        ("2", "23"),
+        ("= 2", "= 2 + 1\n  let b: u8 = 4"),
+        ("1\n", "1\nconstant z: u8 = 5\n"),
+        ("/* a comment */", ""),
+        ("/* a comment */", "/* a\nlonger\ncomment */"),
+        ("1\n", "1 + 1\n"),
+        ("endfun\n", ""),
+        ("constant y", "let stash y"),
+        ("use mem\n", ""),
+        ("x + 3\n", "x + 3 constant w: u8 = 6"),
+    ],
+)
+@pytest.mark.parametrize("compact", [False, True])
+def test_reparse_matches_parse(old, new, compact):
+    tree = compiler.parse(io.StringIO(reparse_source), "test", compact=compact)
+    text, edit = edit_source(reparse_source, old, new)
+    try:
+        expected = compiler.parse(io.StringIO(text), "test").pretty()
+    except parsing.ParseError:
+        with pytest.raises(parsing.ParseError):
+            compiler.reparse(tree, text, edit)
+    else:
+        assert compiler.reparse(tree, text, edit).pretty() == expected
+
+
+def test_reparse_reuses_statements():
+    tree = compiler.parse(io.StringIO(reparse_source), "test", compact=True)
+    old_stmts = compiler._toplevel_stmts(tree)
+    old_line = old_stmts[3].span.start_line
+    text, edit = edit_source(reparse_source, "= 2", "= 2\n  let b: u8 = 4")
+    new_tree = compiler.reparse(tree, text, edit)
+    new_stmts = compiler._toplevel_stmts(new_tree)
+    assert new_stmts[0] is old_stmts[0]
+    assert new_stmts[1] is old_stmts[1]
+    assert new_stmts[2] is not old_stmts[2]
+    assert new_stmts[3] is old_stmts[3]
+    assert new_stmts[3].span.start_line == old_line + 1
+
+
+@pytest.mark.parametrize("max_edits", [2, 64])
+def test_reparse_successive_edits(monkeypatch, max_edits):
+    monkeypatch.setattr(compiler, "_MAX_EDITS", max_edits)
+    edits = [
+        ("= 2", "= 2\n  let b: u8 = 4"),
+        ("use mem", "use mem\nuse io"),
+        ("endfun", "  let c: u8 = 1\n\nendfun"),
+        ("/* a comment */", "/* a\ncomment */\nconstant z: u8 = 0"),
+        ("let b: u8 = 4", "let b: u8 = 45"),
+        ("constant x", "constant xx"),
+    ]
+    source = reparse_source
+    tree = compiler.parse(io.StringIO(source), "test", compact=True)
+    last = compiler._toplevel_stmts(tree)[-1]
+    for old, new in edits:
+        source, edit = edit_source(source, old, new)
+        tree = compiler.reparse(tree, source, edit)
+        expected = compiler.parse(io.StringIO(source), "test")
+        assert tree.pretty() == expected.pretty()
+    # the last statement is only reused if the tree was never reparsed whole
+    assert (compiler._toplevel_stmts(tree)[-1] is last) == (max_edits > len(edits))
@@ -0,0 +1,84 @@
+import io
+import pytest
+from jeff65 import dfa, parsing
+
+
+def lex(rules, text, mode=parsing.Parser.NORMAL_MODE, blocksize=4096):
+    lexer = dfa.DfaLexer("EOF", rules)
+    stream = parsing.ReStream(io.BytesIO(text.encode("utf8")), blocksize=blocksize)
+    tokens = []
+    with stream:
+        while True:
+            token = lexer(stream, mode)
+            if token.t == "EOF":
+                return tokens
+            tokens.append((token.t, token.text))
+
+
+keyword_rules = [
+    (r"(?m)fun(?=\s|$)", "FUN"),
+    (r"\w+", "ID"),
+    (r"\s+", "WS"),
+    (r"(?s).", "MYSTERY"),
+]
+
+
+@pytest.mark.parametrize("blocksize", [1, 2, 4096])
+def test_maximal_munch(blocksize):
+    assert lex(keyword_rules, "fun funny fun", blocksize=blocksize) == [
+        ("FUN", "fun"),
+        ("WS", " "),
+        ("ID", "funny"),
+        ("WS", " "),
+        ("FUN", "fun"),
+    ]
+
+
+def test_unmentioned_characters():
+    assert lex(keyword_rules, "xé !") == [
+        ("ID", "xé"),
+        ("WS", " "),
+        ("MYSTERY", "!"),
+    ]
+
+
+def test_lazy_rule_is_shortest():
+    rules = [(r'(?s).*?(?=")', "TEXT"), (r'"', "DELIM")]
+    assert lex(rules, 'ab"cd"') == [
+        ("TEXT", "ab"),
+        ("DELIM", '"'),
+        ("TEXT", "cd"),
+        ("DELIM", '"'),
+    ]
+
+
+def test_empty_token_skipped():
+    rules = [(r"a*(?=b)", "AS"), (r".", "OTHER")]
+    assert lex(rules, "aab b") == [
+        ("AS", "aa"),
+        ("OTHER", "b"),
+        ("OTHER", " "),
+        ("OTHER", "b"),
+    ]
+
+
+def test_modes_and_channels():
+    rules = [("a", "A"), (1, "a", "HIDDEN_A", parsing.ReStream.CHANNEL_HIDDEN)]
+    lexer = dfa.DfaLexer("EOF", rules)
+    with parsing.ReStream(io.StringIO("aa")) as stream:
+        assert lexer(stream, 0).channel == parsing.ReStream.CHANNEL_DEFAULT
+        token = lexer(stream, 1)
+        assert token.t == "HIDDEN_A"
+        assert token.channel == parsing.ReStream.CHANNEL_HIDDEN
+
+
+def test_minimized():
+    machine = dfa.Dfa([("ab|cb", "X", 0)])
+    # start, after 'a' or 'c', after 'b'
+    assert len(machine.accepts) == 3
+
+
+@pytest.mark.parametrize("pattern", [r"a{2}", r"^a", r"a(?=b+)", r"(?=a)b", r"\1"])
+def test_unsupported_syntax(pattern):
+    with pytest.raises(ValueError):
+        dfa.Dfa([(pattern, "X", 0)])
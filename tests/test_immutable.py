@@ -0,0 +1,106 @@
+import pytest
+from hypothesis import given, strategies as st
+from jeff65.immutable import FrozenDict
+
+
+class Colliding:
+    """A key whose hash is the same as every other Colliding key."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __hash__(self):
+        return 42
+
+    def __eq__(self, other):
+        return isinstance(other, Colliding) and self.name == other.name
+
+    def __lt__(self, other):
+        return self.name < other.name
+
+    def __repr__(self):
+        return f"Colliding({self.name!r})"
+
+
+def test_empty():
+    d = FrozenDict.empty()
+    assert len(d) == 0
+    assert list(d) == []
+    assert "a" not in d
+    with pytest.raises(KeyError):
+        d["a"]
+    with pytest.raises(KeyError):
+        d.remove("a")
+
+
+def test_create():
+    d = FrozenDict.create({"b": 2, "a": 1})
+    assert list(d.items()) == [("a", 1), ("b", 2)]
+    assert FrozenDict.create(d) is d
+    assert repr(d) == "FrozenDict({'a': 1, 'b': 2})"
+
+
+def test_add_shares_original():
+    d = FrozenDict.create({"a": 1})
+    e = d.add("b", 2)
+    assert dict(d) == {"a": 1}
+    assert dict(e) == {"a": 1, "b": 2}
+    assert dict(e.add("a", 3)) == {"a": 3, "b": 2}
+    assert len(e.add("a", 3)) == 2
+
+
+def test_builder_does_not_change_frozen():
+    d = FrozenDict.create({str(k): k for k in range(100)})
+    builder = d.asbuilder()
+    builder["x"] = 1
+    del builder["5"]
+    frozen = builder.asfrozen()
+    builder["y"] = 2
+    del builder["6"]
+    assert "x" not in d and "5" in d and len(d) == 100
+    assert "y" not in frozen and "6" in frozen and len(frozen) == 100
+    assert len(builder) == 100
+
+
+def test_collisions():
+    keys = [Colliding(c) for c in "dcba"]
+    d = FrozenDict.create({k: k.name for k in keys})
+    assert list(d.values()) == ["a", "b", "c", "d"]
+    assert d[Colliding("c")] == "c"
+    d = d.remove(Colliding("c"))
+    assert Colliding("c") not in d
+    assert len(d) == 3
+    with pytest.raises(KeyError):
+        d.remove(Colliding("c"))
+
+
+def test_equality():
+    d = FrozenDict.create({"a": 1, "b": 2})
+    assert d == d.asbuilder().asfrozen()
+    assert d == FrozenDict.create({"b": 2, "a": 1})
+    assert d != d.add("c", 3)
+    assert d == {"a": 1, "b": 2}
+
+
+@given(
+    st.lists(
+        st.tuples(st.booleans(), st.integers(min_value=-1000, max_value=1000)),
+        max_size=200,
+    )
+)
+def test_matches_dict(ops):
+    expected = {}
+    d = FrozenDict.empty()
+    builder = FrozenDict.Builder.empty()
+    for insert, key in ops:
+        if insert:
+            expected[key] = -key
+            d = d.add(key, -key)
+            builder[key] = -key
+        elif key in expected:
+            del expected[key]
+            d = d.remove(key)
+            del builder[key]
+    assert list(d.items()) == sorted(expected.items())
+    assert len(d) == len(expected)
+    assert builder.asfrozen() == d
@@ -0,0 +1,779 @@
+import io
+import json
+import pytest
+import time
+from jeff65 import ast, parsing
+from jeff65.gold import grammar
+
+
+def build_cached(tmp_path, g=grammar.grammar):
+    cache = parsing.TableCache(tmp_path / "test.parser.json")
+    hidden = {parsing.ReStream.CHANNEL_HIDDEN: grammar.comment_grammar}
+    return g.build_parser(hidden, cache=cache), cache
+
+
+def assert_same_table(a, b):
+    assert a.symbols == b.symbols
+    for name in parsing._TABLE_ARRAYS:
+        assert list(getattr(a, name)) == list(getattr(b, name))
+
+
+def test_fingerprint_stable():
+    assert grammar.grammar.fingerprint() == grammar.grammar.fingerprint()
+    assert grammar.grammar.fingerprint() != grammar.comment_grammar.fingerprint()
+
+
+def test_fingerprint_covers_hidden():
+    hidden = {parsing.ReStream.CHANNEL_HIDDEN: grammar.comment_grammar}
+    assert grammar.grammar.fingerprint() != grammar.grammar.fingerprint(hidden)
+
+
+def test_cache_roundtrip(tmp_path):
+    built, cache = build_cached(tmp_path)
+    assert cache.path.exists()
+    loaded, _ = build_cached(tmp_path)
+    assert loaded is not built
+    assert loaded.agtable == built.agtable
+    assert list(loaded.modes) == list(built.modes)
+    assert_same_table(loaded.table, built.table)
+    assert loaded.hidden.keys() == built.hidden.keys()
+    for channel, hp in built.hidden.items():
+        assert loaded.hidden[channel].agtable == hp.agtable
+        assert_same_table(loaded.hidden[channel].table, hp.table)
+
+
+def test_cache_stale(tmp_path):
+    _, cache = build_cached(tmp_path)
+    changed = parsing.Grammar(
+        grammar.grammar.start_symbol,
+        grammar.grammar.end_symbols,
+        grammar.grammar.rules[:-2]
+        + [parsing.Rule("unit", ["toplevel"], prec=1)]
+        + grammar.grammar.rules[-1:],
+    )
+    old = json.loads(cache.path.read_text())["fingerprint"]
+    build_cached(tmp_path, changed)
+    new = json.loads(cache.path.read_text())["fingerprint"]
+    assert old != new
+
+
+def test_cache_corrupt(tmp_path):
+    built, cache = build_cached(tmp_path)
+    cache.path.write_text("{")
+    rebuilt, _ = build_cached(tmp_path)
+    assert rebuilt.agtable == built.agtable
+    assert json.loads(cache.path.read_text())["version"] == cache.VERSION
+
+
+@pytest.mark.parametrize(
+    "name, values",
+    [("rows", [0]), ("base", [10000]), ("check", []), ("value", [0])],
+)
+def test_cache_corrupt_table(tmp_path, name, values):
+    _, cache = build_cached(tmp_path)
+    hidden = {parsing.ReStream.CHANNEL_HIDDEN: grammar.comment_grammar}
+    data = json.loads(cache.path.read_text())
+    assert cache.load(data["fingerprint"], grammar.grammar, hidden) is not None
+    data["parser"]["table"][name] = values
+    cache.path.write_text(json.dumps(data))
+    assert cache.load(data["fingerprint"], grammar.grammar, hidden) is None
+
+
+def test_generated_tables_up_to_date():
+    # If this fails, run `jeff65 gen-parser` to regenerate the tables.
+    with open(grammar._parsetab.__file__, encoding="utf8") as f:
+        assert f.read() == grammar.generate_tables()
+
+
+def test_generated_tables_roundtrip():
+    built = grammar.grammar.build_parser(grammar.hidden_grammars)
+    loaded = grammar.grammar.build_parser(
+        grammar.hidden_grammars, tables=grammar._parsetab
+    )
+    assert loaded.agtable == built.agtable
+    assert loaded.modes == built.modes
+    assert_same_table(loaded.table, built.table)
+    assert loaded.hidden[1].agtable == built.hidden[1].agtable
+    assert_same_table(loaded.hidden[1].table, built.hidden[1].table)
+
+
+def test_generated_tables_stale():
+    g = parsing.Grammar(
+        "start",
+        [grammar.T.EOF],
+        [parsing.Rule("unit", []), parsing.Rule("start", ["unit"])],
+    )
+    parser = g.build_parser(tables=grammar._parsetab)
+    assert parser.agtable == g.build_parser().agtable
+
+
+def test_parse_table_matches_agtable():
+    parser = grammar.parse
+    table = parsing.ParseTable(parser.agtable, len(parser.modes))
+    for (state, sym), action in parser.agtable.items():
+        code = table.actions[state * table.width + table.symbol_ids[sym]]
+        if isinstance(action, tuple):
+            assert parsing._unpack_action(code, table.symbols) == action
+        else:
+            assert code >> 2 == action
+
+
+def test_parse_table_empty_default():
+    parser = grammar.parse
+    table = parsing.ParseTable(parser.agtable, len(parser.modes))
+    empty = parsing.Grammar.EMPTY_TOKEN
+    states = [state for state, sym in parser.agtable if sym is empty]
+    assert len(states) > 0
+    for state in states:
+        row = state * table.width
+        default = table.actions[row + table.empty_id]
+        for sym_id, sym in enumerate(table.symbols):
+            if isinstance(sym, str) or (state, sym) in parser.agtable:
+                continue
+            assert table.actions[row + sym_id] == default
+
+
+@pytest.mark.parametrize("parser", [grammar.parse, grammar.parse.hidden[1]])
+def test_compressed_table_matches_parse_table(parser):
+    dense = parsing.ParseTable(parser.agtable, len(parser.modes))
+    table = parser.table
+    assert len(table.check) < len(dense.actions)
+    for state in range(len(parser.modes)):
+        default = table.defaults[state]
+        for sym_id in range(dense.width):
+            code = dense.actions[state * dense.width + sym_id]
+            if code >= 0:
+                assert table.action(state, sym_id) == code
+            else:
+                # error cells either stay errors or take the default reduction
+                assert table.action(state, sym_id) in (code, default)
+
+
+def test_compressed_table_shares_rows():
+    table = grammar.parse.table
+    assert len(table.base) < len(table.rows)
+    for state, row in enumerate(table.rows):
+        if table.reduce_only[state]:
+            assert table.defaults[state] & 3 == parsing.ACTION_REDUCE
+            assert table.defaults[state] >> 18 > 0
+
+
+def test_reduce_only_states_skip_lexer():
+    # "use foo" ends in a reduce-only state (stmt_use -> use IDENTIFIER .), so
+    # stmt_use is built before the lexer is asked for the token after it.
+    events = []
+
+    def next_token(stream, mode):
+        token = grammar.lex(stream, mode)
+        events.append(token.t)
+        return token
+
+    def make_node(t, span, children, mode):
+        events.append(t)
+
+    grammar.parse(parsing.ReStream(io.StringIO("use foo")), next_token, make_node)
+    index = events.index("stmt_use")
+    assert events[index - 1] == grammar.T.IDENTIFIER
+    assert grammar.T.EOF in events[index:]
+
+
+def test_parser_iterate_sequence():
+    source = "use a\nuse b\nfun f()\n  let x: u8 = 1\nendfun\n"
+    nodes = []
+
+    def make_node(t, span, children, mode):
+        nodes.append(t)
+        return (t, list(children))
+
+    with parsing.ReStream(io.StringIO(source)) as stream:
+        items = grammar.parse.iterate(stream, grammar.lex, make_node, "toplevel")
+        yielded = []
+        for item in items:
+            # each element is yielded as soon as it is reduced
+            assert nodes[-1] == item[0]
+            yielded.append(item[0])
+    assert yielded == ["stmt_use", "stmt_use", "stmt_fun"]
+    assert "stmt_let" in nodes and "toplevel" in nodes
+
+
+def test_parser_iterate_frees_elements():
+    def make_node(t, span, children, mode):
+        return (t, list(children))
+
+    with parsing.ReStream(io.StringIO("use a\nuse b")) as stream:
+        items = grammar.parse.iterate(stream, grammar.lex, make_node, "toplevel")
+        assert next(items)[0] == "stmt_use"
+        assert next(items)[0] == "stmt_use"
+        with pytest.raises(StopIteration) as stop:
+            next(items)
+    unit = stop.value.value
+    assert unit == (
+        "unit",
+        [("toplevel", [None, ("toplevel", [None, ("toplevel", [])])])],
+    )
+
+
+def test_parser_expected_tokens():
+    with pytest.raises(parsing.ParseError) as exc:
+        with parsing.ReStream(io.StringIO("fun f(\n")) as stream:
+            grammar.parse(stream, grammar.lex, lambda t, s, c, m: None)
+    assert str(exc.value) == (
+        "Got T.EOF at 2:0-2:0 but expected one of:\n  T.IDENTIFIER\n  T.PAREN_CLOSE"
+    )
+    assert exc.value.errors == [exc.value]
+
+
+def test_parser_expected_tokens_before_default_reductions():
+    # 'endfun' is only rejected after default reductions for an empty
+    # parameter list, but the tokens expected before them are reported.
+    with pytest.raises(parsing.ParseError) as exc:
+        with parsing.ReStream(io.StringIO("fun f(\nendfun")) as stream:
+            grammar.parse(stream, grammar.lex, lambda t, s, c, m: None)
+    assert str(exc.value).splitlines() == [
+        "Got T.PUNCT_ENDFUN at 2:0-2:6 but expected one of:",
+        "  T.IDENTIFIER",
+        "  T.PAREN_CLOSE",
+    ]
+
+
+@pytest.mark.parametrize(
+    "source, closers",
+    [
+        ("fun f()\n  return\n  )\nendfun\n", ["END", "ENDFUN", "ELSE", "ELSEIF"]),
+        ("fun f()\n  while 1 do\n    let x: u8 = 1\n    )\n  end\nendfun\n", ["END"]),
+    ],
+)
+def test_parser_expected_tokens_nested_block(source, closers):
+    # the grammar's own default reductions are taken before the error is
+    # found, so the tokens which end the block are expected too
+    with pytest.raises(parsing.ParseError) as exc:
+        with parsing.ReStream(io.StringIO(source)) as stream:
+            grammar.parse(stream, grammar.lex, lambda t, s, c, m: None)
+    expected = str(exc.value).splitlines()[1:]
+    for closer in closers:
+        assert f"  T.PUNCT_{closer}" in expected
+    assert "  T.STMT_LET" in expected
+    assert "  T.STMT_FUN" not in expected
+
+
+def test_parser_expected_tokens_match_agtable():
+    p = grammar.parse
+    for state, expected in enumerate(p.expected):
+        terminals = [
+            sym
+            for (s, sym), action in p.agtable.items()
+            if s == state and isinstance(action, tuple)
+        ]
+        assert expected == sorted(
+            (t for t in terminals if not isinstance(t, parsing.Special)), key=str
+        )
+
+
+def test_parser_recovers_from_errors():
+    source = (
+        "use mem\n"
+        "constant x: u8 = = 3\n"
+        "fun f()\n"
+        "  let y: u8 = )\n"
+        "  let z: u8 = 2\n"
+        "endfun\n"
+        "constant w u8 = 2\n"
+    )
+    with pytest.raises(parsing.ParseError) as exc:
+        with parsing.ReStream(io.StringIO(source)) as stream:
+            grammar.parse(
+                stream,
+                grammar.lex,
+                lambda t, s, c, m: None,
+                recover=grammar.sync_tokens,
+            )
+    errors = exc.value.errors
+    assert [e.args[0].splitlines()[0] for e in errors] == [
+        "Got T.OPERATOR_ASSIGN at 2:17-2:18 but expected one of:",
+        "Got T.PAREN_CLOSE at 4:14-4:15 but expected one of:",
+        "Got T.IDENTIFIER at 7:11-7:13 but expected one of:",
+    ]
+    assert str(exc.value).startswith("3 syntax errors:")
+
+
+def test_parser_recovery_without_errors():
+    def make_node(t, span, children, mode):
+        return (t, list(children))
+
+    source = "use a\nuse b"
+    with parsing.ReStream(io.StringIO(source)) as stream:
+        expected = grammar.parse(stream, grammar.lex, make_node)
+    with parsing.ReStream(io.StringIO(source)) as stream:
+        recovered = grammar.parse(
+            stream, grammar.lex, make_node, recover=grammar.sync_tokens
+        )
+    assert recovered == expected
+
+
+def naive_closure(g, items):
+    items = set(items)
+    while True:
+        nexts = {s for r in items for s in r.next_symbols if not s.is_terminal}
+        new = {r.with_pointer(0) for r in g.rules if r.lhs in nexts}
+        if new <= items:
+            return items
+        items |= new
+
+
+def test_itemset_closure():
+    g = grammar.grammar
+    table = parsing.TranslationTable(g)
+    for k, itemset in enumerate(table.itemsets):
+        kernel = {i for i in itemset.items if i.pointer > 0} or itemset.items
+        assert itemset.items == naive_closure(g, kernel)
+        for symbol in itemset.next_symbols:
+            advanced = {i.advanced for i in itemset.items if symbol in i.next_symbols}
+            assert itemset.advance(symbol) == advanced
+            assert (
+                table.itemsets[table.translation_table[(k, symbol)]].items >= advanced
+            )
+
+
+def test_find_rule_indices():
+    g = grammar.grammar
+    symbols = [parsing.Symbol("expr"), parsing.Symbol("block"), parsing.Symbol("x")]
+    expected = [k for k, r in enumerate(g.rules) if r.lhs in symbols]
+    assert g.find_rule_indices(symbols) == expected
+
+
+def reference_first_follow(g):
+    first = {s: {s.parent} if s.is_terminal else set() for s in g.symbols}
+    follow = {s: set() for s in g.symbols}
+    follow[g.start_symbol] = {s.parent for s in g.end_symbols}
+    changed = True
+    while changed:
+        changed = False
+        for rule in g.rules:
+            fs = set()
+            for symbols in rule.rhs:
+                alts = set().union(*(first[s] for s in symbols))
+                fs |= alts - {g.EMPTY}
+                if g.EMPTY not in alts:
+                    break
+            else:
+                fs.add(g.EMPTY)
+            if not fs <= first[rule.lhs]:
+                first[rule.lhs] |= fs
+                changed = True
+    changed = True
+    while changed:
+        changed = False
+        for rule in g.rules:
+            for k, symbols in enumerate(rule.rhs):
+                if k + 1 < len(rule.rhs):
+                    fs = set().union(*(first[t] for t in rule.rhs[k + 1]))
+                else:
+                    fs = follow[rule.lhs]
+                for s in symbols:
+                    if not s.is_terminal and not fs <= follow[s]:
+                        follow[s] |= fs
+                        changed = True
+    return first, follow
+
+
+def test_first_follow_sets():
+    extended = parsing.TranslationTable(grammar.grammar).build_extended_grammar()
+    first, follow = reference_first_follow(extended)
+    assert extended.build_firstsets() == first
+    assert extended.build_followsets() == follow
+
+
+nullable_grammar = parsing.Grammar(
+    "start",
+    ["end"],
+    [
+        parsing.Rule("opt", []),
+        parsing.Rule("opt", ["x"]),
+        parsing.Rule("list", ["list", ("a", "b"), "opt"]),
+        parsing.Rule("list", ["opt"]),
+        parsing.Rule("item", ["(", "list", ")", "opt"]),
+        parsing.Rule("items", ["items", "item"]),
+        parsing.Rule("items", []),
+        parsing.Rule("unit", ["items", "opt"]),
+        parsing.Rule("start", ["unit"]),
+    ],
+)
+
+
+@pytest.mark.parametrize(
+    "g, hidden",
+    [
+        (grammar.grammar, grammar.hidden_grammars),
+        (grammar.comment_grammar, None),
+        (nullable_grammar, None),
+    ],
+)
+def test_relation_lookaheads_match_extended(g, hidden):
+    extended = g.build_parser(hidden, lookaheads="extended")
+    relations = g.build_parser(hidden, lookaheads="relations")
+    assert relations.agtable == extended.agtable
+    assert relations.modes == extended.modes
+    for channel, parser in extended.hidden.items():
+        assert relations.hidden[channel].agtable == parser.agtable
+
+
+def test_digraph():
+    relation = {1: [2], 2: [3], 3: [2, 4], 5: [1]}
+    initial = {1: 1, 2: 2, 3: 4, 4: 8, 5: 16}
+    result = parsing._digraph([1, 2, 3, 4, 5], relation, initial)
+    assert result == {1: 15, 2: 14, 3: 14, 4: 8, 5: 31}
+
+
+lexer_sources = [
+    "",
+    "constant x: u8 = 1 + 2 * 3",
+    "/* a /* nested */ comment */ constant x: u8 = /* a comment */ 1\n",
+    'constant s: &u8 = "a string with \\" escapes\\n and\nlines"',
+    "fun main()\n  let mut x: u8 = 0x53\n  @x = 10 /* long "
+    + "c" * 100
+    + " */\nendfun\n",
+    "use mem\nconstant a: &u8 = mem.as-pointer(0x0400)\n",
+    'constant s: &u8 = "h\u00e9llo \u20ac w\U0001f600rld" /* \u00fcber */\n',
+]
+
+
+def lex_all(source, lexer, blocksize, compact=False):
+    tokens = []
+
+    def record(stream, mode):
+        produced = lexer(stream, mode)
+        token = stream.token(produced)
+        tokens.append((token.t, token.text, token.channel, token.span))
+        return produced
+
+    stream = parsing.ReStream(
+        io.BytesIO(source.encode("utf8")), blocksize=blocksize, compact=compact
+    )
+    with stream:
+        grammar.parse(stream, record, lambda t, s, c, m: None)
+    return tokens
+
+
+@pytest.mark.parametrize("source", lexer_sources)
+@pytest.mark.parametrize("blocksize", [1, 3, 4096])
+def test_combined_lexer_matches_rules(source, blocksize):
+    separate = parsing.Lexer(grammar.T.EOF, grammar.lex_rules, combined=False)
+    combined = parsing.Lexer(grammar.T.EOF, grammar.lex_rules, combined=True)
+    expected = lex_all(source, separate, 4096)
+    assert lex_all(source, separate, blocksize) == expected
+    assert lex_all(source, combined, blocksize) == expected
+    assert expected[-1][0] == grammar.T.EOF
+
+
+@pytest.mark.parametrize("source", lexer_sources)
+@pytest.mark.parametrize("blocksize", [1, 3, 4096])
+def test_dfa_lexer_matches_rules(source, blocksize):
+    expected = lex_all(source, grammar.make_lexer("regex"), 4096)
+    assert lex_all(source, grammar.make_lexer("dfa"), blocksize) == expected
+
+
+@pytest.mark.parametrize("source", lexer_sources)
+@pytest.mark.parametrize("blocksize", [1, 3, 4096])
+@pytest.mark.parametrize("backend", ["regex", "dfa"])
+def test_trivia_skipped_by_lexer(source, blocksize, backend):
+    unskipped = grammar.make_lexer(backend, skip_trivia=False)
+    expected = [
+        t
+        for t in lex_all(source, unskipped, 4096)
+        if t[2] != parsing.ReStream.CHANNEL_HIDDEN
+    ]
+    assert lex_all(source, grammar.make_lexer(backend), blocksize) == expected
+
+
+@pytest.mark.parametrize("blocksize", [1, 3, 4096])
+def test_trivia_recorded(blocksize):
+    source = "/* a /* b */ c */\n  use /**/ mem /*/ x */\n"
+    bstream = io.BytesIO(source.encode("utf8"))
+    with parsing.ReStream(bstream, blocksize=blocksize, record_trivia=True) as stream:
+        grammar.parse(stream, grammar.lex, lambda t, s, c, m: None)
+    T = grammar.T
+    assert [(t.t, t.text) for t in stream.trivia] == [
+        (T.COMMENT, "/* a /* b */ c */"),
+        (T.WHITESPACE, "\n  "),
+        (T.WHITESPACE, " "),
+        (T.COMMENT, "/**/"),
+        (T.WHITESPACE, " "),
+        (T.WHITESPACE, " "),
+        (T.COMMENT, "/*/ x */"),
+        (T.WHITESPACE, "\n"),
+    ]
+    assert stream.trivia[0].span == parsing.TextSpan(1, 0, 1, 17)
+    assert stream.trivia[3].span == parsing.TextSpan(2, 6, 2, 10)
+    assert all(t.channel == parsing.ReStream.CHANNEL_HIDDEN for t in stream.trivia)
+
+
+def test_trivia_not_recorded_by_default():
+    with parsing.ReStream(io.StringIO("use mem /* x */")) as stream:
+        grammar.parse(stream, grammar.lex, lambda t, s, c, m: None)
+    assert stream.trivia is None
+
+
+@pytest.mark.parametrize("source", ["use mem /* x", "use mem /* x /* y */"])
+def test_trivia_unterminated_comment(source):
+    with pytest.raises(parsing.ParseError):
+        with parsing.ReStream(io.StringIO(source)) as stream:
+            grammar.parse(stream, grammar.lex, lambda t, s, c, m: None)
+
+
+@pytest.mark.parametrize("source", lexer_sources)
+@pytest.mark.parametrize("blocksize", [1, 3, 4096])
+@pytest.mark.parametrize("skip_trivia", [False, True])
+def test_compact_tokens_match(source, blocksize, skip_trivia):
+    lexer = grammar.make_lexer(skip_trivia=skip_trivia)
+    expected = lex_all(source, lexer, 4096)
+    assert lex_all(source, lexer, blocksize, compact=True) == expected
+
+
+def test_compact_token_array():
+    source = "use mem\nconstant x: u8 =\n  1 /* c */"
+    with parsing.ReStream(io.StringIO(source), compact=True) as stream:
+        expected = []
+        while True:
+            index = grammar.lex(stream, grammar.Mode.NORMAL)
+            assert index == len(expected)
+            token = stream.token(index)
+            expected.append((token.t, token.text, token.span))
+            if token.t == grammar.T.EOF:
+                break
+    tokens = stream.tokens
+    assert len(tokens) == len(expected) == 9
+    assert [(t.t, t.text, t.span) for t in tokens] == expected
+    assert tokens[-2].span == parsing.TextSpan(3, 2, 3, 3)
+    assert tokens[-2] == parsing.Token(grammar.T.NUMERIC, "1")
+    assert tokens.starts[2] == source.index("constant")
+    assert tokens[-1].text is None
+    assert tokens[-1].span == parsing.TextSpan(3, 11, 3, 11)
+
+
+def test_offset_span():
+    source = "ab\ncd\nef"
+    lines = parsing.LineIndex()
+    lines.add(source, 0)
+    span = parsing.OffsetSpan(lines, 1, 7)
+    assert span == parsing.TextSpan(1, 1, 3, 1)
+    assert parsing.TextSpan(1, 1, 3, 1) == span
+    assert span != parsing.TextSpan(1, 1, 3, 0)
+    assert (span.start, span.end) == ((1, 1), (3, 1))
+    assert (span.start_line, span.end_column) == (1, 1)
+    assert str(span) == "1:1-3:1"
+    assert hash(span) == hash(span.resolve())
+    assert parsing.OffsetSpan(lines, 3, 5) in span
+    assert parsing.TextSpan(2, 0, 2, 2) in span
+    assert span in parsing.TextSpan(1, 0, 3, 2)
+    assert not parsing.OffsetSpan(lines, 3, 3)
+
+
+@pytest.mark.parametrize("actions", [False, True])
+def test_compact_parse_trims_buffer(actions):
+    source = "".join(f"fun f{k}()\n  let x: u8 = {k}\nendfun\n" for k in range(10))
+
+    def make_node(t, span, children, mode):
+        return ast.AstNode(t, {f"{k:02}": v for k, v in enumerate(children)}, span)
+
+    def parse(blocksize, compact):
+        bstream = io.BytesIO(source.encode("utf8"))
+        with parsing.ReStream(bstream, blocksize=blocksize, compact=compact) as stream:
+            tree = grammar.parse(stream, grammar.lex, make_node, actions)
+        return stream, tree
+
+    stream, tree = parse(8, True)
+    assert stream.base > len(source) // 2
+    assert stream.pin is None
+    expected = parse(4096, False)[1]
+    assert tree == expected
+    assert tree.pretty() == expected.pretty()
+
+
+def test_line_index():
+    source = "ab\n\ncd\u20ac\nef"
+    lines = parsing.LineIndex()
+    lines.add(source[:4], 0)
+    lines.add(source[4:], 4)
+    for offset in range(len(source) + 1):
+        line = source.count("\n", 0, offset) + 1
+        column = offset - (source.rfind("\n", 0, offset) + 1)
+        assert lines.position(offset) == (line, column)
+
+
+def test_line_index_edits():
+    lines = parsing.LineIndex()
+    lines.add("ab\ncd\nef", 0)
+    # "cd" becomes "x\ny\nz", which moves everything after it
+    edit = parsing.TextEdit(parsing.TextSpan(2, 0, 2, 2), "x\ny\nz")
+    lines.record(5, 3, edit)
+    assert lines.locate(1) == (1, (1, 1))
+    assert lines.locate(6) == (9, (5, 0))
+    assert lines.position(7) == (5, 1)
+    region = parsing.LineIndex()
+    region.add("x\ny\nz", 0)
+    region.join(lines, 3, (2, 0))
+    assert region.locate(4) == (7, (4, 0))
+    # a later edit before the region moves it too
+    lines.record(0, 1, parsing.TextEdit(parsing.TextSpan(1, 0, 1, 0), "\n"))
+    assert region.locate(4) == (8, (5, 0))
+    assert lines.locate(1) == (2, (2, 1))
+
+
+def test_restream_rewind_after_trim():
+    lexer = grammar.make_lexer()
+    stream = parsing.ReStream(io.BytesIO(b"let mut x: u8 = 1\n" * 100), blocksize=7)
+    with stream:
+        for _ in range(200):
+            lexer(stream, grammar.Mode.NORMAL)
+        token = lexer(stream, grammar.Mode.NORMAL)
+        stream.rewind(token)
+        assert lexer(stream, grammar.Mode.NORMAL) == token
+        assert len(stream.buffer) < 100
+
+
+class CountingStream(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+
+def test_restream_extends_geometrically():
+    source = "constant x: u8 = 1 /* " + "c" * 100000 + " */\n"
+    bstream = CountingStream(source.encode("utf8"))
+    with parsing.ReStream(bstream, blocksize=64) as stream:
+        grammar.parse(stream, grammar.lex, lambda t, s, c, m: None)
+    assert bstream.reads < 20
+
+
+def time_parse(source):
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        with parsing.ReStream(io.BytesIO(source.encode("utf8"))) as stream:
+            grammar.parse(stream, grammar.lex, lambda t, s, c, m: None)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+@pytest.mark.parametrize(
+    "template", ["constant x: u8 = 1 /* {} */\n", 'constant s: &u8 = "{}"\n']
+)
+def test_lex_time_linear(template):
+    small = time_parse(template.format("x" * 25000))
+    large = time_parse(template.format("x" * 200000))
+    # eight times the input; a quadratic lexer would take ~64 times as long.
+    assert large < small * 24
+
+
+def read_stream(stream):
+    with stream:
+        while True:
+            try:
+                stream.extend_buffer()
+            except StopIteration:
+                return stream.text()
+
+
+@pytest.mark.parametrize("blocksize", [1, 2, 3, 4096])
+def test_restream_multibyte_straddles_blocks(blocksize):
+    text = "a\u00e9\u20ac\U0001f600b" * 5
+    bstream = io.BytesIO(text.encode("utf8"))
+    assert read_stream(parsing.ReStream(bstream, blocksize=blocksize)) == text
+
+
+def test_restream_truncated_multibyte():
+    bstream = io.BytesIO("a\u20ac".encode("utf8")[:-1])
+    with pytest.raises(UnicodeDecodeError):
+        read_stream(parsing.ReStream(bstream, blocksize=1))
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_restream_map_file(tmp_path, binary):
+    path = tmp_path / "source.gold"
+    path.write_text(lexer_sources[-1], encoding="utf8")
+    fileobj = open(path, "rb" if binary else "r", encoding=None if binary else "utf8")
+    stream = parsing.ReStream(fileobj, blocksize=1, map_file=True)
+    assert stream.exhausted
+    assert stream.bstream is None
+    assert read_stream(stream) == lexer_sources[-1]
+
+
+def test_restream_map_file_unmappable(tmp_path):
+    # empty files and in-memory streams can't be mapped
+    path = tmp_path / "empty.gold"
+    path.write_bytes(b"")
+    assert read_stream(parsing.ReStream(open(path, "rb"), map_file=True)) == ""
+    bstream = io.BytesIO(b"constant x: u8 = 1")
+    stream = parsing.ReStream(bstream, map_file=True)
+    assert read_stream(stream) == "constant x: u8 = 1"
+
+
+def test_scope_flags():
+    assert parsing._scope_flags(r"(?s).") == r"(?s:.)"
+    assert parsing._scope_flags(r"a(?=b)") == r"(?:a(?=b))"
+
+
+@pytest.fixture
+def counters():
+    yield parsing.enable_counters()
+    parsing.disable_counters()
+
+
+def test_counters_disabled_by_default():
+    assert parsing.counters is None
+
+
+@pytest.mark.parametrize("combined", [False, True])
+def test_counters(counters, combined):
+    lexer = parsing.Lexer(grammar.T.EOF, grammar.lex_rules, combined=combined)
+    tokens = lex_all("use mem /* x */\nconstant x: u8 = 1\n", lexer, 3)
+    T = grammar.T
+    default = sum(1 for t in tokens if t[2] == parsing.ReStream.CHANNEL_DEFAULT)
+    assert counters.tokens[parsing.ReStream.CHANNEL_DEFAULT] == default
+    assert counters.tokens[parsing.ReStream.CHANNEL_ALL] == 1
+    hidden = counters.tokens[parsing.ReStream.CHANNEL_HIDDEN]
+    assert 0 < counters.hidden_parses[parsing.ReStream.CHANNEL_HIDDEN] <= hidden
+    assert counters.lexer_matches[(grammar.Mode.NORMAL, T.STMT_USE)] == 1
+    attempts = counters.lexer_attempts
+    if combined:
+        # one match of the combined regex for each token but EOF
+        assert set(k for _, k in attempts) == {parsing.Counters.COMBINED}
+        assert sum(attempts.values()) == len(tokens) - 1
+    else:
+        # every rule before the one for "use" is tried first
+        assert attempts[(grammar.Mode.NORMAL, T.OPERATOR_AND)] > 1
+    assert counters.shifts[T.IDENTIFIER] == 3
+    assert counters.shifts[T.NUMERIC] == 1
+    rule = next(r for r in grammar.grammar.rules if r.lhs.value == "stmt_use")
+    assert counters.reductions[rule] == 1
+    assert counters.buffer["extend"] > 0
+    assert repr(rule) in counters.report()
+
+
+@pytest.mark.parametrize("backend", ["regex", "dfa"])
+def test_counters_trivia(counters, backend):
+    lexer = grammar.make_lexer(backend)
+    tokens = lex_all("use mem /* x */\nuse std\n", lexer, 3)
+    T = grammar.T
+    NORMAL = grammar.Mode.NORMAL
+    assert counters.lexer_matches[(NORMAL, T.WHITESPACE)] == 5
+    assert counters.lexer_matches[(NORMAL, T.COMMENT)] == 1
+    # trivia is probed for before each token, and again after each match
+    attempts = counters.lexer_attempts
+    assert attempts[(NORMAL, parsing.Counters.WHITESPACE)] >= 5 + len(tokens)
+    assert attempts[(NORMAL, parsing.Counters.COMMENT)] >= len(tokens)
+    key = parsing.Counters.DFA if backend == "dfa" else parsing.Counters.COMBINED
+    assert counters.lexer_attempts[(NORMAL, key)] == len(tokens) - 1
+
+
+def test_counters_collected(counters):
+    with parsing.ReStream(io.StringIO("use mem")) as stream:
+        grammar.parse(stream, grammar.lex, lambda t, s, c, m: None)
+    assert parsing.disable_counters() is counters
+    assert parsing.counters is None
+    assert sum(counters.shifts.values()) == 2